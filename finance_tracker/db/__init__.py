@@ -0,0 +1,82 @@
+"""Database connection settings built from environment variables.
+
+Connections are persistent (``CONN_MAX_AGE``) with health checks in every
+environment, not only on Heroku. ``DB_POOL=true`` switches to a psycopg 3
+connection pool per process instead (``psycopg[pool]`` in requirements.txt),
+sized to the gunicorn thread count. Either way the ``finance_tracker.db``
+engine records how long connections take to open (see ``base.py``).
+"""
+
+import os
+
+import dj_database_url
+
+ENGINE = "finance_tracker.db"
+
+# Local development fallback (ensure PostgreSQL is running locally)
+LOCAL_DATABASE = {
+    "NAME": "personal_finance_tracker",
+    "USER": "postgres",
+    "PASSWORD": "626918",
+    "HOST": "localhost",
+    "PORT": "5432",
+}
+
+
+def _flag(environ, name, default):
+    return environ.get(name, str(default)).lower() == "true"
+
+
+def pool_size(environ):
+    """Return (min_size, max_size) for one process's connection pool.
+
+    Each gunicorn worker process gets its own pool, which needs one
+    connection per thread plus one for background work such as the quote
+    refresher, plus the query threads of the async views when they are on.
+    ``DB_POOL_MIN_SIZE`` and ``DB_POOL_MAX_SIZE`` override it.
+    """
+    threads = int(environ.get("GUNICORN_THREADS", "1"))
+    extra = 1
+    if _flag(environ, "ASYNC_VIEWS", False):
+        extra += int(environ.get("ASYNC_QUERY_THREADS", "4"))
+    max_size = int(environ.get("DB_POOL_MAX_SIZE", threads + extra))
+    min_size = int(environ.get("DB_POOL_MIN_SIZE", min(threads, max_size)))
+    return min_size, max_size
+
+
+def database_config(environ=os.environ):
+    """Build ``DATABASES["default"]``.
+
+    Recognised variables: ``DATABASE_URL`` (required on Heroku, where SSL is
+    enforced), ``DB_CONN_MAX_AGE`` (seconds, default 600),
+    ``DB_CONN_HEALTH_CHECKS`` (default true), ``DB_SSL_REQUIRE``, ``DB_POOL``
+    and the pool sizes read by ``pool_size``.
+
+    Args:
+        environ: Mapping to read the variables from.
+
+    Returns:
+        dict: A Django database settings dict.
+    """
+    ssl_require = _flag(environ, "DB_SSL_REQUIRE", "DYNO" in environ)
+    if environ.get("DATABASE_URL"):
+        config = dj_database_url.parse(
+            environ["DATABASE_URL"], engine=ENGINE, ssl_require=ssl_require
+        )
+    else:
+        config = {"ENGINE": ENGINE, **LOCAL_DATABASE}
+        if ssl_require:
+            config["OPTIONS"] = {"sslmode": "require"}
+
+    config["CONN_HEALTH_CHECKS"] = _flag(environ, "DB_CONN_HEALTH_CHECKS", True)
+    config["CONN_MAX_AGE"] = int(environ.get("DB_CONN_MAX_AGE", "600"))
+    if _flag(environ, "DB_POOL", False):
+        min_size, max_size = pool_size(environ)
+        config.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": min_size,
+            "max_size": max_size,
+            "timeout": int(environ.get("DB_POOL_TIMEOUT", "10")),
+        }
+        # Pooled connections are returned after each request instead
+        config["CONN_MAX_AGE"] = 0
+    return config
@@ -0,0 +1,86 @@
+"""PostgreSQL backend that records connection and query timings.
+
+Opening a connection costs a TCP (and often TLS) handshake plus
+authentication, which is what persistent connections and pooling save.
+With a pool, the time measured is the wait to check a connection out.
+
+Queries are counted and timed into the ``QueryStats`` set in the
+``query_stats`` context variable, if any. Context variables follow
+``sync_to_async`` onto other threads, so the queries of a request are
+counted whichever thread or connection runs them.
+"""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from django.db.backends.postgresql import base
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectStats:
+    """Process-wide count and total duration of connection opens."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "count": self.count,
+                "total_seconds": self.total_seconds,
+                "max_seconds": self.max_seconds,
+            }
+
+
+connect_stats = ConnectStats()
+
+
+class QueryStats:
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+query_stats = ContextVar("query_stats", default=None)
+
+
+def _record_query(execute, sql, params, many, context):
+    stats = query_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.seconds += time.perf_counter() - start
+        stats.queries += 1
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.execute_wrappers.append(_record_query)
+
+    def get_new_connection(self, conn_params):
+        start = time.perf_counter()
+        connection = super().get_new_connection(conn_params)
+        elapsed = time.perf_counter() - start
+        connect_stats.record(elapsed)
+        logger.debug(
+            "Opened database connection %r in %.1f ms", self.alias, elapsed * 1000
+        )
+        return connection
@@ -13,9 +13,10 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 import os
 from pathlib import Path
 
-import dj_database_url
 from dotenv import load_dotenv
 
+from finance_tracker.db import database_config
+
 load_dotenv()  # Load .env file for environment variables
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -40,16 +41,20 @@ INSTALLED_APPS = [
     "django.contrib.contenttypes",
     "django.contrib.sessions",
     "django.contrib.messages",
+    "django.contrib.postgres",
     "whitenoise.runserver_nostatic",  # For development
     "django.contrib.staticfiles",
+    "rest_framework",
     "transactions",
     "widget_tweaks",
 ]
 
 MIDDLEWARE = [
+    "transactions.middleware.MetricsMiddleware",  # First, to time everything below
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "transactions.middleware.SessionRefreshMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -80,30 +85,54 @@ WSGI_APPLICATION = "finance_tracker.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
+# Persistent connections with health checks everywhere, or a psycopg pool
+# with DB_POOL=true; see finance_tracker/db/__init__.py for the variables
+DATABASES = {"default": database_config()}
+
+# Cache shared by all workers (quotes, dashboards). The database backend
+# needs no extra service; run `python manage.py createcachetable` once.
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "django_cache"),
     }
 }
 
-# Heroku DATABASE_URL override (required for Heroku, fallback for local)
-
-if "DYNO" in os.environ:  # Check if running on Heroku
-    DATABASES["default"] = dj_database_url.config(
-        conn_max_age=600,  # Persistent connections for Heroku
-        ssl_require=True,  # Ensure SSL for Heroku Postgres
-    )
-else:
-    # Local development fallback (ensure PostgreSQL is running locally)
-    DATABASES["default"].update(
-        {
-            "NAME": "personal_finance_tracker",
-            "USER": "postgres",
-            "PASSWORD": "626918",
-            "HOST": "localhost",
-            "PORT": "5432",
-        }
-    )
+# Motivational quotes on the transaction list (see transactions/quotes.py)
+QUOTE_PROVIDERS = [
+    "transactions.quotes.QuotableProvider",
+    "transactions.quotes.KanyeProvider",
+]
+QUOTE_FALLBACK_POOL = "transactions.quotes.LocalQuotePool"
+QUOTE_REFRESH_INTERVAL = 60 * 10  # Refresh in the background after 10 minutes
+QUOTE_CACHE_TTL = 60 * 60 * 6  # Keep serving a stale quote for up to 6 hours
+QUOTE_FAILURE_THRESHOLD = 3  # Failed refreshes before the circuit opens
+QUOTE_CIRCUIT_COOLDOWN = 60 * 5  # Seconds before upstreams are tried again
+
+# Landing page dashboards are cached per user and data version; entries for
+# superseded versions are never read again and simply expire.
+DASHBOARD_CACHE_TTL = 60 * 60 * 24
+
+# PDF reports are cached in REPORTS_ROOT and rendered inside the request by
+# default. With REPORT_JOBS_INLINE=False they are queued for
+# `python manage.py run_report_worker` instead, which must share REPORTS_ROOT
+# with the web processes (not possible across Heroku dynos).
+REPORTS_ROOT = os.getenv("REPORTS_ROOT", os.path.join(BASE_DIR, "reports"))
+REPORT_JOBS_INLINE = os.getenv("REPORT_JOBS_INLINE", "True").lower() == "true"
+
+# The transaction table is partitioned by date, one partition per "year" or
+# "month" (see transactions/partitions.py). Partitions are created this many
+# intervals ahead by `migrate` and `python manage.py create_partitions`.
+TRANSACTION_PARTITION_INTERVAL = os.getenv("TRANSACTION_PARTITION_INTERVAL", "year")
+TRANSACTION_PARTITIONS_AHEAD = int(os.getenv("TRANSACTION_PARTITIONS_AHEAD", "1"))
+
+# Async variants of the dashboard and list pages, which run their
+# independent queries concurrently on ASYNC_QUERY_THREADS extra connections.
+# Only worthwhile under an ASGI server (see README).
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "False").lower() == "true"
+ASYNC_QUERY_THREADS = int(os.getenv("ASYNC_QUERY_THREADS", "4"))
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -154,11 +183,24 @@ LOGIN_URL = "/accounts/login/"
 LOGIN_REDIRECT_URL = "/"
 LOGOUT_REDIRECT_URL = "/"
 
-# Session settings for Heroku production
-SESSION_ENGINE = "django.contrib.sessions.backends.db"
+# JSON API at /api/v1/, for the signed-in user only
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "rest_framework.authentication.SessionAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+    ],
+    "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
+}
+
+# Session settings for Heroku production. SESSION_ENGINE can be
+# "django.contrib.sessions.backends.cached_db" (with a shared CACHE_BACKEND)
+# or "django.contrib.sessions.backends.signed_cookies" to avoid session reads.
+SESSION_ENGINE = os.getenv("SESSION_ENGINE", "django.contrib.sessions.backends.db")
 SESSION_COOKIE_AGE = 1209600  # 2 weeks
-# Ensure sessions save on every request for reliability on Heroku
-SESSION_SAVE_EVERY_REQUEST = True
+# Expiry still slides, but SessionRefreshMiddleware re-saves an unchanged
+# session at most once per interval instead of on every request
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_INTERVAL = int(os.getenv("SESSION_REFRESH_INTERVAL", "300"))
 
 # Logging configuration for debugging (optional, but helpful for Heroku)
 LOGGING = {
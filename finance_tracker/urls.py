@@ -15,6 +15,7 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
@@ -25,6 +26,10 @@ urlpatterns = [
     path("", views.landing_page, name="landing_page"),
     # Include transactions app URLs under /transactions/
     path("transactions/", include("transactions.urls")),
+    # Versioned JSON API for transactions and budgets
+    path("api/v1/", include("transactions.api")),
+    # Prometheus metrics for staff and scrapers
+    path("metrics/", views.metrics_view, name="metrics"),
     path("accounts/", include("django.contrib.auth.urls")),
     # Authentication URLs
     path("register/", views.RegisterView.as_view(), name="register"),
@@ -33,3 +38,19 @@ urlpatterns = [
     # Uses default password reset views
     path("password_reset/", include("django.contrib.auth.urls")),
 ]
+
+# Async variants of the busiest pages, which run their independent queries
+# concurrently. With ASYNC_VIEWS on they shadow the sync views above; serve
+# the project with an ASGI server (finance_tracker.asgi) when using them.
+async_urlpatterns = [
+    path("", views.landing_page_async, name="landing_page"),
+    path(
+        "transactions/transactions/",
+        views.transaction_list_async,
+        name="transaction_list",
+    ),
+    path("transactions/budgets/", views.budget_list_async, name="budget_list"),
+]
+
+if settings.ASYNC_VIEWS:
+    urlpatterns = async_urlpatterns + urlpatterns
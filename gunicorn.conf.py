@@ -0,0 +1,9 @@
+"""Gunicorn settings, read automatically from the working directory.
+
+Workers come from WEB_CONCURRENCY (set by Heroku). GUNICORN_THREADS is also
+read by finance_tracker.db to size each worker's connection pool.
+"""
+
+import os
+
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
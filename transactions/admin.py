@@ -1,17 +1,56 @@
 from django.contrib import admin
 
-from .models import Budget, Transaction
+from . import search, versioning
+from .models import Budget, Category, Transaction
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ("name", "user")
+    search_fields = ("name", "user__username")
+
+    # Category names are shown on cached dashboards, reports and pages, so
+    # changes bump the owner's data version like Transaction writes do
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # A category moved to another user changes both users' data
+        versioning.bump([obj.user_id, form.initial.get("user", obj.user_id)])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        versioning.bump([obj.user_id])
+
+    def delete_queryset(self, request, queryset):
+        user_ids = list(queryset.values_list("user_id", flat=True))
+        super().delete_queryset(request, queryset)
+        versioning.bump(user_ids)
 
 
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
     list_display = ("title", "amount", "transaction_type", "category", "date", "user")
-    list_filter = ("transaction_type", "category", "date")
-    search_fields = ("title", "category")
+    list_filter = ("transaction_type", "date")
+    list_select_related = ("category", "user")
+    # Titles and notes are matched through the full-text index below
+    search_fields = ("user__username", "category__name")
+    raw_id_fields = ("category",)
+
+    def get_search_results(self, request, queryset, search_term):
+        # Full-text matches on title and notes (rather than LIKE scans over
+        # every row), plus the usual matches on owner and category name
+        results, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        query = search.prefix_query(search_term)
+        if query is not None:
+            results |= queryset.filter(search_vector=query)
+        return results, may_have_duplicates
 
 
 @admin.register(Budget)
 class BudgetAdmin(admin.ModelAdmin):
     list_display = ("category", "amount", "start_date", "end_date", "user")
-    list_filter = ("category", "start_date", "end_date")
-    search_fields = ("category",)
+    list_filter = ("start_date", "end_date")
+    list_select_related = ("category", "user")
+    search_fields = ("category__name",)
+    raw_id_fields = ("category",)
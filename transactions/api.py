@@ -0,0 +1,171 @@
+"""Versioned JSON API over transactions and budgets.
+
+Every queryset is scoped to the requesting user, so other users' rows are
+never read, let alone returned. Lists are keyset-paginated with opaque
+``cursor`` tokens and accept ``fields=a,b,c`` to return (and SELECT) only
+those fields. Transaction lists take the same filters as transaction_list.
+"""
+
+import datetime
+
+from rest_framework import viewsets
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.routers import DefaultRouter
+from rest_framework.utils.urls import replace_query_param
+
+from .filters import filter_transactions
+from .pagination import DEFAULT_SORT, SORT_KEYS, KeysetPaginator
+from .serializers import BudgetSerializer, TransactionSerializer
+
+BUDGET_SORT_KEYS = {
+    "start_date_desc": ("start_date", True),
+    "start_date_asc": ("start_date", False),
+    "amount_desc": ("amount", True),
+    "amount_asc": ("amount", False),
+}
+BUDGET_DEFAULT_SORT = "start_date_desc"
+
+
+class KeysetCursorPagination(BasePagination):
+    """DRF adapter for KeysetPaginator, driven by ``cursor``, ``sort_by`` and ``page_size``."""
+
+    page_size = 50
+    max_page_size = 500
+    sort_keys = SORT_KEYS
+    default_sort = DEFAULT_SORT
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params["page_size"])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page = KeysetPaginator(
+            queryset,
+            sort_by=request.query_params.get("sort_by"),
+            page_size=self.get_page_size(request),
+            sort_keys=self.sort_keys,
+            default_sort=self.default_sort,
+        ).page(request.query_params.get("cursor"))
+        return list(self.page)
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), "cursor", cursor)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self._link(self.page.next_cursor),
+                "previous": self._link(self.page.prev_cursor),
+                "results": data,
+            }
+        )
+
+
+class BudgetCursorPagination(KeysetCursorPagination):
+    sort_keys = BUDGET_SORT_KEYS
+    default_sort = BUDGET_DEFAULT_SORT
+
+
+class UserScopedViewSet(viewsets.ModelViewSet):
+    """CRUD over the requesting user's rows with sparse fieldsets.
+
+    Rows of other users are outside the queryset, so they 404 rather than 403.
+    """
+
+    # Serializer fields read through a join, and the relation to select
+    related_columns = {"category": ("category__name", "category")}
+
+    def requested_fields(self):
+        """Return the field names from ``?fields=``, or None for all fields."""
+        raw = self.request.query_params.get("fields")
+        if not raw:
+            return None
+        fields = {name.strip() for name in raw.split(",") if name.strip()}
+        unknown = fields - set(self.serializer_class.Meta.fields)
+        if unknown:
+            raise ParseError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return fields
+
+    def base_queryset(self):
+        # Every action, superusers included: writes resolve categories for
+        # the requesting user, so rows of other users stay out of reach
+        return self.serializer_class.Meta.model.objects.filter(user=self.request.user)
+
+    def get_queryset(self):
+        queryset = self.base_queryset()
+        fields = self.requested_fields() if self.request.method == "GET" else None
+        if fields is None:
+            return queryset.select_related(
+                *{relation for _, relation in self.related_columns.values()}
+            )
+
+        model_fields = {f.name for f in queryset.model._meta.concrete_fields}
+        # Cursors are built from the sort columns, so always load them
+        sort_columns = {field for field, _ in self.pagination_class.sort_keys.values()}
+        columns = {"id", *sort_columns}
+        for name in fields:
+            if name in self.related_columns:
+                column, relation = self.related_columns[name]
+                columns.add(column)
+                queryset = queryset.select_related(relation)
+            elif name in model_fields:
+                columns.add(name)
+        return queryset.only(*columns)
+
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method == "GET":
+            kwargs.setdefault("fields", self.requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class TransactionViewSet(UserScopedViewSet):
+    serializer_class = TransactionSerializer
+    pagination_class = KeysetCursorPagination
+
+    def base_queryset(self):
+        queryset = super().base_queryset()
+        if self.action == "list":
+            queryset, _ = filter_transactions(queryset, self.request.query_params)
+        return queryset
+
+
+class BudgetViewSet(UserScopedViewSet):
+    serializer_class = BudgetSerializer
+    pagination_class = BudgetCursorPagination
+
+    def base_queryset(self):
+        queryset = super().base_queryset()
+        fields = self.requested_fields() if self.request.method == "GET" else None
+        if fields is None or fields & set(BudgetSerializer.UTILIZATION_FIELDS):
+            queryset = queryset.with_utilization(datetime.date.today())
+        return queryset
+
+    def _reload(self, serializer):
+        # Writes return the same utilization figures as reads
+        serializer.instance = self.base_queryset().get(pk=serializer.instance.pk)
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        self._reload(serializer)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self._reload(serializer)
+
+
+router = DefaultRouter()
+router.register("transactions", TransactionViewSet, basename="api-transaction")
+router.register("budgets", BudgetViewSet, basename="api-budget")
+
+urlpatterns = router.urls
@@ -0,0 +1,129 @@
+"""Bulk actions on a user's selected transactions.
+
+Each action is a single UPDATE or DELETE scoped to the user's own rows, so
+IDs belonging to anyone else are ignored. Actions that move amounts between
+MonthlyRollup buckets aggregate the affected rows per bucket in the same
+statement, and the rollups and the data version are then updated once for
+the whole batch instead of once per row through the model signals.
+"""
+
+from django.db import connection, transaction
+from django.db.models import F
+
+from . import rollups, versioning
+from .models import Category, Transaction
+
+# Per-bucket sums of the rows returned by a data-modifying CTE named "rows"
+BUCKET_TOTALS = """
+    SELECT user_id, EXTRACT(YEAR FROM date)::int, EXTRACT(MONTH FROM date)::int,
+           transaction_type, category_id, SUM(amount), COUNT(*)
+    FROM rows GROUP BY 1, 2, 3, 4, 5
+"""
+
+
+def _table():
+    return connection.ops.quote_name(Transaction._meta.db_table)
+
+
+def _bucket_totals(sql, params):
+    """Run a ``WITH rows AS (...)`` statement; return (bucket, total, count) rows."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"WITH rows AS ({sql}) {BUCKET_TOTALS}", params)
+        return [(tuple(row[:5]), row[5], row[6]) for row in cursor.fetchall()]
+
+
+def _add_totals(deltas, bucket, total, count, sign=1):
+    entry = deltas[bucket]
+    entry[0] += sign * total
+    entry[1] += sign * count
+
+
+def change_category(user, ids, name):
+    """Move the selected transactions to the category called ``name``.
+
+    The category is created if the user has none by that name.
+
+    Returns:
+        int: Number of transactions changed.
+    """
+    table = _table()
+    with transaction.atomic():
+        # Created in the same transaction, so a failed update leaves no
+        # empty category behind
+        category = Category.objects.resolve(user, name)
+        # The FROM side of a self-join still sees each row as it was before
+        # the update, which gives the bucket the amount moves out of
+        moved = _bucket_totals(
+            f"UPDATE {table} AS t SET category_id = %s FROM {table} AS old "
+            f"WHERE t.id = old.id AND t.user_id = %s AND t.id = ANY(%s) "
+            f"AND t.category_id <> %s "
+            f"RETURNING t.user_id, t.date, t.transaction_type, old.category_id, t.amount",
+            [category.pk, user.pk, list(ids), category.pk],
+        )
+        deltas = rollups.new_deltas()
+        for bucket, total, count in moved:
+            _add_totals(deltas, bucket, total, count, -1)
+            _add_totals(deltas, (*bucket[:4], category.pk), total, count)
+        return _finish(user, deltas, sum(count for _, _, count in moved))
+
+
+def change_payment_method(user, ids, payment_method):
+    """Set the payment method of the selected transactions.
+
+    Returns:
+        int: Number of transactions changed.
+    """
+    with transaction.atomic():
+        changed = (
+            Transaction.objects.filter(user=user, id__in=ids)
+            .exclude(payment_method=payment_method)
+            .update(payment_method=payment_method)
+        )
+        return _finish(user, None, changed)
+
+
+def toggle_recurring(user, ids):
+    """Flip the ``recurring`` flag of each selected transaction.
+
+    Returns:
+        int: Number of transactions changed.
+    """
+    with transaction.atomic():
+        changed = Transaction.objects.filter(user=user, id__in=ids).update(
+            recurring=~F("recurring")
+        )
+        return _finish(user, None, changed)
+
+
+def delete(user, ids):
+    """Delete the selected transactions.
+
+    Occurrences generated from a deleted recurring template are kept and
+    detached from it first, as ``on_delete=SET_NULL`` would.
+
+    Returns:
+        int: Number of transactions deleted.
+    """
+    table = _table()
+    with transaction.atomic():
+        Transaction.objects.filter(user=user, recurrence_parent__in=ids).exclude(
+            id__in=ids
+        ).update(recurrence_parent=None)
+        removed = _bucket_totals(
+            f"DELETE FROM {table} WHERE user_id = %s AND id = ANY(%s) "
+            f"RETURNING user_id, date, transaction_type, category_id, amount",
+            [user.pk, list(ids)],
+        )
+        deltas = rollups.new_deltas()
+        for bucket, total, count in removed:
+            _add_totals(deltas, bucket, total, count, -1)
+        return _finish(user, deltas, sum(count for _, _, count in removed))
+
+
+def _finish(user, deltas, changed):
+    """Apply the batch's rollup deltas and bump the data version once."""
+    if changed:
+        if deltas:
+            rollups.apply_deltas(deltas)
+        versioning.bump([user.pk])
+    return changed
@@ -0,0 +1,97 @@
+"""Conditional GET for pages derived from the user's own data.
+
+A page's validators come from the user's DataVersion, which every
+Transaction, Budget or profile write bumps, so a matching ``If-None-Match`` or
+``If-Modified-Since`` is answered with 304 after a single primary-key lookup
+and before the view runs any of its own queries.
+"""
+
+import datetime
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.messages import get_messages
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from . import versioning
+
+
+def _validators(request, daily):
+    """Return the (etag, last_modified) of the user's data, computed once per request."""
+    if not hasattr(request, "_data_validators"):
+        request._data_validators = (None, None)
+        # Pending flash messages are only shown by a full render
+        if not len(get_messages(request)):
+            request._data_validators = _compute_validators(request.user, daily)
+    return request._data_validators
+
+
+def _compute_validators(user, daily):
+    version, updated_at = versioning.get_version(user)
+    # Logging in again rotates the CSRF token embedded in the page
+    moments = [moment for moment in (updated_at, user.last_login) if moment]
+    tag = f"{user.pk}-{version}-{user.last_login.timestamp() if user.last_login else 0:.0f}"
+    if daily:
+        today = datetime.date.today()
+        moments.append(
+            timezone.make_aware(datetime.datetime.combine(today, datetime.time.min))
+        )
+        tag += f"-{today:%Y%m%d}"
+    return f'"{tag}"', max(moments, default=None)
+
+
+def _finish(response):
+    """Keep validators only on the page itself (200) and on 304s for it.
+
+    Any other response, e.g. a redirect while a report is still rendering,
+    is not the representation the validators describe, so it gets neither
+    and is never stored.
+    """
+    if response.status_code in (200, 304):
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        del response["ETag"]
+        del response["Last-Modified"]
+        patch_cache_control(response, no_store=True)
+    return response
+
+
+def user_data_condition(daily=False):
+    """Decorate a view whose response only changes with the user's data.
+
+    Apply it below ``login_required``; async views are supported. Responses
+    are marked ``private, no-cache`` so browsers always revalidate instead of
+    guessing a lifetime from Last-Modified. Other responses than 200 and 304
+    carry no validators (see ``_finish``).
+
+    Args:
+        daily: Whether the page also depends on today's date.
+    """
+
+    def decorator(view_func):
+        conditional_view = condition(
+            etag_func=lambda request, *args, **kwargs: _validators(request, daily)[0],
+            last_modified_func=lambda request, *args, **kwargs: _validators(
+                request, daily
+            )[1],
+        )(view_func)
+
+        if iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                # Computed off the event loop; condition() then reads the memo
+                await sync_to_async(_validators)(request, daily)
+                return _finish(await conditional_view(request, *args, **kwargs))
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            return _finish(conditional_view(request, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
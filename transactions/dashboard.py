@@ -0,0 +1,189 @@
+"""Dashboard query engine for the landing page.
+
+Income and expense figures are computed with conditional aggregation, so a
+single GROUP BY returns both types at once: one round-trip for the
+per-category splits (from which the totals are derived) and one for the
+(year, month) trends. Both read MonthlyRollup, so their cost grows with the
+number of months a user has data for rather than with their transactions.
+
+The queries are independent of each other, so the async variant used under
+ASGI runs them concurrently on separate connections.
+
+``get_cached_dashboard_context`` stores the result in Django's cache under a
+key that carries the user's data version, which every Transaction and Budget
+write bumps. A repeat view costs one primary-key lookup plus a cache read,
+and an entry is never served after the data behind it has changed.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Q, Sum
+
+from . import versioning
+from .concurrency import gather_queries
+from .models import Budget, MonthlyRollup, Transaction
+from .rollups import EXPENSE, INCOME
+
+
+CATEGORY_KEYS = {"category": "category_name"}
+MONTH_KEYS = {"year": "year", "month": "month"}
+
+
+def _split(rows, keys, field):
+    """Pick the non-empty ``field`` totals out of conditionally aggregated rows.
+
+    ``keys`` maps each output key to the row value it is read from.
+    """
+    return [
+        {**{out: row[name] for out, name in keys.items()}, "total": row[field]}
+        for row in rows
+        if row[field]
+    ]
+
+
+def _category_totals(user):
+    # Grouped on the category key; the name comes from the small Category table
+    return list(
+        MonthlyRollup.objects.filter(user=user)
+        .values("category_id")
+        .annotate(
+            category_name=F("category__name"),
+            income=Sum("total", filter=INCOME),
+            expense=Sum("total", filter=EXPENSE),
+        )
+    )
+
+
+def _monthly_totals(user, since):
+    # Whole months from the one containing ``since`` onwards
+    return list(
+        MonthlyRollup.objects.filter(user=user)
+        .filter(Q(year__gt=since.year) | Q(year=since.year, month__gte=since.month))
+        .values("year", "month")
+        .annotate(
+            income=Sum("total", filter=INCOME), expense=Sum("total", filter=EXPENSE)
+        )
+        .order_by("year", "month")
+    )
+
+
+def _total_budgets(user):
+    return Budget.objects.filter(user=user).aggregate(Sum("amount"))["amount__sum"] or 0
+
+
+def _recent_transactions(user):
+    return list(
+        Transaction.objects.filter(user=user)
+        .select_related("category")
+        .order_by("-date", "-id")[:5]
+    )
+
+
+def _recent_budgets(user, today):
+    return list(
+        Budget.objects.filter(user=user)
+        .select_related("category")
+        .with_utilization(today)
+        .order_by("-start_date")[:5]
+    )
+
+
+def _dashboard_queries(user, today):
+    """Return the dashboard's independent queries as ``(func, *args)`` calls."""
+    return [
+        (_category_totals, user),
+        (_monthly_totals, user, today - datetime.timedelta(days=180)),
+        (_total_budgets, user),
+        (_recent_transactions, user),
+        (_recent_budgets, user, today),
+    ]
+
+
+def _build_context(
+    by_category, monthly, total_budgets, recent_transactions, recent_budgets
+):
+    income_by_category = sorted(
+        _split(by_category, CATEGORY_KEYS, "income"), key=lambda r: r["total"], reverse=True
+    )
+    expenses_by_category = sorted(
+        _split(by_category, CATEGORY_KEYS, "expense"), key=lambda r: r["total"], reverse=True
+    )
+    total_income = sum(row["total"] for row in income_by_category) or 0
+    total_expenses = sum(row["total"] for row in expenses_by_category) or 0
+
+    return {
+        "total_income": total_income,
+        "total_expenses": total_expenses,
+        "net_balance": total_income - total_expenses,
+        "total_budgets": total_budgets,
+        "monthly_income": _split(monthly, MONTH_KEYS, "income"),
+        "monthly_expenses": _split(monthly, MONTH_KEYS, "expense"),
+        "income_by_category": income_by_category,
+        "expenses_by_category": expenses_by_category,
+        "recent_transactions": recent_transactions,
+        "recent_budgets": recent_budgets,
+    }
+
+
+def get_dashboard_context(user, today=None):
+    """Build the landing page context for ``user``.
+
+    Args:
+        user: The User whose data is summarised.
+        today: Reference date for the six-month trend window (defaults to today).
+
+    Returns:
+        dict: The template context used by ``transactions/landing.html``.
+    """
+    today = today or datetime.date.today()
+    return _build_context(
+        *(func(*args) for func, *args in _dashboard_queries(user, today))
+    )
+
+
+async def aget_dashboard_context(user, today=None):
+    """Async ``get_dashboard_context``, running its queries concurrently."""
+    today = today or datetime.date.today()
+    return _build_context(*await gather_queries(*_dashboard_queries(user, today)))
+
+
+def dashboard_cache_key(user, version, today):
+    # The date is part of the key because the trend window and the budget
+    # figures move with it
+    return f"dashboard:{user.pk}:v{version}:{today.isoformat()}"
+
+
+def get_cached_dashboard_context(user, today=None):
+    """Return ``get_dashboard_context(user)``, served from the cache when current.
+
+    Args:
+        user: The User whose data is summarised.
+        today: Reference date (defaults to today).
+
+    Returns:
+        dict: The template context used by ``transactions/landing.html``.
+    """
+    today = today or datetime.date.today()
+    version, _ = versioning.get_version(user)
+    key = dashboard_cache_key(user, version, today)
+    context = cache.get(key)
+    if context is None:
+        context = get_dashboard_context(user, today)
+        cache.set(key, context, getattr(settings, "DASHBOARD_CACHE_TTL", 60 * 60 * 24))
+    return context
+
+
+async def aget_cached_dashboard_context(user, today=None):
+    """Async ``get_cached_dashboard_context``."""
+    today = today or datetime.date.today()
+    version, _ = await versioning.aget_version(user)
+    key = dashboard_cache_key(user, version, today)
+    context = await cache.aget(key)
+    if context is None:
+        context = await aget_dashboard_context(user, today)
+        await cache.aset(
+            key, context, getattr(settings, "DASHBOARD_CACHE_TTL", 60 * 60 * 24)
+        )
+    return context
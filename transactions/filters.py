@@ -0,0 +1,38 @@
+"""Filters shared by the transaction list and the data exports."""
+
+from django.db.models import F, Value
+from django.db.models.functions import Lower
+
+FILTER_PARAMS = ("transaction_type", "category", "start_date", "end_date", "sort_by")
+
+
+def filter_transactions(queryset, params):
+    """Apply the transaction_list filters found in ``params``.
+
+    Args:
+        queryset: A Transaction queryset, usually already scoped to one user.
+        params: A QueryDict or dict with any of ``FILTER_PARAMS``.
+
+    Returns:
+        tuple: The filtered queryset and a dict of the raw filter values.
+    """
+    filters = {name: params.get(name) for name in FILTER_PARAMS}
+
+    if filters["transaction_type"] in ["Income", "Expense"]:
+        queryset = queryset.filter(transaction_type=filters["transaction_type"])
+
+    if filters["category"]:
+        # Case-insensitive name match through the Category index; joining on
+        # the row's own user lets the planner probe it for that user only
+        queryset = queryset.alias(category_name=Lower("category__name")).filter(
+            category__user=F("user"),
+            category_name=Lower(Value(filters["category"].strip())),
+        )
+
+    if filters["start_date"]:
+        queryset = queryset.filter(date__gte=filters["start_date"])
+
+    if filters["end_date"]:
+        queryset = queryset.filter(date__lte=filters["end_date"])
+
+    return queryset, filters
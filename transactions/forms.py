@@ -1,7 +1,21 @@
 from django import forms
 from django.contrib.auth.models import User
 
-from .models import Budget, Transaction
+from .models import Budget, Category, Transaction
+
+
+def validate_transaction_amount(amount):
+    """Shared by TransactionForm and the bulk importer."""
+    if amount <= 0:
+        raise forms.ValidationError("Amount must be greater than zero.")
+    return amount
+
+
+def validate_transaction_title(title):
+    """Shared by TransactionForm and the bulk importer."""
+    if not title.strip():
+        raise forms.ValidationError("Title cannot be empty.")
+    return title
 
 
 class CustomUserEditForm(forms.ModelForm):
@@ -25,14 +39,63 @@ class CustomUserEditForm(forms.ModelForm):
         return self.cleaned_data.get("username")
 
 
-class TransactionForm(forms.ModelForm):
+class CategoryNameMixin(forms.Form):
+    """Edit a model's ``category`` foreign key as a free-text category name.
+
+    The name is matched case-insensitively against the owner's categories on
+    save, and a new Category is created when there is no match. The owner is
+    the instance's user when it has one (e.g. a superuser editing someone
+    else's row), otherwise the ``user`` passed in for a new object.
+    """
+
+    category = forms.CharField(
+        max_length=100,
+        widget=forms.TextInput(
+            attrs={"class": "form-control", "placeholder": "e.g., Food, Rent"}
+        ),
+    )
+
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.user = user
+        if self.instance.pk and "category" not in self.initial:
+            self.initial["category"] = self.instance.category.name
+
+    def clean_category(self):
+        name = self.cleaned_data["category"].strip()
+        if not name:
+            raise forms.ValidationError("Category cannot be empty.")
+        return name
+
+    def save(self, commit=True):
+        owner = self.user
+        owner_id = self.instance.user_id
+        if owner_id and owner_id != getattr(owner, "pk", None):
+            owner = self.instance.user  # Another user's row, e.g. edited by a superuser
+        self.instance.category = Category.objects.resolve(
+            owner, self.cleaned_data["category"]
+        )
+        return super().save(commit)
+
+
+class TransactionForm(CategoryNameMixin, forms.ModelForm):
+    field_order = [
+        "title",
+        "amount",
+        "transaction_type",
+        "category",
+        "date",
+        "notes",
+        "recurring",
+        "payment_method",
+    ]
+
     class Meta:
         model = Transaction
         fields = [
             "title",
             "amount",
             "transaction_type",
-            "category",
             "date",
             "notes",
             "recurring",
@@ -54,9 +117,6 @@ class TransactionForm(forms.ModelForm):
                 }
             ),
             "transaction_type": forms.Select(attrs={"class": "form-control"}),
-            "category": forms.TextInput(
-                attrs={"class": "form-control", "placeholder": "e.g., Food, Rent"}
-            ),
             "date": forms.DateInput(attrs={"class": "form-control", "type": "date"}),
             "notes": forms.Textarea(
                 attrs={
@@ -70,26 +130,19 @@ class TransactionForm(forms.ModelForm):
         }
 
     def clean_amount(self):
-        amount = self.cleaned_data["amount"]
-        if amount <= 0:
-            raise forms.ValidationError("Amount must be greater than zero.")
-        return amount
+        return validate_transaction_amount(self.cleaned_data["amount"])
 
     def clean_title(self):
-        title = self.cleaned_data["title"]
-        if not title.strip():
-            raise forms.ValidationError("Title cannot be empty.")
-        return title
+        return validate_transaction_title(self.cleaned_data["title"])
+
 
+class BudgetForm(CategoryNameMixin, forms.ModelForm):
+    field_order = ["category", "amount", "start_date", "end_date", "notes"]
 
-class BudgetForm(forms.ModelForm):
     class Meta:
         model = Budget
-        fields = ["category", "amount", "start_date", "end_date", "notes"]
+        fields = ["amount", "start_date", "end_date", "notes"]
         widgets = {
-            "category": forms.TextInput(
-                attrs={"class": "form-control", "placeholder": "e.g., Food, Rent"}
-            ),
             "amount": forms.NumberInput(
                 attrs={
                     "class": "form-control",
@@ -118,3 +171,72 @@ class BudgetForm(forms.ModelForm):
         if amount <= 0:
             raise forms.ValidationError("Budget amount must be greater than zero.")
         return amount
+
+
+class TransactionImportForm(forms.Form):
+    FORMATS = [
+        ("", "Detect from file name"),
+        ("csv", "CSV"),
+        ("ofx", "OFX / QFX"),
+    ]
+
+    file = forms.FileField(widget=forms.ClearableFileInput(attrs={"class": "form-control"}))
+    file_format = forms.ChoiceField(
+        choices=FORMATS,
+        required=False,
+        widget=forms.Select(attrs={"class": "form-control"}),
+    )
+
+
+class TransactionBulkForm(forms.Form):
+    """One action applied to the transactions selected on the transaction list."""
+
+    ACTIONS = [
+        ("change_category", "Change category"),
+        ("change_payment_method", "Change payment method"),
+        ("toggle_recurring", "Toggle recurring"),
+        ("delete", "Delete"),
+    ]
+    MAX_SELECTED = 1000
+
+    action = forms.ChoiceField(
+        choices=ACTIONS, widget=forms.Select(attrs={"class": "form-control"})
+    )
+    ids = forms.Field(
+        widget=forms.MultipleHiddenInput,
+        error_messages={"required": "Select at least one transaction."},
+    )
+    category = forms.CharField(
+        max_length=100,
+        required=False,
+        widget=forms.TextInput(
+            attrs={"class": "form-control", "placeholder": "New category"}
+        ),
+    )
+    payment_method = forms.ChoiceField(
+        choices=[("", "New payment method")] + Transaction.PAYMENT_METHODS,
+        required=False,
+        widget=forms.Select(attrs={"class": "form-control"}),
+    )
+    # Set by the confirmation page, which every bulk delete goes through
+    confirmed = forms.BooleanField(required=False, widget=forms.HiddenInput)
+
+    def clean_ids(self):
+        try:
+            ids = {int(value) for value in self.cleaned_data["ids"]}
+        except (TypeError, ValueError):
+            raise forms.ValidationError("Invalid transaction selection.")
+        if len(ids) > self.MAX_SELECTED:
+            raise forms.ValidationError(
+                f"Select at most {self.MAX_SELECTED} transactions at a time."
+            )
+        return sorted(ids)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get("action")
+        if action == "change_category" and not cleaned_data.get("category", "").strip():
+            self.add_error("category", "Enter the new category.")
+        if action == "change_payment_method" and not cleaned_data.get("payment_method"):
+            self.add_error("payment_method", "Choose the new payment method.")
+        return cleaned_data
@@ -0,0 +1,238 @@
+"""Bulk import of bank statement files.
+
+Statements are parsed as a stream (CSV or OFX/QFX), every row is validated
+with the same rules as TransactionForm, and valid rows are written with
+batched ``bulk_create`` calls, one database transaction per batch. Rollups
+are updated once per batch and the data version once per import, instead
+of once per row as ``Transaction.save()`` would. An import that stops part
+way, e.g. on a byte that is not UTF-8, keeps the batches already written and
+still bumps the data version for them.
+"""
+
+import codecs
+import csv
+import datetime
+import re
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+
+from django import forms
+from django.db import transaction
+
+from . import rollups, versioning
+from .forms import validate_transaction_amount, validate_transaction_title
+from .models import Category, Transaction
+
+BATCH_SIZE = 1000
+MAX_AMOUNT = Decimal("99999999.99")  # max_digits=10, decimal_places=2
+DEFAULT_CATEGORY = "Uncategorized"
+DEFAULT_PAYMENT_METHOD = "bank_transfer"
+
+OFX_TAG = re.compile(r"<(/?)([A-Z0-9.]+)>([^<]*)", re.IGNORECASE)
+TRANSACTION_TYPES = {value.lower(): value for value, _ in Transaction.TRANSACTION_TYPES}
+PAYMENT_METHODS = {value for value, _ in Transaction.PAYMENT_METHODS}
+
+
+@dataclass
+class RowError:
+    line: int
+    message: str
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    errors: list = field(default_factory=list)
+
+
+class ImportFileError(Exception):
+    """The statement file itself could not be read (encoding or CSV syntax).
+
+    ``result`` holds what was imported before the error; those batches are
+    already committed.
+    """
+
+    def __init__(self, message, result):
+        super().__init__(message)
+        self.result = result
+
+
+def _lines(fileobj):
+    """Decode a binary file line by line, dropping a UTF-8 byte order mark."""
+    return codecs.iterdecode(fileobj, "utf-8-sig")
+
+
+def parse_csv(fileobj):
+    """Yield (line number, row dict) pairs from a CSV statement.
+
+    Headers are matched case-insensitively; ``date``, ``title`` and ``amount``
+    are required, ``transaction_type`` (or ``type``), ``category``, ``notes``
+    and ``payment_method`` are optional.
+    """
+    reader = csv.DictReader(_lines(fileobj))
+    for row in reader:
+        yield reader.line_num, {
+            key.strip().lower(): (value or "").strip()
+            for key, value in row.items()
+            if key
+        }
+
+
+def parse_ofx(fileobj):
+    """Yield (transaction number, row dict) pairs from an OFX/QFX statement.
+
+    Handles both SGML (unclosed tags) and XML flavours. The signed TRNAMT
+    decides the transaction type.
+    """
+    current = None
+    number = 0
+    for line in _lines(fileobj):
+        for closing, tag, value in OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if closing and current is not None:
+                    number += 1
+                    yield number, _ofx_row(current)
+                    current = None
+                elif not closing:
+                    current = {}
+            elif current is not None and not closing:
+                current[tag] = value.strip()
+
+
+def _ofx_row(values):
+    name, memo = values.get("NAME", ""), values.get("MEMO", "")
+    posted = values.get("DTPOSTED", "")[:8]
+    return {
+        "date": f"{posted[:4]}-{posted[4:6]}-{posted[6:8]}" if len(posted) == 8 else "",
+        "title": name or memo,
+        "amount": values.get("TRNAMT", ""),
+        "notes": memo if name else "",
+    }
+
+
+PARSERS = {"csv": parse_csv, "ofx": parse_ofx, "qfx": parse_ofx}
+
+
+def detect_format(filename):
+    """Guess the statement format from a file name, defaulting to CSV."""
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    return "ofx" if extension in ("ofx", "qfx") else "csv"
+
+
+def clean_row(raw):
+    """Validate one parsed row and return Transaction field values.
+
+    Raises:
+        forms.ValidationError: If the row is invalid.
+    """
+    title = validate_transaction_title(raw.get("title", ""))
+    if len(title) > 255:
+        raise forms.ValidationError("Title is longer than 255 characters.")
+
+    try:
+        amount = Decimal(raw.get("amount", "").replace(",", ""))
+    except InvalidOperation:
+        raise forms.ValidationError(f"Invalid amount: {raw.get('amount')!r}.")
+    if not amount.is_finite():
+        raise forms.ValidationError(f"Invalid amount: {raw.get('amount')!r}.")
+
+    type_value = raw.get("transaction_type") or raw.get("type") or ""
+    if type_value:
+        transaction_type = TRANSACTION_TYPES.get(type_value.lower())
+        if transaction_type is None:
+            raise forms.ValidationError(f"Unknown transaction type: {type_value!r}.")
+    else:
+        # Signed statement amounts: negative values are money going out
+        transaction_type = "Expense" if amount < 0 else "Income"
+        amount = abs(amount)
+    amount = validate_transaction_amount(amount.quantize(Decimal("0.01")))
+    if amount > MAX_AMOUNT:
+        raise forms.ValidationError("Amount is too large.")
+
+    try:
+        date = datetime.date.fromisoformat(raw.get("date", ""))
+    except ValueError:
+        raise forms.ValidationError(
+            f"Invalid date: {raw.get('date')!r}; use YYYY-MM-DD."
+        )
+
+    category = raw.get("category") or DEFAULT_CATEGORY
+    if len(category) > 100:
+        raise forms.ValidationError("Category is longer than 100 characters.")
+    payment_method = raw.get("payment_method") or DEFAULT_PAYMENT_METHOD
+    if payment_method not in PAYMENT_METHODS:
+        raise forms.ValidationError(f"Unknown payment method: {payment_method!r}.")
+
+    return {
+        "title": title,
+        "amount": amount,
+        "transaction_type": transaction_type,
+        "category": category,
+        "date": date,
+        "notes": raw.get("notes") or None,
+        "payment_method": payment_method,
+    }
+
+
+def _write_batch(batch):
+    with transaction.atomic():
+        Transaction.objects.bulk_create(batch)
+        deltas = rollups.new_deltas()
+        for obj in batch:
+            rollups.add_delta(deltas, obj.rollup_state())
+        rollups.apply_deltas(deltas)
+
+
+def import_transactions(user, rows, batch_size=BATCH_SIZE):
+    """Validate and insert parsed statement rows for ``user``.
+
+    Args:
+        user: The User who owns the imported transactions.
+        rows: An iterable of (line number, row dict) pairs from a parser.
+        batch_size: Rows per ``bulk_create`` and database transaction.
+
+    Returns:
+        ImportResult: The number of rows created and the per-row errors.
+
+    Raises:
+        ImportFileError: If the file cannot be decoded or parsed part way.
+    """
+    result = ImportResult()
+    batch = []
+    categories = {}  # Lower-cased name -> Category, one lookup per distinct name
+    try:
+        for line, raw in rows:
+            try:
+                values = clean_row(raw)
+            except forms.ValidationError as e:
+                result.errors.append(RowError(line, " ".join(e.messages)))
+                continue
+            name = values.pop("category")
+            category = categories.get(name.lower())
+            if category is None:
+                category = categories[name.lower()] = Category.objects.resolve(
+                    user, name
+                )
+            batch.append(Transaction(user=user, category=category, **values))
+            if len(batch) >= batch_size:
+                _write_batch(batch)
+                result.created += len(batch)
+                batch = []
+        if batch:
+            _write_batch(batch)
+            result.created += len(batch)
+    except UnicodeDecodeError as e:
+        raise ImportFileError("The file is not UTF-8 text.", result) from e
+    except csv.Error as e:
+        raise ImportFileError(f"The file is not valid CSV: {e}.", result) from e
+    finally:
+        # Committed batches must invalidate caches even if a later one failed
+        if result.created:
+            versioning.bump([user.pk])
+    return result
+
+
+def import_file(user, fileobj, file_format="csv", batch_size=BATCH_SIZE):
+    """Parse and import a binary statement file in the given format."""
+    return import_transactions(user, PARSERS[file_format](fileobj), batch_size)
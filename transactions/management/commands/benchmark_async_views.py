@@ -0,0 +1,122 @@
+import asyncio
+import datetime
+import random
+import statistics
+import time
+import types
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from finance_tracker import urls as root_urls
+from transactions import concurrency, rollups
+from transactions.models import Budget, Category, Transaction
+
+PAGES = ["landing_page", "transaction_list", "budget_list"]
+CATEGORIES = ["Food", "Rent", "Travel", "Utilities", "Fun", "Health"]
+
+
+def urlconf(name, urlpatterns):
+    module = types.ModuleType(name)
+    module.urlpatterns = urlpatterns
+    return module
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare page latency of the sync views through the WSGI handler with "
+        "the async views through the ASGI handler, for a temporary user."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests", type=int, default=50, help="Requests per page and path."
+        )
+        parser.add_argument(
+            "--transactions",
+            type=int,
+            default=5000,
+            help="Transactions created for the temporary user.",
+        )
+
+    def seed(self, transactions):
+        user = User.objects.create_user(f"bench-{uuid.uuid4().hex[:8]}")
+        categories = Category.objects.bulk_create(
+            Category(user=user, name=name) for name in CATEGORIES
+        )
+        today = datetime.date.today()
+        Transaction.objects.bulk_create(
+            (
+                Transaction(
+                    user=user,
+                    title=f"Transaction {i}",
+                    amount=random.randint(1, 500),
+                    transaction_type=random.choice(["Income", "Expense"]),
+                    category=random.choice(categories),
+                    date=today - datetime.timedelta(days=random.randint(0, 720)),
+                )
+                for i in range(transactions)
+            ),
+            batch_size=1000,
+        )
+        Budget.objects.bulk_create(
+            Budget(user=user, category=category, amount=1000, start_date=today)
+            for category in categories
+        )
+        rollups.rebuild([user.pk])
+        return user
+
+    def time_sync(self, user, url, requests):
+        client = Client()
+        client.force_login(user)
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            client.get(url)
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    async def time_async(self, user, url, requests):
+        client = AsyncClient()
+        await client.aforce_login(user)
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            await client.get(url)
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    def report(self, label, timings):
+        timings = sorted(timings)
+        self.stdout.write(
+            f"{label:<32}{statistics.mean(timings) * 1000:>10.1f}"
+            f"{statistics.median(timings) * 1000:>10.1f}"
+            f"{timings[int(len(timings) * 0.95) - 1] * 1000:>10.1f}"
+        )
+
+    def handle(self, *args, requests=50, transactions=5000, **options):
+        sync_patterns = [
+            p for p in root_urls.urlpatterns if p not in root_urls.async_urlpatterns
+        ]
+        sync_urls = urlconf("sync_urls", sync_patterns)
+        async_urls = urlconf("async_urls", root_urls.async_urlpatterns + sync_patterns)
+        user = self.seed(transactions)
+        self.stdout.write(f"{'page (ms)':<32}{'mean':>10}{'p50':>10}{'p95':>10}")
+        try:
+            # No dashboard caching, so every request runs the dashboard queries
+            with override_settings(ALLOWED_HOSTS=["testserver"], DASHBOARD_CACHE_TTL=0):
+                for page in PAGES:
+                    with override_settings(ROOT_URLCONF=sync_urls):
+                        timings = self.time_sync(user, reverse(page), requests)
+                    self.report(f"{page} (WSGI, sync)", timings)
+                    with override_settings(ROOT_URLCONF=async_urls):
+                        timings = asyncio.run(
+                            self.time_async(user, reverse(page), requests)
+                        )
+                    self.report(f"{page} (ASGI, async)", timings)
+        finally:
+            concurrency.shutdown()
+            user.delete()
@@ -0,0 +1,92 @@
+import re
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+SESSION_WRITE = re.compile(r'^\s*(INSERT|UPDATE|DELETE)\b.*"django_session"', re.S)
+SESSION_QUERY = re.compile(r'"django_session"')
+REFRESH_MIDDLEWARE = "transactions.middleware.SessionRefreshMiddleware"
+
+
+class QueryCounter:
+    """``execute_wrapper`` hook counting all queries and session queries."""
+
+    def __init__(self):
+        self.queries = self.session_queries = self.session_writes = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        if SESSION_QUERY.search(sql):
+            self.session_queries += 1
+            if SESSION_WRITE.match(sql):
+                self.session_writes += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Count django_session reads and writes per request, saving the session "
+        "on every request versus the throttled SessionRefreshMiddleware."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Page views per session mode."
+        )
+
+    def modes(self):
+        throttled = [m for m in settings.MIDDLEWARE]
+        every_request = [m for m in throttled if m != REFRESH_MIDDLEWARE]
+        return [
+            (
+                "db, save every request (before)",
+                {
+                    "SESSION_ENGINE": "django.contrib.sessions.backends.db",
+                    "SESSION_SAVE_EVERY_REQUEST": True,
+                    "MIDDLEWARE": every_request,
+                },
+            ),
+            (
+                "db, throttled refresh",
+                {"SESSION_ENGINE": "django.contrib.sessions.backends.db"},
+            ),
+            (
+                "signed_cookies, throttled refresh",
+                {"SESSION_ENGINE": "django.contrib.sessions.backends.signed_cookies"},
+            ),
+        ]
+
+    def measure(self, user, password, requests):
+        client = Client()
+        client.login(username=user.username, password=password)
+        url = reverse("budget_list")
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            for _ in range(requests):
+                client.get(url)
+        return counter
+
+    def handle(self, *args, requests=200, **options):
+        self.stdout.write(
+            f"{'mode':<36}{'queries/req':>12}{'session q/req':>15}{'writes/req':>12}"
+        )
+        # Everything the benchmark creates is rolled back
+        with transaction.atomic():
+            password = uuid.uuid4().hex
+            user = User.objects.create_user(
+                f"bench-{uuid.uuid4().hex[:8]}", password=password
+            )
+            for label, overrides in self.modes():
+                with override_settings(ALLOWED_HOSTS=["testserver"], **overrides):
+                    counter = self.measure(user, password, requests)
+                self.stdout.write(
+                    f"{label:<36}{counter.queries / requests:>12.2f}"
+                    f"{counter.session_queries / requests:>15.2f}"
+                    f"{counter.session_writes / requests:>12.2f}"
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,242 @@
+import io
+import json
+import platform
+import statistics
+import tempfile
+import time
+import uuid
+
+import django
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from transactions import rollups, search, synthetic
+from transactions.dashboard import get_dashboard_context
+from transactions.models import Budget
+from transactions.reports import build_financial_report
+
+# label -> (URL name, query string)
+VIEWS = {
+    "landing_page": ("landing_page", ""),
+    "transaction_list": ("transaction_list", ""),
+    "transaction_list_by_amount": ("transaction_list", "sort_by=amount_desc"),
+    "transaction_list_filtered": (
+        "transaction_list",
+        "transaction_type=Expense&category=Groceries",
+    ),
+    "budget_list": ("budget_list", ""),
+    "download_report": ("download_report", ""),
+}
+
+# label -> (function of the user, whether it runs once instead of --requests times)
+QUERIES = {
+    "dashboard_context": (get_dashboard_context, False),
+    "rollup_totals": (rollups.totals_for_user, False),
+    "budget_utilization": (
+        lambda user: list(Budget.objects.filter(user=user).with_utilization()),
+        False,
+    ),
+    "search": (
+        lambda user: list(search.search_transactions(user, "coffee")[:50]),
+        False,
+    ),
+    # Rendering every row is the slow path of download_report
+    "report_pdf": (lambda user: build_financial_report(user, io.BytesIO()), True),
+}
+
+
+class QueryCounter:
+    """``execute_wrapper`` hook counting queries."""
+
+    def __init__(self):
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+def summarize(timings, queries):
+    timings = sorted(timings)
+    return {
+        "runs": len(timings),
+        "mean_ms": round(statistics.mean(timings) * 1000, 3),
+        "p50_ms": round(statistics.median(timings) * 1000, 3),
+        "p95_ms": round(timings[max(int(len(timings) * 0.95) - 1, 0)] * 1000, 3),
+        "queries": round(queries / len(timings), 2),
+    }
+
+
+def compare(baseline, results, tolerance):
+    """Yield (size, label, before, after, regressed) for every shared benchmark.
+
+    A benchmark regresses when its median grows by more than ``tolerance``
+    (a fraction) or it runs more queries than in the baseline.
+    """
+    for size, benchmarks in results.items():
+        for label, after in benchmarks.items():
+            before = baseline.get(size, {}).get(label)
+            if before is None:
+                continue
+            regressed = (
+                after["p50_ms"] > before["p50_ms"] * (1 + tolerance)
+                or after["queries"] > before["queries"]
+            )
+            yield size, label, before, after, regressed
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the main views and queries for a synthetic user at several data "
+        "sizes, write the results as a JSON baseline, and optionally compare "
+        "them with an earlier baseline. All generated data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=lambda value: [int(size) for size in value.split(",")],
+            default=[1000, 10_000, 100_000],
+            help="Comma-separated transaction counts for the benchmark user.",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=20, help="Timed runs per benchmark."
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed for the data."
+        )
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+        parser.add_argument(
+            "--compare", help="Baseline JSON file to compare the results with."
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.25,
+            help="Allowed median slowdown against the baseline, as a fraction.",
+        )
+
+    def time_runs(self, func, runs):
+        counter = QueryCounter()
+        timings = []
+        func()  # Warm-up: caches, connections, first-time imports
+        with connection.execute_wrapper(counter):
+            for _ in range(runs):
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+        return summarize(timings, counter.queries)
+
+    def get_page(self, client, url):
+        def request():
+            response = client.get(url)
+            if response.status_code != 200:
+                raise CommandError(f"GET {url} returned {response.status_code}.")
+            if response.streaming:
+                # Read the whole body, as a browser would; this also closes it
+                b"".join(response.streaming_content)
+
+        return request
+
+    def run_size(self, size, requests, seed):
+        result = synthetic.seed(
+            1, size, seed=seed, prefix=f"bench-{uuid.uuid4().hex[:8]}"
+        )
+        synthetic.analyze()
+        user = User.objects.get(pk=result.user_ids[0])
+        client = Client()
+        client.force_login(user)
+
+        benchmarks = {}
+        for label, (url_name, query) in VIEWS.items():
+            url = reverse(url_name) + (f"?{query}" if query else "")
+            benchmarks[f"view:{label}"] = self.time_runs(
+                self.get_page(client, url), requests
+            )
+        for label, (func, once) in QUERIES.items():
+            benchmarks[f"query:{label}"] = self.time_runs(
+                lambda: func(user), 1 if once else requests
+            )
+        return benchmarks
+
+    def handle(self, *args, sizes, requests, seed, **options):
+        results = {}
+        with tempfile.TemporaryDirectory() as reports_root:
+            # No dashboard caching, so every request runs the dashboard
+            # queries; reports render in the request and are then served
+            # from disk
+            with override_settings(
+                ALLOWED_HOSTS=["testserver"],
+                DASHBOARD_CACHE_TTL=0,
+                REPORT_JOBS_INLINE=True,
+                REPORTS_ROOT=reports_root,
+            ):
+                for size in sizes:
+                    self.stdout.write(f"Benchmarking {size} transactions...")
+                    # Everything the benchmark creates is rolled back
+                    with transaction.atomic():
+                        results[str(size)] = self.run_size(size, requests, seed)
+                        transaction.set_rollback(True)
+                    self.report(results[str(size)])
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(
+                    self.document(results, sizes, requests, seed), output, indent=2
+                )
+            self.stdout.write(f"Wrote {options['output']}.")
+        if options["compare"]:
+            self.compare(options["compare"], results, options["tolerance"])
+
+    def document(self, results, sizes, requests, seed):
+        return {
+            "created_at": timezone.now().isoformat(),
+            "environment": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "postgresql": connection.pg_version,
+                "machine": platform.machine(),
+            },
+            "parameters": {"sizes": sizes, "requests": requests, "seed": seed},
+            "results": results,
+        }
+
+    def report(self, benchmarks):
+        self.stdout.write(
+            f"  {'benchmark':<38}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'queries':>9}"
+        )
+        for label, stats in benchmarks.items():
+            self.stdout.write(
+                f"  {label:<38}{stats['mean_ms']:>10.1f}{stats['p50_ms']:>10.1f}"
+                f"{stats['p95_ms']:>10.1f}{stats['queries']:>9g}"
+            )
+
+    def compare(self, path, results, tolerance):
+        try:
+            with open(path) as baseline_file:
+                baseline = json.load(baseline_file)["results"]
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f"Cannot read baseline {path}: {e}")
+
+        regressions = 0
+        self.stdout.write(
+            f"{'size':>10}  {'benchmark':<38}{'p50 before':>12}{'p50 after':>11}"
+            f"{'change':>9}{'queries':>11}"
+        )
+        for size, label, before, after, regressed in compare(
+            baseline, results, tolerance
+        ):
+            change = after["p50_ms"] / before["p50_ms"] - 1 if before["p50_ms"] else 0
+            line = (
+                f"{size:>10}  {label:<38}{before['p50_ms']:>12.1f}{after['p50_ms']:>11.1f}"
+                f"{change:>+9.0%}{before['queries']:>5g} -> {after['queries']:g}"
+            )
+            regressions += regressed
+            self.stdout.write(self.style.ERROR(line) if regressed else line)
+        if regressions:
+            raise CommandError(f"{regressions} benchmarks regressed against {path}.")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {path}."))
@@ -0,0 +1,47 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from transactions import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the upcoming date partitions of the transaction table, moving "
+        "any rows they cover out of the default partition. Run it daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            choices=partitions.INTERVALS,
+            help="Partition size (default: TRANSACTION_PARTITION_INTERVAL).",
+        )
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            help="Intervals to create after the current one "
+            "(default: TRANSACTION_PARTITIONS_AHEAD).",
+        )
+        parser.add_argument(
+            "--since",
+            help="Also cover every date from this one (YYYY-MM-DD), e.g. to "
+            "move old rows out of the default partition.",
+        )
+
+    def handle(self, *args, interval=None, ahead=None, since=None, **options):
+        interval = partitions.get_interval(interval)
+        today = datetime.date.today()
+        if since:
+            try:
+                since = datetime.date.fromisoformat(since)
+            except ValueError:
+                raise CommandError(f"Invalid --since date: {since!r}; use YYYY-MM-DD.")
+        created = partitions.ensure_partitions(
+            min(since or today, today),
+            partitions.ahead(today, interval, ahead),
+            interval,
+        )
+        for name in created:
+            self.stdout.write(f"Created {name}")
+        self.stdout.write(self.style.SUCCESS(f"Created {len(created)} partitions."))
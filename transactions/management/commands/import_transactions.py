@@ -0,0 +1,52 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from transactions import importer
+
+
+class Command(BaseCommand):
+    help = "Import transactions for a user from a CSV or OFX/QFX bank statement."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Statement file to import.")
+        parser.add_argument(
+            "--user", required=True, dest="username", help="Owner of the transactions."
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(importer.PARSERS),
+            dest="file_format",
+            help="Statement format (guessed from the file extension by default).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=importer.BATCH_SIZE,
+            help="Rows written per database transaction.",
+        )
+
+    def handle(self, path, username, file_format=None, batch_size=None, **options):
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f"User {username!r} does not exist.")
+
+        file_format = file_format or importer.detect_format(path)
+        try:
+            with open(path, "rb") as fileobj:
+                result = importer.import_file(user, fileobj, file_format, batch_size)
+        except OSError as e:
+            raise CommandError(f"Cannot read {path}: {e}")
+        except importer.ImportFileError as e:
+            raise CommandError(
+                f"Cannot read {path}: {e} Imported {e.result.created} "
+                f"transactions before the error."
+            )
+
+        for error in result.errors:
+            self.stderr.write(f"Line {error.line}: {error.message}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.created} transactions, skipped {len(result.errors)} rows."
+            )
+        )
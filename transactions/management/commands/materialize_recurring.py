@@ -0,0 +1,32 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from transactions import recurring
+
+
+class Command(BaseCommand):
+    help = "Create the missing occurrences of recurring transactions up to a horizon."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--until",
+            help="Horizon date (YYYY-MM-DD), inclusive. Defaults to today.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=recurring.CHUNK_SIZE,
+            help="Recurring templates processed per database transaction.",
+        )
+
+    def handle(self, *args, until=None, chunk_size=None, **options):
+        if until:
+            try:
+                until = datetime.date.fromisoformat(until)
+            except ValueError:
+                raise CommandError(f"Invalid --until date: {until!r}; use YYYY-MM-DD.")
+        created = recurring.materialize(until=until, chunk_size=chunk_size)
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {created} recurring transactions.")
+        )
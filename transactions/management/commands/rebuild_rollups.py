@@ -0,0 +1,41 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from transactions import rollups
+
+
+class Command(BaseCommand):
+    help = "Backfill MonthlyRollup from transactions, or verify that it is current."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="usernames",
+            help="Only process this username (may be repeated).",
+        )
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Compare rollups with the transactions instead of rebuilding.",
+        )
+
+    def handle(self, *args, usernames=None, verify=False, **options):
+        user_ids = None
+        if usernames:
+            user_ids = list(
+                User.objects.filter(username__in=usernames).values_list("id", flat=True)
+            )
+            if len(user_ids) != len(set(usernames)):
+                raise CommandError("One or more usernames do not exist.")
+
+        if not verify:
+            written = rollups.rebuild(user_ids)
+            self.stdout.write(f"Wrote {written} rollup rows.")
+
+        mismatches = rollups.verify(user_ids)
+        for bucket, expected, actual in mismatches:
+            self.stderr.write(f"Mismatch {bucket}: expected {expected}, found {actual}")
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} rollup buckets are out of date.")
+        self.stdout.write(self.style.SUCCESS("Rollups match the transactions."))
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from transactions import report_jobs
+
+
+class Command(BaseCommand):
+    help = "Render queued PDF report jobs. Run on the host that serves REPORTS_ROOT."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit when the queue is empty instead of polling.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait between polls of an empty queue.",
+        )
+
+    def handle(self, *args, once=False, poll_interval=2.0, **options):
+        requeued = report_jobs.requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f"Re-queued {requeued} stale jobs.")
+        while True:
+            job = report_jobs.claim_next_job()
+            if job is None:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+            job = report_jobs.render_job(job)
+            self.stdout.write(f"Job {job.pk} for user {job.user_id}: {job.status}")
@@ -0,0 +1,75 @@
+import datetime
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from transactions import synthetic
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate realistic synthetic users, transactions and budgets for load "
+        "testing. The same --seed and counts always produce the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100, help="Users to create.")
+        parser.add_argument(
+            "--transactions",
+            type=int,
+            default=100_000,
+            help="Total transactions, shared unevenly among the users.",
+        )
+        parser.add_argument("--budgets", type=int, default=4, help="Budgets per user.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+        parser.add_argument("--prefix", default="synthetic", help="Username prefix.")
+        parser.add_argument(
+            "--end-date",
+            type=datetime.date.fromisoformat,
+            help="Latest transaction date, YYYY-MM-DD (default: today).",
+        )
+        parser.add_argument(
+            "--days", type=int, default=730, help="Days of history per user."
+        )
+        parser.add_argument(
+            "--password", help="Password for every user (default: unusable)."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=synthetic.CHUNK_SIZE,
+            help="Transactions per COPY statement.",
+        )
+
+    def handle(self, *args, users, transactions, prefix, **options):
+        if users < 1 or transactions < 0 or options["days"] < 1:
+            raise CommandError("--users and --days must be positive.")
+        if User.objects.filter(username__startswith=f"{prefix}-").exists():
+            raise CommandError(
+                f"Users named {prefix}-* already exist; choose another --prefix."
+            )
+
+        start = time.perf_counter()
+        # All rows or none
+        with transaction.atomic():
+            result = synthetic.seed(
+                users,
+                transactions,
+                budgets=options["budgets"],
+                seed=options["seed"],
+                prefix=prefix,
+                end_date=options["end_date"],
+                days=options["days"],
+                password=options["password"],
+                chunk_size=options["chunk_size"],
+            )
+        synthetic.analyze()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(result.user_ids)} users, {result.transactions} "
+                f"transactions and {result.budgets} budgets in "
+                f"{time.perf_counter() - start:.1f}s."
+            )
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from transactions.quotes import refresh_quote
+
+
+class Command(BaseCommand):
+    help = "Fetch a motivational quote and store it in the shared cache."
+
+    def handle(self, *args, **options):
+        quote = refresh_quote()
+        if quote is None:
+            raise CommandError("All quote providers failed; the local pool will be used.")
+        self.stdout.write(self.style.SUCCESS(f"Cached quote: {quote}"))
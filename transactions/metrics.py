@@ -0,0 +1,104 @@
+"""In-process request metrics in the Prometheus text format.
+
+MetricsMiddleware observes, for every request, the wall time, the number
+and total duration of database queries, and the response size into
+fixed-bucket histograms labelled with the URL name. A request's values are
+recorded together under one lock, so this costs a few microseconds.
+Metrics are per process; with several workers, scrape or sum each of them.
+"""
+
+import threading
+from bisect import bisect_left
+
+from finance_tracker.db.base import connect_stats
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERIES = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# (name, help text, bucket upper bounds), in the order values are observed
+HISTOGRAMS = (
+    ("request_duration_seconds", "Wall time to produce the response.", SECONDS),
+    ("request_db_queries", "Database queries run for the request.", QUERIES),
+    ("request_db_duration_seconds", "Time spent in database queries.", SECONDS),
+    ("response_size_bytes", "Response body size, when known up front.", BYTES),
+)
+BUCKETS = tuple(buckets for _, _, buckets in HISTOGRAMS)
+PREFIX = "finance_tracker_"
+
+
+class ViewStats:
+    """The histograms of one view, updated together under one lock."""
+
+    __slots__ = ("counts", "sums", "_lock")
+
+    def __init__(self):
+        self.counts = [[0] * (len(buckets) + 1) for buckets in BUCKETS]
+        self.sums = [0] * len(BUCKETS)
+        self._lock = threading.Lock()
+
+    def observe(self, values):
+        """Record one value per histogram, in ``HISTOGRAMS`` order; None skips one."""
+        with self._lock:
+            for i, value in enumerate(values):
+                if value is not None:
+                    self.counts[i][bisect_left(BUCKETS[i], value)] += 1
+                    self.sums[i] += value
+
+    def snapshot(self, i):
+        with self._lock:
+            return list(self.counts[i]), self.sums[i]
+
+
+class Registry:
+    """Per-view histograms, keyed by URL name."""
+
+    def __init__(self):
+        self._views = {}
+
+    def observe(self, view, values):
+        stats = self._views.get(view)
+        if stats is None:
+            stats = self._views.setdefault(view, ViewStats())
+        stats.observe(values)
+
+    def clear(self):
+        self._views.clear()
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        views = sorted(self._views.items())
+        for i, (name, help_text, buckets) in enumerate(HISTOGRAMS):
+            lines += [
+                f"# HELP {PREFIX}{name} {help_text}",
+                f"# TYPE {PREFIX}{name} histogram",
+            ]
+            for view, stats in views:
+                counts, total = stats.snapshot(i)
+                if not any(counts):  # e.g. no sized responses yet
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip((*buckets, "+Inf"), counts):
+                    cumulative += bucket_count
+                    lines.append(
+                        f'{PREFIX}{name}_bucket{{view="{view}",le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f'{PREFIX}{name}_sum{{view="{view}"}} {total}')
+                lines.append(f'{PREFIX}{name}_count{{view="{view}"}} {cumulative}')
+
+        stats = connect_stats.snapshot()
+        lines += [
+            f"# HELP {PREFIX}db_connections_opened_total Database connections opened.",
+            f"# TYPE {PREFIX}db_connections_opened_total counter",
+            f"{PREFIX}db_connections_opened_total {stats['count']}",
+            f"# HELP {PREFIX}db_connect_seconds_total Time spent opening database connections.",
+            f"# TYPE {PREFIX}db_connect_seconds_total counter",
+            f"{PREFIX}db_connect_seconds_total {stats['total_seconds']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
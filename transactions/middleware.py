@@ -0,0 +1,112 @@
+"""Request middleware."""
+
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from finance_tracker.db.base import QueryStats, query_stats
+
+from .metrics import registry
+
+REFRESHED_AT_KEY = "_refreshed_at"
+
+
+class SessionRefreshMiddleware:
+    """Slide session expiry forward at most once per refresh interval.
+
+    Replaces ``SESSION_SAVE_EVERY_REQUEST``, which rewrites the session on
+    every request. Here an otherwise unmodified session is only marked for
+    saving when ``SESSION_REFRESH_INTERVAL`` seconds have passed since it was
+    last saved, so the expiry still slides but lags by at most that interval.
+    Must come right after SessionMiddleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self.refresh(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        # Only reads a session that is already loaded, so no query runs here
+        self.refresh(request)
+        return response
+
+    def refresh(self, request):
+        session = getattr(request, "session", None)
+        # Leave alone sessions the request never loaded, or has none of
+        if session is None or not session.accessed or session.is_empty():
+            return
+
+        now = int(time.time())
+        interval = getattr(settings, "SESSION_REFRESH_INTERVAL", 300)
+        if session.modified or now - session.get(REFRESHED_AT_KEY, 0) >= interval:
+            # Marks the session modified, so SessionMiddleware saves it and
+            # re-sends the cookie with a fresh expiry
+            session[REFRESHED_AT_KEY] = now
+
+
+class MetricsMiddleware:
+    """Record latency, query count, query time and size per URL name.
+
+    Must come first, so its timings cover the rest of the stack. Queries are
+    counted through ``query_stats``, which also follows async views onto the
+    threads that run their ORM calls.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            query_stats.reset(token)
+        self.record(request, response, time.perf_counter() - start, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            query_stats.reset(token)
+        self.record(request, response, time.perf_counter() - start, stats)
+        return response
+
+    def record(self, request, response, elapsed, stats):
+        size = None
+        if not response.streaming:
+            size = len(response.content)
+        elif response.has_header("Content-Length"):
+            size = int(response["Content-Length"])
+        match = request.resolver_match
+        # Unresolved paths share one label, so scanners cannot add series
+        registry.observe(
+            match.view_name if match else "unmatched",
+            (elapsed, stats.queries, stats.seconds, size),
+        )
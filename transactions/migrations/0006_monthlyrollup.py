@@ -0,0 +1,78 @@
+# Generated by Django 5.1.6 on 2026-10-18 03:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transactions", "0005_transaction_budget_composite_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.PositiveSmallIntegerField()),
+                ("month", models.PositiveSmallIntegerField()),
+                (
+                    "transaction_type",
+                    models.CharField(
+                        choices=[("Income", "Income"), ("Expense", "Expense")],
+                        max_length=7,
+                    ),
+                ),
+                ("category", models.CharField(max_length=100)),
+                (
+                    "total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "user",
+                            "year",
+                            "month",
+                            "transaction_type",
+                            "category",
+                        ),
+                        name="rollup_unique_bucket",
+                    )
+                ],
+            },
+        ),
+        # Backfill from existing transactions; later writes keep it current
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO transactions_monthlyrollup
+                    (user_id, year, month, transaction_type, category, total, count)
+                SELECT user_id, EXTRACT(YEAR FROM date), EXTRACT(MONTH FROM date),
+                       transaction_type, category, SUM(amount), COUNT(*)
+                FROM transactions_transaction
+                GROUP BY 1, 2, 3, 4, 5
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
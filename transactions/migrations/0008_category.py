@@ -0,0 +1,203 @@
+# Generated by Django 5.1.6 on 2026-10-18 05:10
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+# One category per user and case-insensitive name; the most used spelling wins
+BACKFILL_CATEGORIES = """
+    INSERT INTO transactions_category (user_id, name)
+    SELECT DISTINCT ON (user_id, lower(name)) user_id, name
+    FROM (
+        SELECT user_id, btrim(category_name) AS name, COUNT(*) AS uses
+        FROM transactions_transaction
+        GROUP BY 1, 2
+        UNION ALL
+        SELECT user_id, btrim(category_name), COUNT(*)
+        FROM transactions_budget
+        GROUP BY 1, 2
+    ) AS names
+    ORDER BY user_id, lower(name), uses DESC, name;
+
+    UPDATE transactions_transaction t SET category_id = c.id
+    FROM transactions_category c
+    WHERE c.user_id = t.user_id AND lower(c.name) = lower(btrim(t.category_name));
+
+    UPDATE transactions_budget b SET category_id = c.id
+    FROM transactions_category c
+    WHERE c.user_id = b.user_id AND lower(c.name) = lower(btrim(b.category_name));
+
+    -- Check the new foreign keys now, so later steps can ALTER these tables
+    SET CONSTRAINTS ALL IMMEDIATE;
+"""
+
+RESTORE_CATEGORY_NAMES = """
+    UPDATE transactions_transaction t SET category_name = c.name
+    FROM transactions_category c WHERE c.id = t.category_id;
+
+    UPDATE transactions_budget b SET category_name = c.name
+    FROM transactions_category c WHERE c.id = b.category_id;
+"""
+
+BACKFILL_ROLLUPS = """
+    INSERT INTO transactions_monthlyrollup
+        (user_id, year, month, transaction_type, category_id, total, count)
+    SELECT user_id, EXTRACT(YEAR FROM date), EXTRACT(MONTH FROM date),
+           transaction_type, category_id, SUM(amount), COUNT(*)
+    FROM transactions_transaction
+    GROUP BY 1, 2, 3, 4, 5;
+
+    SET CONSTRAINTS ALL IMMEDIATE;
+"""
+
+RESTORE_ROLLUPS = """
+    INSERT INTO transactions_monthlyrollup
+        (user_id, year, month, transaction_type, category, total, count)
+    SELECT user_id, EXTRACT(YEAR FROM date), EXTRACT(MONTH FROM date),
+           transaction_type, category_name, SUM(amount), COUNT(*)
+    FROM transactions_transaction
+    GROUP BY 1, 2, 3, 4, 5;
+
+    SET CONSTRAINTS ALL IMMEDIATE;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transactions", "0007_dataversion_reportjob"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Category",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "categories",
+                "constraints": [
+                    models.UniqueConstraint(
+                        django.db.models.functions.text.Lower("name"),
+                        models.F("user"),
+                        name="category_unique_name_per_user",
+                    )
+                ],
+            },
+        ),
+        # Keep the free-text values around until every row points at a category
+        migrations.RenameField(
+            model_name="transaction", old_name="category", new_name="category_name"
+        ),
+        migrations.RenameField(
+            model_name="budget", old_name="category", new_name="category_name"
+        ),
+        migrations.AddField(
+            model_name="transaction",
+            name="category",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="transactions",
+                to="transactions.category",
+            ),
+        ),
+        migrations.AddField(
+            model_name="budget",
+            name="category",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="budgets",
+                to="transactions.category",
+            ),
+        ),
+        migrations.RunSQL(sql=BACKFILL_CATEGORIES, reverse_sql=migrations.RunSQL.noop),
+        # Rollup buckets are rebuilt, since names differing only in case now merge
+        migrations.RemoveConstraint(
+            model_name="monthlyrollup", name="rollup_unique_bucket"
+        ),
+        migrations.RunSQL(
+            sql="DELETE FROM transactions_monthlyrollup", reverse_sql=RESTORE_ROLLUPS
+        ),
+        migrations.RemoveField(model_name="monthlyrollup", name="category"),
+        migrations.AddField(
+            model_name="monthlyrollup",
+            name="category",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="transactions.category",
+            ),
+        ),
+        migrations.RunSQL(
+            sql=BACKFILL_ROLLUPS,
+            reverse_sql="DELETE FROM transactions_monthlyrollup",
+        ),
+        # Nullable first, so unapplying can re-add the columns and refill them
+        migrations.AlterField(
+            model_name="transaction",
+            name="category_name",
+            field=models.CharField(max_length=100, null=True),
+        ),
+        migrations.AlterField(
+            model_name="budget",
+            name="category_name",
+            field=models.CharField(max_length=100, null=True),
+        ),
+        migrations.RunSQL(
+            sql=migrations.RunSQL.noop, reverse_sql=RESTORE_CATEGORY_NAMES
+        ),
+        migrations.RemoveField(model_name="transaction", name="category_name"),
+        migrations.RemoveField(model_name="budget", name="category_name"),
+        migrations.AlterField(
+            model_name="transaction",
+            name="category",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="transactions",
+                to="transactions.category",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="budget",
+            name="category",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="budgets",
+                to="transactions.category",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="monthlyrollup",
+            name="category",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                to="transactions.category",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="monthlyrollup",
+            constraint=models.UniqueConstraint(
+                fields=("user", "year", "month", "transaction_type", "category"),
+                name="rollup_unique_bucket",
+            ),
+        ),
+    ]
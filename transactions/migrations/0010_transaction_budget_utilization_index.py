@@ -0,0 +1,22 @@
+# Generated by Django 5.1.6 on 2026-10-18 04:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transactions", "0009_transaction_search"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["user", "category", "date"],
+                include=("amount", "transaction_type"),
+                name="txn_user_cat_date_idx",
+            ),
+        ),
+    ]
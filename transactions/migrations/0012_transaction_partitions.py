@@ -0,0 +1,125 @@
+# Generated by Django 5.1.6 on 2026-10-18 04:58
+
+import datetime
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from transactions import partitions
+
+TABLE = partitions.TABLE
+
+
+def table_definitions(cursor):
+    """Return the SQL recreating the table's indexes and constraints, except the key."""
+    cursor.execute(
+        "SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i "
+        "WHERE i.indrelid = to_regclass(%s) AND NOT EXISTS ("
+        "SELECT 1 FROM pg_constraint c "
+        "WHERE c.conrelid = i.indrelid AND c.conindid = i.indexrelid)",
+        [TABLE],
+    )
+    # Indexes of a partitioned table are defined ON ONLY the parent
+    indexes = [row[0].replace(" ON ONLY ", " ON ") for row in cursor.fetchall()]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(%s) AND contype IN ('c', 'f', 'u', 'x')",
+        [TABLE],
+    )
+    constraints = [
+        f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{name}" {definition}'
+        for name, definition in cursor.fetchall()
+    ]
+    return constraints + indexes
+
+
+def rebuild_table(cursor, partitioned):
+    """Copy the table into a new one, partitioned by date or not.
+
+    Indexes and constraints are recreated after the rows are copied, which
+    is faster than maintaining them row by row, and ids carry on from the
+    old table's sequence.
+    """
+    interval = partitions.get_interval()
+    definitions = table_definitions(cursor)
+    old = f"{TABLE}_old"
+    cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{old}"')
+    cursor.execute(
+        f'CREATE TABLE "{TABLE}" (LIKE "{old}" INCLUDING DEFAULTS INCLUDING GENERATED)'
+        + (" PARTITION BY RANGE (date)" if partitioned else "")
+    )
+    if partitioned:
+        cursor.execute(
+            f'CREATE TABLE "{partitions.DEFAULT_PARTITION}" PARTITION OF "{TABLE}" DEFAULT'
+        )
+        # Only the intervals holding rows, so a stray date decades off does
+        # not create every partition in between; it stays in the default
+        cursor.execute(
+            f"SELECT DISTINCT date_trunc('{interval}', date)::date FROM \"{old}\""
+        )
+        for (start,) in cursor.fetchall():
+            partitions.create_partitions(cursor, start, start, interval)
+        today = datetime.date.today()
+        partitions.create_partitions(
+            cursor, today, partitions.ahead(today, interval), interval
+        )
+
+    columns = partitions.insert_columns(cursor)
+    cursor.execute(f'INSERT INTO "{TABLE}" ({columns}) SELECT {columns} FROM "{old}"')
+    cursor.execute("SELECT nextval(pg_get_serial_sequence(%s, 'id'))", [old])
+    next_id = cursor.fetchone()[0]
+    cursor.execute(f'DROP TABLE "{old}"')
+
+    cursor.execute(
+        f'ALTER TABLE "{TABLE}" ALTER id ADD GENERATED BY DEFAULT AS IDENTITY '
+        f"(START WITH {next_id})"
+    )
+    # The key of a partitioned table must include the partition column
+    cursor.execute(
+        f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_pkey" PRIMARY KEY '
+        + ("(id, date)" if partitioned else "(id)")
+    )
+    for sql in definitions:
+        cursor.execute(sql)
+
+
+def partition_transactions(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        if not partitions.is_partitioned(cursor):
+            rebuild_table(cursor, partitioned=True)
+
+
+def unpartition_transactions(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        if partitions.is_partitioned(cursor):
+            rebuild_table(cursor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transactions", "0011_transaction_recurrence_parent"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="transaction",
+            name="recurrence_parent",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                db_index=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="occurrences",
+                to="transactions.transaction",
+            ),
+        ),
+        migrations.RunPython(partition_transactions, unpartition_transactions),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.6 on 2026-10-18 05:43
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+def set_materialized_through(apps, schema_editor):
+    """Start each template from its latest occurrence, where it resumed before."""
+    Transaction = apps.get_model("transactions", "Transaction")
+    latest = (
+        Transaction.objects.filter(recurrence_parent=OuterRef("pk"))
+        .values("recurrence_parent")
+        .annotate(latest=Max("date"))
+        .values("latest")
+    )
+    Transaction.objects.filter(recurring=True, recurrence_parent__isnull=True).update(
+        materialized_through=Subquery(latest)
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("transactions", "0012_transaction_partitions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="transaction",
+            name="materialized_through",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(set_materialized_through, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,89 @@
+import datetime
+from decimal import Decimal
+
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import (
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce, Lower, NullIf, Round
 from django.utils import timezone
 
+SEARCH_CONFIG = "english"
+
+
+class OwnedQuerySet(models.QuerySet):
+    """Queryset of a model with a ``user`` owner."""
+
+    def for_user(self, user):
+        """Restrict to the rows ``user`` may access: their own, or all for a superuser.
+
+        Ownership becomes part of the WHERE clause, so checking it costs no
+        query of its own.
+        """
+        if user.is_superuser:
+            return self.all()
+        return self.filter(user_id=user.pk)
+
+
+class CategoryQuerySet(OwnedQuerySet):
+    def named(self, name):
+        """Case-insensitive exact match on ``name``, served by the unique index."""
+        return self.alias(lower_name=Lower("name")).filter(
+            lower_name=Lower(Value(name.strip()))
+        )
+
+
+class CategoryManager(models.Manager.from_queryset(CategoryQuerySet)):
+    def resolve(self, user, name):
+        """Return the user's category called ``name``, creating it if needed."""
+        name = name.strip()
+        category = self.filter(user=user).named(name).first()
+        if category is None:
+            try:
+                with transaction.atomic():
+                    category = self.create(user=user, name=name)
+            except IntegrityError:
+                # Created concurrently under a different case
+                category = self.filter(user=user).named(name).get()
+        return category
+
+
+class Category(models.Model):
+    """A user's spending or income category, shared by transactions and budgets."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    name = models.CharField(max_length=100)
+
+    objects = CategoryManager()
+
+    class Meta:
+        verbose_name_plural = "categories"
+        constraints = [
+            # Also the lookup index for CategoryQuerySet.named()
+            models.UniqueConstraint(
+                Lower("name"), "user", name="category_unique_name_per_user"
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class TransactionManager(models.Manager.from_queryset(OwnedQuerySet)):
+    def get_queryset(self):
+        # The search vector is only ever read inside the database
+        return super().get_queryset().defer("search_vector")
+
 
 class Transaction(models.Model):
     TRANSACTION_TYPES = [
@@ -16,38 +97,176 @@ class Transaction(models.Model):
         ("bank_transfer", "Bank Transfer"),
     ]
 
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Covered by the composite indexes below, which all lead with user
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     title = models.CharField(max_length=255)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     transaction_type = models.CharField(max_length=7, choices=TRANSACTION_TYPES)
-    category = models.CharField(max_length=100)
+    category = models.ForeignKey(
+        Category, on_delete=models.RESTRICT, related_name="transactions"
+    )
     date = models.DateField(default=timezone.now)
     notes = models.TextField(blank=True, null=True)
     recurring = models.BooleanField(default=False)
     payment_method = models.CharField(
         max_length=50, choices=PAYMENT_METHODS, default="cash"
     )
+    # The recurring template a generated occurrence was copied from
+    recurrence_parent = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="occurrences",
+        db_index=False,  # Covered by txn_unique_occurrence
+        # The table is partitioned by date (see partitions.py), so id alone
+        # is not a unique key a foreign key constraint could reference
+        db_constraint=False,
+    )
+    # On a recurring template, the date up to which its occurrences have been
+    # generated, so occurrences edited or deleted since are not regenerated
+    materialized_through = models.DateField(null=True, blank=True, editable=False)
+    # Computed by PostgreSQL on every write, including bulk inserts and updates
+    search_vector = models.GeneratedField(
+        expression=SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("notes", weight="B", config=SEARCH_CONFIG),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = TransactionManager()
+
+    # Columns that decide which MonthlyRollup bucket a row belongs to
+    ROLLUP_FIELDS = {"user_id", "date", "transaction_type", "category_id", "amount"}
+
+    class Meta:
+        constraints = [
+            # One occurrence per template and date keeps materializing idempotent
+            models.UniqueConstraint(
+                fields=["recurrence_parent", "date"], name="txn_unique_occurrence"
+            ),
+        ]
+        indexes = [
+            # Recurring templates, walked in id order by the materializer
+            models.Index(
+                fields=["id"],
+                name="txn_recurring_idx",
+                condition=models.Q(recurring=True, recurrence_parent__isnull=True),
+            ),
+            # Transaction list sorted by date, recent transactions, reports
+            models.Index(fields=["user", "date", "id"], name="txn_user_date_idx"),
+            # Dashboard totals and monthly trends per transaction type
+            models.Index(
+                fields=["user", "transaction_type", "date"],
+                name="txn_user_type_date_idx",
+            ),
+            # Transaction list sorted by amount
+            models.Index(fields=["user", "amount", "id"], name="txn_user_amount_idx"),
+            # Budget utilization: spending per category over a date range
+            models.Index(
+                fields=["user", "category", "date"],
+                include=["amount", "transaction_type"],
+                name="txn_user_cat_date_idx",
+            ),
+            # Full-text search over title and notes
+            GinIndex(fields=["search_vector"], name="txn_search_idx"),
+        ]
 
     def clean(self):
         if self.amount is None or self.amount <= 0:  # Fixed syntax here
             raise ValidationError("Amount must be greater than zero.")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored bucket so edits can move rollup totals without a query
+        if cls.ROLLUP_FIELDS.issubset(field_names):
+            instance._rollup_state = instance.rollup_state()
+        return instance
+
+    def rollup_state(self):
+        """Return the (bucket, amount) this row contributes to MonthlyRollup."""
+        date = self._meta.get_field("date").to_python(self.date)
+        amount = self._meta.get_field("amount").to_python(self.amount)
+        bucket = (
+            self.user_id,
+            date.year,
+            date.month,
+            self.transaction_type,
+            self.category_id,
+        )
+        return bucket, amount
+
     def save(self, *args, **kwargs):
         self.clean()
-        super().save(*args, **kwargs)
+        # Rollups are updated by signal handlers inside the same transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} - {self.amount} ({self.transaction_type})"
 
 
+class BudgetQuerySet(OwnedQuerySet):
+    def with_utilization(self, today=None):
+        """Annotate each budget with its spending in the same query.
+
+        Adds ``spent`` (expenses in the budget's category between its start
+        and end dates, or up to ``today`` while ongoing), ``remaining`` and
+        ``percent_used``. Spending is a correlated aggregate served by
+        ``txn_user_cat_date_idx``.
+        """
+        today = today or datetime.date.today()
+        spending = (
+            Transaction.objects.filter(
+                user=OuterRef("user"),
+                category=OuterRef("category"),
+                transaction_type="Expense",
+                date__gte=OuterRef("start_date"),
+                date__lte=Coalesce(OuterRef("end_date"), Value(today)),
+            )
+            .order_by()
+            .values("category")
+            .annotate(total=Sum("amount"))
+            .values("total")
+        )
+        money = DecimalField(max_digits=14, decimal_places=2)
+        return self.annotate(
+            spent=Coalesce(Subquery(spending), Value(Decimal("0")), output_field=money),
+            remaining=ExpressionWrapper(F("amount") - F("spent"), output_field=money),
+            percent_used=Round(
+                F("spent")
+                * Value(Decimal("100"))
+                / NullIf(F("amount"), Value(Decimal("0"))),
+                1,
+                output_field=DecimalField(max_digits=8, decimal_places=1),
+            ),
+        )
+
+
 class Budget(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
-    category = models.CharField(max_length=100)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
+    category = models.ForeignKey(
+        Category, on_delete=models.RESTRICT, related_name="budgets"
+    )
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     start_date = models.DateField(default=timezone.now)
     end_date = models.DateField(blank=True, null=True)
     notes = models.TextField(blank=True, null=True)
 
+    objects = BudgetQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Budget lists and recent budgets sorted by start date
+            models.Index(fields=["user", "start_date"], name="budget_user_start_idx"),
+        ]
+
     def clean(self):
         if self.amount is None or self.amount <= 0:
             raise ValidationError("Budget amount must be greater than zero.")
@@ -56,7 +275,101 @@ class Budget(models.Model):
 
     def save(self, *args, **kwargs):
         self.clean()
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
 
     def __str__(self):
         return f"{self.category} - ${self.amount} ({self.user.username})"
+
+
+class MonthlyRollup(models.Model):
+    """Per-user totals for one (month, type, category) bucket.
+
+    Kept current by the Transaction save/delete signal handlers; rebuild with
+    ``manage.py rebuild_rollups``.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    transaction_type = models.CharField(
+        max_length=7, choices=Transaction.TRANSACTION_TYPES
+    )
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "year", "month", "transaction_type", "category"],
+                name="rollup_unique_bucket",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.year}-{self.month:02d} {self.transaction_type} "
+            f"{self.category}: {self.total} ({self.count})"
+        )
+
+
+class DataVersion(models.Model):
+    """Per-user counter bumped on every Transaction or Budget write.
+
+    Derived artifacts (cached reports, dashboards) are keyed by it, so they
+    are never served after the underlying data has changed.
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.user_id} v{self.version}"
+
+
+class ReportJob(models.Model):
+    """A PDF report rendered by the report worker and cached on disk."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUSES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
+    data_version = models.BigIntegerField()
+    status = models.CharField(max_length=7, choices=STATUSES, default=PENDING)
+    file_path = models.CharField(max_length=500, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "data_version"], name="reportjob_unique_version"
+            ),
+        ]
+        indexes = [
+            # Worker queue: oldest pending job first
+            models.Index(
+                fields=["created_at"],
+                name="reportjob_pending_idx",
+                condition=models.Q(status="pending"),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Report for {self.user_id} v{self.data_version} ({self.status})"
@@ -0,0 +1,153 @@
+"""Keyset (seek) pagination for transaction querysets.
+
+Each page is fetched with a WHERE clause on the last row seen instead of an
+OFFSET, so the cost of a page does not grow with how deep the user has
+scrolled. Rows are ordered by a sort column plus ``id`` as a tiebreaker,
+which keeps cursors stable when many rows share a date or amount.
+"""
+
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+# sort_by option -> (sort column, descending)
+SORT_KEYS = {
+    "date_desc": ("date", True),
+    "date_asc": ("date", False),
+    "amount_desc": ("amount", True),
+    "amount_asc": ("amount", False),
+}
+DEFAULT_SORT = "date_desc"
+
+
+def ordering_for(sort_by):
+    """Return the ORDER BY for a sort_by option, with id as the tiebreaker."""
+    field, descending = SORT_KEYS.get(sort_by, SORT_KEYS[DEFAULT_SORT])
+    prefix = "-" if descending else ""
+    return (f"{prefix}{field}", f"{prefix}id")
+
+
+class Page:
+    """A page of rows with the cursors needed to move to its neighbours."""
+
+    def __init__(self, object_list, next_cursor=None, prev_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.prev_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """Paginate a queryset by (sort column, id) without OFFSET.
+
+    Args:
+        queryset: The filtered queryset to paginate. Any existing ordering is replaced.
+        sort_by: One of the keys of ``sort_keys``; unknown values use ``default_sort``.
+        page_size: Number of rows per page.
+        sort_keys: Mapping of sort_by options to (sort column, descending).
+        default_sort: The option used when ``sort_by`` is missing or unknown.
+    """
+
+    def __init__(
+        self,
+        queryset,
+        sort_by=None,
+        page_size=50,
+        sort_keys=SORT_KEYS,
+        default_sort=DEFAULT_SORT,
+    ):
+        self.queryset = queryset
+        self.field, self.descending = sort_keys.get(sort_by, sort_keys[default_sort])
+        self.page_size = page_size
+
+    def _ordering(self, reverse=False):
+        descending = self.descending != reverse
+        prefix = "-" if descending else ""
+        return (f"{prefix}{self.field}", f"{prefix}id")
+
+    def _seek(self, value, pk, reverse=False):
+        """Filter for rows strictly after (value, pk) in the (possibly reversed) ordering."""
+        bound, strict = ("lte", "lt") if self.descending != reverse else ("gte", "gt")
+        # The redundant range bound lets the planner use a plain index range scan
+        # and, when sorting by date, skip the date partitions past the cursor.
+        return self.queryset.filter(**{f"{self.field}__{bound}": value}).filter(
+            Q(**{f"{self.field}__{strict}": value})
+            | Q(**{self.field: value, f"id__{strict}": pk})
+        )
+
+    def encode_cursor(self, obj, direction):
+        payload = {"v": str(getattr(obj, self.field)), "id": obj.pk, "d": direction}
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        """Decode a cursor into (value, id, direction).
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            field = self.queryset.model._meta.get_field(self.field)
+            value = field.to_python(payload["v"])
+            pk = int(payload["id"])
+            direction = payload["d"]
+        except (binascii.Error, ValueError, KeyError, TypeError, ValidationError) as e:
+            raise ValueError(f"Invalid cursor: {cursor!r}") from e
+        if direction not in ("next", "prev"):
+            raise ValueError(f"Invalid cursor direction: {direction!r}")
+        return value, pk, direction
+
+    def page(self, cursor=None):
+        """Return the page that starts after (or ends before) ``cursor``.
+
+        Malformed cursors fall back to the first page.
+        """
+        direction = "next"
+        queryset = self.queryset
+        if cursor:
+            try:
+                value, pk, direction = self.decode_cursor(cursor)
+            except ValueError:
+                cursor = None
+            else:
+                queryset = self._seek(value, pk, reverse=direction == "prev")
+
+        rows = list(
+            queryset.order_by(*self._ordering(reverse=direction == "prev"))[
+                : self.page_size + 1
+            ]
+        )
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        if direction == "prev":
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        if not rows:
+            return Page([])
+        return Page(
+            rows,
+            next_cursor=self.encode_cursor(rows[-1], "next") if has_next else None,
+            prev_cursor=self.encode_cursor(rows[0], "prev") if has_previous else None,
+        )
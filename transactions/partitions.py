@@ -0,0 +1,194 @@
+"""Date-range partitions of the transaction table.
+
+Migration 0012 turns ``transactions_transaction`` into a PostgreSQL table
+partitioned by range on ``date``, with one partition per year or per month
+(``TRANSACTION_PARTITION_INTERVAL``) and a default partition that catches
+dates no partition covers yet, so inserts never fail. Queries bounded by
+date only scan the partitions they can match.
+
+Partitions for the next ``TRANSACTION_PARTITIONS_AHEAD`` intervals are
+created after every ``migrate`` and by ``python manage.py create_partitions``,
+which is meant to run daily. Creating a partition whose dates already have
+rows in the default partition moves those rows into it.
+"""
+
+import datetime
+import logging
+import re
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+TABLE = "transactions_transaction"
+DEFAULT_PARTITION = f"{TABLE}_default"
+INTERVALS = ("year", "month")
+
+# pg_get_expr() of a range partition bound on a date column
+BOUND_PATTERN = re.compile(
+    r"FROM \('(\d{4}-\d{2}-\d{2})'\) TO \('(\d{4}-\d{2}-\d{2})'\)"
+)
+
+
+def get_interval(interval=None):
+    interval = interval or settings.TRANSACTION_PARTITION_INTERVAL
+    if interval not in INTERVALS:
+        raise ValueError(
+            f"Unknown partition interval {interval!r}; use one of {INTERVALS}."
+        )
+    return interval
+
+
+def partition_range(day, interval):
+    """Return the [start, end) dates of the ``interval`` containing ``day``."""
+    if interval == "year":
+        start = datetime.date(day.year, 1, 1)
+        return start, start.replace(year=day.year + 1)
+    start = day.replace(day=1)
+    return start, (start + datetime.timedelta(days=32)).replace(day=1)
+
+
+def partition_name(start, interval):
+    """Name a partition: ``..._y2025`` for a year, ``..._m2025_01`` for a month."""
+    if interval == "year":
+        return f"{TABLE}_y{start:%Y}"
+    return f"{TABLE}_m{start:%Y_%m}"
+
+
+def is_partitioned(cursor):
+    cursor.execute(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+        "WHERE partrelid = to_regclass(%s))",
+        [TABLE],
+    )
+    return cursor.fetchone()[0]
+
+
+def existing_partitions(cursor):
+    """Return (name, start, end) for every range partition, by start date."""
+    cursor.execute(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+        "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(%s)",
+        [TABLE],
+    )
+    partitions = []
+    for name, bound in cursor.fetchall():
+        match = BOUND_PATTERN.search(bound)
+        if match:  # Not the default partition
+            start, end = map(datetime.date.fromisoformat, match.groups())
+            partitions.append((name, start, end))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def insert_columns(cursor, table=TABLE):
+    """Return the columns of ``table`` that can be written (not generated)."""
+    cursor.execute(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = %s "
+        "AND is_generated = 'NEVER' ORDER BY ordinal_position",
+        [table],
+    )
+    return ", ".join(connection.ops.quote_name(row[0]) for row in cursor.fetchall())
+
+
+def create_partition(cursor, start, end, interval):
+    """Create the partition for [start, end), moving its rows out of the default.
+
+    Attaching a partition fails while the default partition holds rows in
+    its range, so the default is detached, emptied of them and reattached
+    within the same transaction.
+
+    Returns:
+        str: The new partition's name.
+    """
+    name = partition_name(start, interval)
+    table, partition, default = map(
+        connection.ops.quote_name, (TABLE, name, DEFAULT_PARTITION)
+    )
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    cursor.execute(
+        f"SELECT EXISTS (SELECT 1 FROM {default} WHERE date >= %s AND date < %s)",
+        [start, end],
+    )
+    if not cursor.fetchone()[0]:
+        cursor.execute(f"CREATE TABLE {partition} PARTITION OF {table} {bounds}")
+        return name
+
+    columns = insert_columns(cursor)
+    cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {default}")
+    cursor.execute(f"CREATE TABLE {partition} PARTITION OF {table} {bounds}")
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {default} WHERE date >= %s AND date < %s "
+        f"RETURNING {columns}) INSERT INTO {table} ({columns}) "
+        f"SELECT {columns} FROM moved",
+        [start, end],
+    )
+    logger.info("Moved %s rows from %s to %s", cursor.rowcount, DEFAULT_PARTITION, name)
+    cursor.execute(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT")
+    return name
+
+
+def create_partitions(cursor, start, end, interval):
+    """Create the missing partitions covering ``start`` to ``end`` inclusive.
+
+    Intervals overlapping an existing partition (for instance a year after
+    switching to monthly partitions) are left alone.
+
+    Returns:
+        list: Names of the partitions created.
+    """
+    existing = existing_partitions(cursor)
+    created = []
+    day = start
+    while day <= end:
+        low, high = partition_range(day, interval)
+        if not any(low < until and since < high for _, since, until in existing):
+            created.append(create_partition(cursor, low, high, interval))
+        day = high
+    return created
+
+
+def ensure_partitions(start, end, interval=None, using=DEFAULT_DB_ALIAS):
+    """Create the partitions covering ``start`` to ``end``, if the table is partitioned.
+
+    Args:
+        start: First date to cover.
+        end: Last date to cover, inclusive.
+        interval: "year" or "month"; ``TRANSACTION_PARTITION_INTERVAL`` by default.
+        using: Alias of the database to create them in.
+
+    Returns:
+        list: Names of the partitions created.
+    """
+    interval = get_interval(interval)
+    database = connections[using]
+    with transaction.atomic(using=using), database.cursor() as cursor:
+        if database.vendor != "postgresql" or not is_partitioned(cursor):
+            return []
+        created = create_partitions(cursor, start, end, interval)
+    for name in created:
+        logger.info("Created partition %s", name)
+    return created
+
+
+def ahead(today, interval, intervals=None):
+    """Return the last day of the ``intervals``-th interval after ``today``'s."""
+    if intervals is None:
+        intervals = settings.TRANSACTION_PARTITIONS_AHEAD
+    _, end = partition_range(today, interval)
+    for _ in range(intervals):
+        _, end = partition_range(end, interval)
+    return end - datetime.timedelta(days=1)
+
+
+def ensure_future_partitions(today=None, interval=None, using=DEFAULT_DB_ALIAS):
+    """Create the partitions from ``today`` to ``TRANSACTION_PARTITIONS_AHEAD`` intervals on.
+
+    Returns:
+        list: Names of the partitions created.
+    """
+    today = today or datetime.date.today()
+    interval = get_interval(interval)
+    return ensure_partitions(today, ahead(today, interval), interval, using)
@@ -0,0 +1,188 @@
+"""Motivational quote providers for the transaction list.
+
+Quotes are served from the shared cache and refreshed in a background
+thread, so rendering the transaction list never waits on the upstream
+APIs. Repeated upstream failures open a circuit breaker; while it is open
+(and before the first successful fetch) quotes come from a local pool.
+"""
+
+import logging
+import random
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+QUOTE_CACHE_KEY = "quotes:current"
+REFRESH_LOCK_KEY = "quotes:refresh-lock"
+FAILURE_COUNT_KEY = "quotes:failures"
+CIRCUIT_OPEN_KEY = "quotes:circuit-open"
+
+DEFAULT_PROVIDERS = [
+    "transactions.quotes.QuotableProvider",
+    "transactions.quotes.KanyeProvider",
+]
+
+
+class QuoteUnavailable(Exception):
+    """Raised by a provider when it cannot return a quote."""
+
+
+class QuotableProvider:
+    """Fetch a motivational quote from quotable.io."""
+
+    url = "https://api.quotable.io/random?tags=motivational"
+    timeout = 5
+
+    def fetch(self):
+        try:
+            # SSL verification is bypassed for local testing
+            response = requests.get(self.url, timeout=self.timeout, verify=False)
+            response.raise_for_status()
+            quote_data = response.json()
+            return f'"{quote_data["content"]}" — {quote_data["author"]}'
+        except (requests.RequestException, ValueError, KeyError) as e:
+            raise QuoteUnavailable(f"Quotable API failed: {e}") from e
+
+
+class KanyeProvider:
+    """Fetch a quote from kanye.rest."""
+
+    url = "https://api.kanye.rest/"
+    timeout = 5
+
+    def fetch(self):
+        try:
+            response = requests.get(self.url, timeout=self.timeout)
+            response.raise_for_status()
+            quote_data = response.json()
+            return f'"{quote_data["quote"]}" — Kanye West'
+        except (requests.RequestException, ValueError, KeyError) as e:
+            raise QuoteUnavailable(f"Kanye API failed: {e}") from e
+
+
+class StubProvider:
+    """Return a fixed quote without any network access. Used in tests."""
+
+    quote = '"Beware of little expenses; a small leak will sink a great ship." — Benjamin Franklin'
+
+    def fetch(self):
+        return self.quote
+
+
+class LocalQuotePool:
+    """Local quotes shown until the cache is warm or while upstreams are down."""
+
+    quotes = [
+        '"Beware of little expenses; a small leak will sink a great ship." — Benjamin Franklin',
+        '"Do not save what is left after spending, but spend what is left after saving." — Warren Buffett',
+        '"A budget is telling your money where to go instead of wondering where it went." — Dave Ramsey',
+        '"The secret of getting ahead is getting started." — Mark Twain',
+        '"It\'s not your salary that makes you rich, it\'s your spending habits." — Charles A. Jaffe',
+    ]
+
+    def choice(self):
+        return random.choice(self.quotes)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def get_providers():
+    """Instantiate the providers listed in ``QUOTE_PROVIDERS``, in order."""
+    return [import_string(path)() for path in _setting("QUOTE_PROVIDERS", DEFAULT_PROVIDERS)]
+
+
+def get_fallback_pool():
+    """Instantiate the local pool configured by ``QUOTE_FALLBACK_POOL``."""
+    return import_string(
+        _setting("QUOTE_FALLBACK_POOL", "transactions.quotes.LocalQuotePool")
+    )()
+
+
+def circuit_is_open():
+    return cache.get(CIRCUIT_OPEN_KEY) is not None
+
+
+def refresh_quote():
+    """Fetch a new quote from the first working provider and cache it.
+
+    Returns:
+        str or None: The fetched quote, or None if every provider failed.
+    """
+    for provider in get_providers():
+        try:
+            quote = provider.fetch()
+        except QuoteUnavailable as e:
+            logger.warning("Quote provider %s failed: %s", type(provider).__name__, e)
+            continue
+        cache.set(
+            QUOTE_CACHE_KEY,
+            {"quote": quote, "fetched_at": time.time()},
+            _setting("QUOTE_CACHE_TTL", 60 * 60 * 6),
+        )
+        cache.delete(FAILURE_COUNT_KEY)
+        return quote
+
+    cache.add(FAILURE_COUNT_KEY, 0, None)
+    try:
+        failures = cache.incr(FAILURE_COUNT_KEY)
+    except ValueError:
+        # Deleted by a concurrent successful refresh since the add
+        failures = 1
+        cache.set(FAILURE_COUNT_KEY, failures, None)
+    if failures >= _setting("QUOTE_FAILURE_THRESHOLD", 3):
+        logger.error("Quote providers failed %d times, opening circuit", failures)
+        cache.set(CIRCUIT_OPEN_KEY, True, _setting("QUOTE_CIRCUIT_COOLDOWN", 60 * 5))
+        cache.delete(FAILURE_COUNT_KEY)
+    return None
+
+
+def _refresh_in_thread():
+    try:
+        refresh_quote()
+    except Exception as e:
+        logger.error("Background quote refresh failed: %s", e)
+    finally:
+        cache.delete(REFRESH_LOCK_KEY)
+        connections.close_all()
+
+
+def schedule_refresh():
+    """Start a background refresh unless one is running or the circuit is open.
+
+    The lock lives in the shared cache, so only one worker refreshes at a time.
+
+    Returns:
+        bool: True if a refresh thread was started.
+    """
+    if not _setting("QUOTE_REFRESH_IN_BACKGROUND", True) or circuit_is_open():
+        return False
+    if not cache.add(REFRESH_LOCK_KEY, True, _setting("QUOTE_REFRESH_LOCK_TIMEOUT", 30)):
+        return False
+    threading.Thread(target=_refresh_in_thread, name="quote-refresh", daemon=True).start()
+    return True
+
+
+def get_quote():
+    """Return a quote for display without doing any network I/O.
+
+    Serves the cached quote, scheduling a background refresh once it is older
+    than ``QUOTE_REFRESH_INTERVAL``. Falls back to the local pool when the
+    cache is cold.
+    """
+    entry = cache.get(QUOTE_CACHE_KEY)
+    if entry is None or time.time() - entry["fetched_at"] > _setting(
+        "QUOTE_REFRESH_INTERVAL", 60 * 10
+    ):
+        schedule_refresh()
+    if entry is not None:
+        return entry["quote"]
+    return get_fallback_pool().choice()
@@ -0,0 +1,114 @@
+"""Asynchronous PDF report jobs with cached artifacts.
+
+``download_report`` enqueues a ReportJob for the user's current data
+version and the ``run_report_worker`` command renders it under
+``REPORTS_ROOT``. Once rendered, the file is served straight from disk until
+a Transaction or Budget write bumps the user's data version.
+"""
+
+import datetime
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import versioning
+from .models import ReportJob
+from .reports import build_financial_report
+
+logger = logging.getLogger(__name__)
+
+
+def artifact_path(user_id, data_version):
+    return Path(settings.REPORTS_ROOT) / str(user_id) / f"report-v{data_version}.pdf"
+
+
+def current_job(user):
+    """Return the report job for the user's current data version.
+
+    Creates the job if needed and re-queues it if it failed or its file has
+    gone missing. With ``REPORT_JOBS_INLINE`` the job is rendered right away.
+    """
+    version, _ = versioning.get_version(user)
+    job, _ = ReportJob.objects.get_or_create(user=user, data_version=version)
+    if job.status == ReportJob.FAILED or (
+        job.status == ReportJob.DONE and not Path(job.file_path).exists()
+    ):
+        job.status = ReportJob.PENDING
+        job.error = ""
+        job.save(update_fields=["status", "error"])
+    if job.status == ReportJob.PENDING and getattr(settings, "REPORT_JOBS_INLINE", False):
+        render_job(job)
+    return job
+
+
+def claim_next_job():
+    """Mark the oldest pending job as running and return it, or None if idle.
+
+    ``SKIP LOCKED`` lets several workers poll the same queue.
+    """
+    with transaction.atomic():
+        job = (
+            ReportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ReportJob.PENDING)
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = ReportJob.RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at"])
+    return job
+
+
+def requeue_stale_jobs(older_than=datetime.timedelta(minutes=10)):
+    """Put jobs left running by a crashed worker back in the queue."""
+    return ReportJob.objects.filter(
+        status=ReportJob.RUNNING, started_at__lt=timezone.now() - older_than
+    ).update(status=ReportJob.PENDING)
+
+
+def render_job(job):
+    """Render ``job`` to its artifact path and record the outcome."""
+    path = artifact_path(job.user_id, job.data_version)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False)
+    outermost = not connection.in_atomic_block
+    try:
+        with tmp, transaction.atomic():
+            if outermost:
+                # One snapshot for the totals and the rows
+                with connection.cursor() as cursor:
+                    cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            build_financial_report(job.user, tmp)
+        os.replace(tmp.name, path)
+    except Exception as e:
+        logger.error("Report job %s failed: %s", job.pk, e)
+        Path(tmp.name).unlink(missing_ok=True)
+        job.status = ReportJob.FAILED
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "error", "finished_at"])
+        return job
+
+    job.status = ReportJob.DONE
+    job.file_path = str(path)
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "file_path", "finished_at"])
+    _remove_superseded(job)
+    return job
+
+
+def _remove_superseded(job):
+    """Delete artifacts and jobs for the user's older data versions."""
+    superseded = ReportJob.objects.filter(
+        user_id=job.user_id, data_version__lt=job.data_version
+    ).exclude(status=ReportJob.RUNNING)
+    for file_path in superseded.exclude(file_path="").values_list("file_path", flat=True):
+        Path(file_path).unlink(missing_ok=True)
+    superseded.delete()
@@ -0,0 +1,163 @@
+"""PDF financial report generation.
+
+Totals come from database aggregates (MonthlyRollup and a budget SUM), and
+table rows are streamed from chunked server-side cursors into page-sized
+LongTable flowables with repeated headers. The flowables themselves are
+produced lazily while ReportLab lays out pages, so the rows held in memory
+stay bounded by one chunk regardless of how many transactions a user has.
+"""
+
+import datetime
+from itertools import islice
+
+from django.db.models import Sum
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import LongTable, Paragraph, SimpleDocTemplate, TableStyle
+
+from . import rollups
+from .models import Budget, Transaction
+
+ITERATOR_CHUNK_SIZE = 2000
+ROWS_PER_TABLE = 40  # Roughly one letter page of 10pt rows
+
+TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 12),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+        ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+        ("TEXTCOLOR", (0, 1), (-1, -1), colors.black),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 1), (-1, -1), 10),
+        ("GRID", (0, 0), (-1, -1), 1, colors.black),
+    ]
+)
+
+TRANSACTION_HEADER = ["Date", "Title", "Amount", "Type", "Category"]
+BUDGET_HEADER = ["Category", "Amount", "Start Date", "End Date"]
+
+
+class FlowableStream(list):
+    """A flowable list that refills itself from an iterator during ``doc.build``.
+
+    ReportLab only reads and deletes from the head of the list it is given,
+    so keeping a small buffer filled is enough to lay out an arbitrarily long
+    document without materialising every flowable up front.
+    """
+
+    def __init__(self, iterable, buffer_size=2):
+        super().__init__()
+        self._source = iter(iterable)
+        self._buffer_size = buffer_size
+        self._fill()
+
+    def _fill(self):
+        while self._source is not None and super().__len__() < self._buffer_size:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._fill()
+        return super().__len__()
+
+    def __getitem__(self, index):
+        self._fill()
+        return super().__getitem__(index)
+
+
+def _tables(rows, header, col_widths):
+    """Yield LongTables of ``ROWS_PER_TABLE`` rows each, repeating the header."""
+    while chunk := list(islice(rows, ROWS_PER_TABLE)):
+        table = LongTable([header, *chunk], colWidths=col_widths, repeatRows=1)
+        table.setStyle(TABLE_STYLE)
+        yield table
+
+
+def _transaction_rows(user):
+    rows = (
+        Transaction.objects.filter(user=user)
+        .order_by("-date", "-id")
+        .values_list(
+            "date", "title", "amount", "transaction_type", "category__name"
+        )
+        .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    )
+    for date, title, amount, transaction_type, category in rows:
+        yield [date.strftime("%Y-%m-%d"), title, f"${amount:.2f}", transaction_type, category]
+
+
+def _budget_rows(user):
+    rows = (
+        Budget.objects.filter(user=user)
+        .order_by("-start_date", "-id")
+        .values_list("category__name", "amount", "start_date", "end_date")
+        .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    )
+    for category, amount, start_date, end_date in rows:
+        yield [
+            category,
+            f"${amount:.2f}",
+            start_date.strftime("%Y-%m-%d"),
+            end_date.strftime("%Y-%m-%d") if end_date else "Ongoing",
+        ]
+
+
+def _report_flowables(user, today):
+    styles = getSampleStyleSheet()
+    yield Paragraph(f"Personal Finance Report - {today}", styles["Title"])
+    yield Paragraph("<br/><br/>", styles["Normal"])
+
+    # Financial Summary Table
+    total_income, total_expenses = rollups.totals_for_user(user)
+    total_budgets = (
+        Budget.objects.filter(user=user).aggregate(Sum("amount"))["amount__sum"] or 0
+    )
+    summary_data = [
+        ["Metric", "Amount"],
+        ["Total Income", f"${total_income:.2f}"],
+        ["Total Expenses", f"${total_expenses:.2f}"],
+        ["Net Balance", f"${total_income - total_expenses:.2f}"],
+        ["Total Budgets", f"${total_budgets:.2f}"],
+    ]
+    yield from _tables(iter(summary_data[1:]), summary_data[0], [200, 100])
+    yield Paragraph("<br/><br/>", styles["Normal"])
+
+    # Transactions Table, streamed in page-sized chunks
+    transaction_tables = _tables(
+        _transaction_rows(user), TRANSACTION_HEADER, [80, 100, 60, 60, 80]
+    )
+    first = next(transaction_tables, None)
+    if first is not None:
+        yield Paragraph("Transactions", styles["Heading2"])
+        yield first
+        yield from transaction_tables
+
+    # Budgets Table
+    budget_tables = _tables(_budget_rows(user), BUDGET_HEADER, [100, 60, 80, 80])
+    first = next(budget_tables, None)
+    if first is not None:
+        yield Paragraph("<br/><br/>", styles["Normal"])
+        yield Paragraph("Budgets", styles["Heading2"])
+        yield first
+        yield from budget_tables
+
+
+def build_financial_report(user, output, today=None):
+    """Render the user's PDF report into ``output``.
+
+    Args:
+        user: The User the report is for.
+        output: A writable file-like object (e.g. an HttpResponse).
+        today: Date printed in the report title (defaults to today).
+    """
+    today = today or datetime.date.today()
+    doc = SimpleDocTemplate(output, pagesize=letter, pageCompression=1)
+    doc.build(FlowableStream(_report_flowables(user, today)))
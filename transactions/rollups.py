@@ -0,0 +1,158 @@
+"""Incrementally maintained per-user monthly rollups.
+
+Each MonthlyRollup row holds the sum and count of a user's transactions for
+one (year, month, type, category) bucket. Saves and deletes apply signed
+deltas with an INSERT ... ON CONFLICT upsert, so readers can aggregate
+O(months) rollup rows instead of the whole transaction history.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from itertools import islice
+
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from .models import MonthlyRollup, Transaction
+
+BUCKET_FIELDS = ("user_id", "year", "month", "transaction_type", "category_id")
+UPSERT_BATCH_SIZE = 1000
+USER_CHUNK_SIZE = 500
+
+INCOME = Q(transaction_type="Income")
+EXPENSE = Q(transaction_type="Expense")
+
+
+def new_deltas():
+    """Return an empty bucket -> [total, count] accumulator."""
+    return defaultdict(lambda: [Decimal("0"), 0])
+
+
+def add_delta(deltas, state, sign=1):
+    """Add (or with ``sign=-1`` subtract) a (bucket, amount) state to ``deltas``."""
+    bucket, amount = state
+    entry = deltas[bucket]
+    entry[0] += sign * amount
+    entry[1] += sign
+
+
+def record_change(before, after):
+    """Move one row's contribution from the ``before`` state to ``after``.
+
+    Either state may be None for inserts and deletes.
+    """
+    deltas = new_deltas()
+    if before is not None:
+        add_delta(deltas, before, -1)
+    if after is not None:
+        add_delta(deltas, after)
+    apply_deltas(deltas)
+
+
+def apply_deltas(deltas):
+    """Upsert a batch of bucket deltas and drop buckets that became empty."""
+    rows = sorted(
+        (*bucket, total, count)
+        for bucket, (total, count) in deltas.items()
+        if total or count
+    )
+    if not rows:
+        return
+    table = connection.ops.quote_name(MonthlyRollup._meta.db_table)
+    columns = ", ".join((*BUCKET_FIELDS, "total", "count"))
+    conflict = ", ".join(BUCKET_FIELDS)
+    iterator = iter(rows)
+    with connection.cursor() as cursor:
+        while batch := list(islice(iterator, UPSERT_BATCH_SIZE)):
+            placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * len(batch))
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) VALUES {placeholders} "
+                f"ON CONFLICT ({conflict}) DO UPDATE SET "
+                f"total = {table}.total + EXCLUDED.total, "
+                f"count = {table}.count + EXCLUDED.count",
+                [value for row in batch for value in row],
+            )
+    if any(row[-1] < 0 for row in rows):
+        MonthlyRollup.objects.filter(
+            user_id__in={row[0] for row in rows}, count__lte=0
+        ).delete()
+
+
+def aggregate_transactions(queryset):
+    """Group a Transaction queryset into rollup buckets, straight from the source rows."""
+    return (
+        queryset.annotate(year=ExtractYear("date"), month=ExtractMonth("date"))
+        .values(*BUCKET_FIELDS)
+        .annotate(total=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+
+
+def _user_chunks(user_ids):
+    if user_ids is None:
+        user_ids = (
+            Transaction.objects.values_list("user_id", flat=True)
+            .union(MonthlyRollup.objects.values_list("user_id", flat=True))
+            .order_by("user_id")
+        )
+    iterator = iter(user_ids)
+    while chunk := list(islice(iterator, USER_CHUNK_SIZE)):
+        yield chunk
+
+
+def rebuild(user_ids=None):
+    """Recompute rollups from transactions, one chunk of users at a time.
+
+    Args:
+        user_ids: Users to rebuild; all users with transactions or rollups if None.
+
+    Returns:
+        int: Number of rollup rows written.
+    """
+    written = 0
+    for chunk in _user_chunks(user_ids):
+        with transaction.atomic():
+            MonthlyRollup.objects.filter(user_id__in=chunk).delete()
+            rows = aggregate_transactions(Transaction.objects.filter(user_id__in=chunk))
+            created = MonthlyRollup.objects.bulk_create(
+                (MonthlyRollup(**row) for row in rows.iterator()),
+                batch_size=UPSERT_BATCH_SIZE,
+            )
+            written += len(created)
+    return written
+
+
+def verify(user_ids=None):
+    """Compare rollups with a fresh aggregation of the transactions.
+
+    Returns:
+        list: (bucket, expected, actual) tuples for every bucket that differs,
+        where expected/actual are (total, count) pairs or None.
+    """
+    mismatches = []
+    for chunk in _user_chunks(user_ids):
+        expected = {
+            tuple(row[f] for f in BUCKET_FIELDS): (row["total"], row["count"])
+            for row in aggregate_transactions(
+                Transaction.objects.filter(user_id__in=chunk)
+            )
+        }
+        actual = {
+            tuple(row[f] for f in BUCKET_FIELDS): (row["total"], row["count"])
+            for row in MonthlyRollup.objects.filter(user_id__in=chunk).values(
+                *BUCKET_FIELDS, "total", "count"
+            )
+        }
+        for bucket in sorted(expected.keys() | actual.keys()):
+            if expected.get(bucket) != actual.get(bucket):
+                mismatches.append((bucket, expected.get(bucket), actual.get(bucket)))
+    return mismatches
+
+
+def totals_for_user(user):
+    """Return the user's all-time income and expense totals from the rollups."""
+    totals = MonthlyRollup.objects.filter(user=user).aggregate(
+        income=Sum("total", filter=INCOME), expenses=Sum("total", filter=EXPENSE)
+    )
+    return totals["income"] or 0, totals["expenses"] or 0
@@ -0,0 +1,85 @@
+"""Ranked full-text search over transactions.
+
+Titles and notes are matched through the GIN index on the ``search_vector``
+generated column, with prefix matching so partial words still hit. Category
+names are matched in the user's own (small) Category table and folded in by
+key. When the optional ``txn_title_trgm_idx`` trigram index exists, fuzzy
+title matches (typos, infixes) are added through it as well.
+"""
+
+import re
+from functools import lru_cache
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db import connection
+from django.db.models import F, Q
+
+from .models import SEARCH_CONFIG, Category, Transaction
+
+TERM = re.compile(r"\w+")
+MAX_TERMS = 8
+TRIGRAM_INDEX = "txn_title_trgm_idx"
+
+
+def prefix_query(text):
+    """Build a query matching every word of ``text`` as a prefix.
+
+    Returns:
+        SearchQuery or None: None when ``text`` has no searchable words.
+    """
+    terms = TERM.findall(text)[:MAX_TERMS]
+    if not terms:
+        return None
+    return SearchQuery(
+        " & ".join(f"{term}:*" for term in terms),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
+
+
+@lru_cache(maxsize=None)
+def trigram_enabled():
+    """Whether the migration was able to create the trigram title index."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = %s", [TRIGRAM_INDEX])
+        return cursor.fetchone() is not None
+
+
+def search_transactions(user, text):
+    """Return the user's transactions matching ``text``, best matches first.
+
+    Args:
+        user: The User whose transactions are searched.
+        text: Free-text search terms.
+
+    Returns:
+        QuerySet: Transactions annotated with ``rank``, ordered by it.
+    """
+    query = prefix_query(text)
+    if query is None:
+        return Transaction.objects.none()
+
+    category_ids = list(
+        Category.objects.filter(user=user)
+        .annotate(document=SearchVector("name", config=SEARCH_CONFIG))
+        .filter(document=query)
+        .values_list("id", flat=True)
+    )
+    matches = Q(search_vector=query) | Q(category_id__in=category_ids)
+    rank = SearchRank(F("search_vector"), query)
+    if trigram_enabled():
+        matches |= Q(title__trigram_word_similar=text)
+        rank = rank + TrigramWordSimilarity(text, "title")
+
+    return (
+        Transaction.objects.filter(user=user)
+        .filter(matches)
+        .select_related("category")
+        .annotate(rank=rank)
+        .order_by("-rank", "-date", "-id")
+    )
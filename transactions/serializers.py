@@ -0,0 +1,113 @@
+"""Serializers for the JSON API."""
+
+from rest_framework import serializers
+
+from .forms import validate_transaction_amount, validate_transaction_title
+from .models import Budget, Category, Transaction
+
+
+class CategoryNameField(serializers.CharField):
+    """A ``category`` foreign key read and written as the category's name."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("max_length", 100)
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return value.name
+
+
+class ApiSerializer(serializers.ModelSerializer):
+    """Base serializer supporting sparse fieldsets and category names.
+
+    Args:
+        fields: Names of the fields to include; all fields when omitted.
+    """
+
+    category = CategoryNameField()
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def _resolve_category(self, validated_data):
+        # Matched case-insensitively like the HTML forms, created on first use
+        if "category" in validated_data:
+            validated_data["category"] = Category.objects.resolve(
+                self.context["request"].user, validated_data["category"]
+            )
+        return validated_data
+
+    def create(self, validated_data):
+        return super().create(self._resolve_category(validated_data))
+
+    def update(self, instance, validated_data):
+        return super().update(instance, self._resolve_category(validated_data))
+
+
+class TransactionSerializer(ApiSerializer):
+    class Meta:
+        model = Transaction
+        fields = [
+            "id",
+            "title",
+            "amount",
+            "transaction_type",
+            "category",
+            "date",
+            "notes",
+            "recurring",
+            "payment_method",
+            "recurrence_parent",
+        ]
+
+    def validate_amount(self, value):
+        return validate_transaction_amount(value)
+
+    def validate_title(self, value):
+        return validate_transaction_title(value)
+
+
+class BudgetSerializer(ApiSerializer):
+    # Filled in by BudgetQuerySet.with_utilization
+    spent = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    remaining = serializers.DecimalField(
+        max_digits=14, decimal_places=2, read_only=True
+    )
+    percent_used = serializers.DecimalField(
+        max_digits=8, decimal_places=1, read_only=True
+    )
+
+    UTILIZATION_FIELDS = ("spent", "remaining", "percent_used")
+
+    class Meta:
+        model = Budget
+        fields = [
+            "id",
+            "category",
+            "amount",
+            "start_date",
+            "end_date",
+            "notes",
+            "spent",
+            "remaining",
+            "percent_used",
+        ]
+
+    def validate_amount(self, value):
+        if value <= 0:
+            raise serializers.ValidationError(
+                "Budget amount must be greater than zero."
+            )
+        return value
+
+    def validate(self, attrs):
+        start_date = attrs.get("start_date", getattr(self.instance, "start_date", None))
+        end_date = attrs.get("end_date", getattr(self.instance, "end_date", None))
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError(
+                {"end_date": "End date must be after start date."}
+            )
+        return attrs
@@ -0,0 +1,71 @@
+from django.contrib.auth.models import User
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from . import partitions, rollups, versioning
+from .models import Budget, Transaction
+
+
+def _is_cascade(origin, model):
+    """True when a delete was triggered by another model (e.g. a deleted User)."""
+    return not (
+        isinstance(origin, model)
+        or (isinstance(origin, QuerySet) and origin.model is model)
+    )
+
+
+@receiver(post_save, sender=Transaction)
+def update_rollup_on_save(sender, instance, raw=False, **kwargs):
+    """Move the row's amount between MonthlyRollup buckets after a save."""
+    if raw:  # Fixtures are loaded as-is; run rebuild_rollups afterwards
+        return
+    before = getattr(instance, "_rollup_state", None)
+    after = instance.rollup_state()
+    if before != after:
+        rollups.record_change(before, after)
+    instance._rollup_state = after
+
+
+@receiver(post_delete, sender=Transaction)
+def update_rollup_on_delete(sender, instance, origin=None, **kwargs):
+    """Remove a deleted row's amount from its MonthlyRollup bucket."""
+    # When a user is deleted their rollups are removed by the same cascade
+    if _is_cascade(origin, Transaction):
+        return
+    state = getattr(instance, "_rollup_state", None) or instance.rollup_state()
+    rollups.record_change(state, None)
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_save, sender=Budget)
+def bump_version_on_save(sender, instance, raw=False, **kwargs):
+    """Invalidate the owner's derived artifacts after a write."""
+    if not raw:
+        versioning.bump([instance.user_id])
+
+
+@receiver(post_delete, sender=Transaction)
+@receiver(post_delete, sender=Budget)
+def bump_version_on_delete(sender, instance, origin=None, **kwargs):
+    if not _is_cascade(origin, sender):
+        versioning.bump([instance.user_id])
+
+
+@receiver(post_save, sender=User)
+def bump_version_on_profile_save(
+    sender, instance, created=False, update_fields=None, raw=False, **kwargs
+):
+    """Invalidate pages showing the user's profile (e.g. the navbar username).
+
+    Logins only touch last_login, which the ETag already includes.
+    """
+    if not (created or raw or update_fields == frozenset({"last_login"})):
+        versioning.bump([instance.pk])
+
+
+@receiver(post_migrate)
+def create_future_partitions(sender, app_config=None, using=None, **kwargs):
+    """Make sure the upcoming transaction partitions exist after every migrate."""
+    if app_config is not None and app_config.label == "transactions":
+        partitions.ensure_future_partitions(using=using)
@@ -0,0 +1,269 @@
+"""Deterministic synthetic users, transactions and budgets for load testing.
+
+Every value comes from one ``random.Random(seed)``, so the same arguments
+always produce the same rows. Transactions are streamed into PostgreSQL with
+``COPY`` one chunk at a time, so tens of millions of rows load without being
+held in memory; rollups and data versions are then rebuilt once per seed
+instead of once per row.
+"""
+
+import datetime
+import io
+import random
+from dataclasses import dataclass
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+from . import rollups, versioning
+from .models import Budget, Category, Transaction
+
+CHUNK_SIZE = 50_000
+BATCH_SIZE = 1000
+
+# name, transaction type, titles, (lowest, highest) amount, relative frequency
+CATEGORIES = (
+    ("Salary", "Income", ("Monthly salary", "Payroll bonus"), (1500, 6000), 2),
+    ("Freelance", "Income", ("Client invoice", "Consulting fee"), (100, 2000), 1),
+    (
+        "Groceries",
+        "Expense",
+        ("Supermarket", "Corner shop", "Farmers market"),
+        (5, 150),
+        30,
+    ),
+    ("Rent", "Expense", ("Monthly rent",), (600, 1800), 2),
+    (
+        "Eating Out",
+        "Expense",
+        ("Coffee", "Pizza takeaway", "Sushi dinner", "Lunch"),
+        (3, 80),
+        20,
+    ),
+    (
+        "Transport",
+        "Expense",
+        ("Train ticket", "Bus pass", "Fuel", "Taxi ride"),
+        (2, 120),
+        15,
+    ),
+    (
+        "Utilities",
+        "Expense",
+        ("Electricity bill", "Water bill", "Broadband"),
+        (20, 200),
+        4,
+    ),
+    (
+        "Entertainment",
+        "Expense",
+        ("Cinema tickets", "Streaming subscription", "Concert"),
+        (5, 120),
+        8,
+    ),
+    ("Health", "Expense", ("Pharmacy", "Gym membership", "Dentist"), (5, 250), 4),
+    ("Shopping", "Expense", ("Clothing", "Electronics", "Books"), (10, 500), 10),
+)
+CATEGORY_WEIGHTS = [category[4] for category in CATEGORIES]
+PAYMENT_METHODS = ("card", "cash", "bank_transfer")
+PAYMENT_WEIGHTS = (70, 15, 15)
+NOTES = ("Split with friends", "Paid in advance", "Refund expected", "Gift")
+
+COPY_COLUMNS = (
+    "user_id",
+    "title",
+    "amount",
+    "transaction_type",
+    "category_id",
+    "date",
+    "notes",
+    "recurring",
+    "payment_method",
+)
+
+
+@dataclass
+class SeedResult:
+    user_ids: list
+    transactions: int = 0
+    budgets: int = 0
+
+
+def usernames(prefix, users):
+    return [f"{prefix}-{number:06d}" for number in range(users)]
+
+
+def split_transactions(rng, users, transactions):
+    """Share ``transactions`` among ``users`` with a long tail of heavy users."""
+    weights = [rng.paretovariate(1.2) for _ in range(users)]
+    scale = transactions / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    for number in range(transactions - sum(counts)):
+        counts[number % users] += 1
+    return counts
+
+
+def _transaction_rows(rng, user_id, category_ids, count, end_date, days):
+    """Yield COPY rows (in ``COPY_COLUMNS`` order) for one user's transactions."""
+    choices = rng.choices(range(len(CATEGORIES)), CATEGORY_WEIGHTS, k=count)
+    for index in choices:
+        _, transaction_type, titles, (low, high), _ = CATEGORIES[index]
+        income = transaction_type == "Income"
+        yield (
+            user_id,
+            rng.choice(titles),
+            f"{rng.uniform(low, high):.2f}",
+            transaction_type,
+            category_ids[index],
+            (end_date - datetime.timedelta(days=rng.randrange(days))).isoformat(),
+            rng.choice(NOTES) if rng.random() < 0.1 else None,
+            "f",
+            (
+                "bank_transfer"
+                if income
+                else rng.choices(PAYMENT_METHODS, PAYMENT_WEIGHTS)[0]
+            ),
+        )
+
+
+def _copy(cursor, sql, buffer):
+    """Run ``COPY ... FROM STDIN`` with the text in ``buffer``, on either psycopg."""
+    if is_psycopg3:
+        with cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+    else:
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+
+
+def _copy_transactions(rows, chunk_size):
+    """Write rows to the transaction table with COPY, one chunk at a time."""
+    table = connection.ops.quote_name(Transaction._meta.db_table)
+    sql = f"COPY {table} ({', '.join(COPY_COLUMNS)}) FROM STDIN"
+    written = 0
+    buffer = io.StringIO()
+    with connection.cursor() as cursor:
+        for row in rows:
+            buffer.write(
+                "\t".join(r"\N" if value is None else str(value) for value in row)
+            )
+            buffer.write("\n")
+            written += 1
+            if written % chunk_size == 0:
+                _copy(cursor, sql, buffer)
+                buffer = io.StringIO()
+        if buffer.tell():
+            _copy(cursor, sql, buffer)
+    return written
+
+
+def _budgets(rng, user_id, category_ids, count, end_date, days):
+    expense_indexes = [
+        index for index, category in enumerate(CATEGORIES) if category[1] == "Expense"
+    ]
+    for index in rng.sample(expense_indexes, min(count, len(expense_indexes))):
+        start_date = end_date - datetime.timedelta(days=rng.randrange(days))
+        ongoing = rng.random() < 0.3
+        yield Budget(
+            user_id=user_id,
+            category_id=category_ids[index],
+            amount=f"{rng.randrange(100, 3000, 50)}.00",
+            start_date=start_date,
+            end_date=(
+                None
+                if ongoing
+                else start_date + datetime.timedelta(days=rng.choice((30, 90, 365)))
+            ),
+        )
+
+
+def seed(
+    users,
+    transactions,
+    budgets=4,
+    seed=0,
+    prefix="synthetic",
+    end_date=None,
+    days=730,
+    password=None,
+    chunk_size=CHUNK_SIZE,
+):
+    """Create synthetic users with categories, transactions and budgets.
+
+    Run it inside ``transaction.atomic()`` to get all rows or none.
+
+    Args:
+        users: Number of users, named ``<prefix>-000000`` onwards.
+        transactions: Total transactions, shared unevenly among the users.
+        budgets: Budgets per user, each on a different expense category.
+        seed: Random seed; equal arguments produce equal rows.
+        prefix: Username prefix.
+        end_date: Latest transaction date (today by default).
+        days: Length of the date range ending at ``end_date``.
+        password: Password for every user, or None for unusable passwords.
+        chunk_size: Transactions per COPY statement.
+
+    Returns:
+        SeedResult: The new user IDs and the number of rows created.
+    """
+    rng = random.Random(seed)
+    end_date = end_date or datetime.date.today()
+    # One hash for all users; hashing is deliberately slow
+    password_hash = make_password(password)
+    created = User.objects.bulk_create(
+        (
+            User(username=username, password=password_hash)
+            for username in usernames(prefix, users)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    result = SeedResult(user_ids=[user.pk for user in created])
+
+    categories = Category.objects.bulk_create(
+        (
+            Category(user_id=user_id, name=category[0])
+            for user_id in result.user_ids
+            for category in CATEGORIES
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    category_ids = {}
+    for category in categories:
+        category_ids.setdefault(category.user_id, []).append(category.pk)
+
+    counts = split_transactions(rng, users, transactions)
+    result.transactions = _copy_transactions(
+        (
+            row
+            for user_id, count in zip(result.user_ids, counts)
+            for row in _transaction_rows(
+                rng, user_id, category_ids[user_id], count, end_date, days
+            )
+        ),
+        chunk_size,
+    )
+    result.budgets = len(
+        Budget.objects.bulk_create(
+            (
+                budget
+                for user_id in result.user_ids
+                for budget in _budgets(
+                    rng, user_id, category_ids[user_id], budgets, end_date, days
+                )
+            ),
+            batch_size=BATCH_SIZE,
+        )
+    )
+
+    rollups.rebuild(result.user_ids)
+    versioning.bump(result.user_ids)
+    return result
+
+
+def analyze():
+    """Refresh planner statistics for the tables the seed wrote to."""
+    with connection.cursor() as cursor:
+        for model in (User, Category, Transaction, Budget):
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
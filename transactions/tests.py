@@ -1,10 +1,79 @@
+import csv
+import datetime
+import difflib
+import json
+import random
+import shutil
+import tempfile
+import types
+from io import BytesIO, StringIO
+from decimal import Decimal
+from unittest import mock
+
+import requests
+from asgiref.sync import async_to_sync
+from django.contrib import messages
 from django.contrib.auth.models import User
-from django.test import Client, TestCase
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.models import Session
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection
+from django.db.models import RestrictedError, Sum
+from django.test import (
+    AsyncClient,
+    Client,
+    RequestFactory,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from transactions.models import Budget, Transaction
+from finance_tracker import urls as root_urls
+from finance_tracker.db import database_config, pool_size
+from finance_tracker.db.base import connect_stats
+from transactions import urls as transaction_urls
+from transactions import (
+    bulk,
+    concurrency,
+    importer,
+    metrics,
+    partitions,
+    quotes,
+    recurring,
+    report_jobs,
+    reports,
+    rollups,
+    search,
+    synthetic,
+    versioning,
+    views,
+)
+from transactions.dashboard import (
+    aget_dashboard_context,
+    get_cached_dashboard_context,
+    get_dashboard_context,
+)
+from transactions.filters import filter_transactions
+from transactions.models import Budget, Category, MonthlyRollup, ReportJob, Transaction
+from transactions.pagination import KeysetPaginator
+
+
+def category_for(user, name):
+    return Category.objects.resolve(user, name)
 
 
+STUB_QUOTES = override_settings(
+    QUOTE_PROVIDERS=["transactions.quotes.StubProvider"],
+    QUOTE_REFRESH_IN_BACKGROUND=False,
+)
+
+
+@STUB_QUOTES
 class TransactionViewTest(TestCase):
     def setUp(self):
         self.client = Client()
@@ -16,7 +85,7 @@ class TransactionViewTest(TestCase):
             title="Test Income",
             amount=1000.00,
             transaction_type="Income",
-            category="Salary",
+            category=category_for(self.user, "Salary"),
             date="2025-02-01",
             payment_method="bank_transfer",
         )
@@ -92,6 +161,134 @@ class TransactionViewTest(TestCase):
         self.assertEqual(response.status_code, 403)
         self.assertTrue(Transaction.objects.filter(id=self.transaction.id).exists())
 
+    def test_for_user_scopes_to_owner_unless_superuser(self):
+        self.assertEqual(list(Transaction.objects.for_user(self.user)), [self.transaction])
+        self.assertEqual(list(Transaction.objects.for_user(self.other_user)), [])
+        self.assertEqual(list(Transaction.objects.for_user(self.admin)), [self.transaction])
+
+    def test_superuser_can_edit_and_missing_transaction_is_404(self):
+        self.client.login(username="nay_s", password="adminpass123")
+        url = reverse("edit_transaction", kwargs={"transaction_id": self.transaction.id})
+        self.assertContains(self.client.get(url), "Salary")
+        missing = reverse("edit_transaction", kwargs={"transaction_id": self.transaction.id + 1000})
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+    def test_superuser_edit_keeps_category_with_owner(self):
+        self.client.login(username="nay_s", password="adminpass123")
+        response = self.client.post(
+            reverse("edit_transaction", kwargs={"transaction_id": self.transaction.id}),
+            {
+                "title": "Test Income",
+                "amount": 1000.00,
+                "transaction_type": "Income",
+                "category": "Bonus",
+                "date": "2025-02-01",
+                "payment_method": "bank_transfer",
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        self.transaction.refresh_from_db()
+        self.assertEqual(self.transaction.category.user, self.user)
+        self.assertFalse(Category.objects.filter(user=self.admin).exists())
+        self.assertEqual(rollups.verify([self.user.pk]), [])
+
+
+@STUB_QUOTES
+class BulkActionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.other_user = User.objects.create_user(username="otheruser", password="testpass123")
+        food = category_for(self.user, "Food")
+        self.rows = [
+            Transaction.objects.create(
+                user=self.user, title=f"Row {i}", amount=10 * i, transaction_type="Expense", category=food, date=date
+            )
+            for i, date in enumerate(["2025-01-05", "2025-01-20", "2025-02-03"], 1)
+        ]
+        self.others = Transaction.objects.create(
+            user=self.other_user,
+            title="Not mine",
+            amount=5,
+            transaction_type="Expense",
+            category=category_for(self.other_user, "Food"),
+        )
+        self.ids = [row.pk for row in self.rows] + [self.others.pk]
+        self.client.login(username="testuser", password="testpass123")
+
+    def test_change_category_is_one_update_with_one_rollup_and_version_write(self):
+        category_for(self.user, "Groceries")
+        version = versioning.get_version(self.user)[0]
+        # Savepoint; category lookup; UPDATE; rollup upsert; empty bucket
+        # cleanup; version bump; release
+        with self.assertNumQueries(7):
+            changed = bulk.change_category(self.user, self.ids, "groceries")
+        self.assertEqual(changed, 3)
+        self.assertEqual(versioning.get_version(self.user)[0], version + 1)
+        self.assertEqual(set(Transaction.objects.filter(user=self.user).values_list("category__name", flat=True)), {"Groceries"})
+        self.assertEqual(Transaction.objects.get(pk=self.others.pk).category.user, self.other_user)
+        self.assertEqual(rollups.verify(), [])
+
+    def test_failed_change_category_leaves_no_new_category(self):
+        with mock.patch("transactions.bulk._bucket_totals", side_effect=DatabaseError("update failed")):
+            with self.assertRaises(DatabaseError):
+                bulk.change_category(self.user, self.ids, "Brand new")
+        self.assertFalse(Category.objects.filter(user=self.user, name="Brand new").exists())
+
+    def test_payment_method_and_recurring_are_single_updates(self):
+        self.rows[0].recurring = True
+        self.rows[0].save()
+        with self.assertNumQueries(4):  # Savepoint, UPDATE, version bump, release
+            self.assertEqual(bulk.change_payment_method(self.user, self.ids, "card"), 3)
+        with self.assertNumQueries(4):
+            self.assertEqual(bulk.toggle_recurring(self.user, self.ids), 3)
+        self.assertEqual(
+            list(Transaction.objects.filter(user=self.user).order_by("id").values_list("payment_method", "recurring")),
+            [("card", False), ("card", True), ("card", True)],
+        )
+        self.assertEqual(Transaction.objects.get(pk=self.others.pk).payment_method, "cash")
+        self.assertFalse(Transaction.objects.get(pk=self.others.pk).recurring)
+
+    def test_delete_keeps_occurrences_of_deleted_templates(self):
+        template = self.rows[0]
+        occurrence = self.rows[2]
+        occurrence.recurrence_parent = template
+        occurrence.save()
+        self.assertEqual(bulk.delete(self.user, [template.pk, self.others.pk]), 1)
+        self.assertFalse(Transaction.objects.filter(pk=template.pk).exists())
+        occurrence.refresh_from_db()
+        self.assertIsNone(occurrence.recurrence_parent)
+        self.assertTrue(Transaction.objects.filter(pk=self.others.pk).exists())
+        self.assertEqual(rollups.verify(), [])
+        self.assertEqual(bulk.delete(self.user, [row.pk for row in self.rows]), 2)
+        self.assertFalse(MonthlyRollup.objects.filter(user=self.user).exists())
+
+    def test_view_asks_before_deleting(self):
+        response = self.client.post(reverse("bulk_transactions"), {"action": "delete", "ids": self.ids, "query": "page=2"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Are you sure you want to delete 3 transactions?")
+        self.assertContains(response, "Row 3")
+        self.assertNotContains(response, "Not mine")
+        self.assertContains(response, '<input type="hidden" name="confirmed" value="True">', html=True)
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 3)
+
+    def test_view_applies_action_and_returns_to_list(self):
+        response = self.client.post(
+            reverse("bulk_transactions"),
+            {"action": "delete", "ids": self.ids[:2], "query": "transaction_type=Expense", "confirmed": "True"},
+            follow=True,
+        )
+        self.assertRedirects(response, reverse("transaction_list") + "?transaction_type=Expense")
+        self.assertContains(response, "Deleted 2 transactions.")
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 1)
+
+    def test_view_rejects_incomplete_actions(self):
+        response = self.client.post(reverse("bulk_transactions"), {"action": "change_category", "ids": self.ids}, follow=True)
+        self.assertContains(response, "Enter the new category.")
+        response = self.client.post(reverse("bulk_transactions"), {"action": "delete"}, follow=True)
+        self.assertContains(response, "Select at least one transaction.")
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(self.client.get(reverse("bulk_transactions")).status_code, 405)
+
 
 class BudgetViewTest(TestCase):
     def setUp(self):
@@ -101,7 +298,7 @@ class BudgetViewTest(TestCase):
         self.admin = User.objects.create_superuser(username="nay_s", password="adminpass123", email="nay_s@example.com")
         self.budget = Budget.objects.create(
             user=self.user,
-            category="Food",
+            category=category_for(self.user, "Food"),
             amount=500.00,
             start_date="2025-02-01",
             end_date="2025-02-28",
@@ -119,7 +316,7 @@ class BudgetViewTest(TestCase):
             },
         )
         self.assertEqual(response.status_code, 302)
-        self.assertTrue(Budget.objects.filter(category="Transport").exists())
+        self.assertTrue(Budget.objects.filter(category__name="Transport").exists())
 
     def test_edit_budget_owner(self):
         self.client.login(username="testuser", password="testpass123")
@@ -134,7 +331,7 @@ class BudgetViewTest(TestCase):
         )
         self.assertEqual(response.status_code, 302)
         self.budget.refresh_from_db()
-        self.assertEqual(self.budget.category, "Updated Category")
+        self.assertEqual(self.budget.category.name, "Updated Category")
 
     def test_edit_budget_non_owner(self):
         self.client.login(username="otheruser", password="testpass123")
@@ -149,7 +346,7 @@ class BudgetViewTest(TestCase):
         )
         self.assertEqual(response.status_code, 403)
         self.budget.refresh_from_db()
-        self.assertEqual(self.budget.category, "Food")
+        self.assertEqual(self.budget.category.name, "Food")
 
     def test_delete_budget_owner(self):
         self.client.login(username="testuser", password="testpass123")
@@ -162,3 +359,1548 @@ class BudgetViewTest(TestCase):
         response = self.client.post(reverse("delete_budget", kwargs={"budget_id": self.budget.id}))
         self.assertEqual(response.status_code, 403)
         self.assertTrue(Budget.objects.filter(id=self.budget.id).exists())
+
+
+class FailingProvider:
+    def fetch(self):
+        raise quotes.QuoteUnavailable("upstream down")
+
+
+@STUB_QUOTES
+class QuoteProviderTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+
+    def test_cold_cache_serves_local_pool(self):
+        self.assertIn(quotes.get_quote(), quotes.LocalQuotePool.quotes)
+
+    def test_refresh_populates_cache(self):
+        self.assertEqual(quotes.refresh_quote(), quotes.StubProvider.quote)
+        self.assertEqual(quotes.get_quote(), quotes.StubProvider.quote)
+
+    def test_transaction_list_does_no_network_io(self):
+        quotes.refresh_quote()
+        with mock.patch("requests.get", side_effect=requests.ConnectionError) as get:
+            response = self.client.get(reverse("transaction_list"))
+        get.assert_not_called()
+        self.assertContains(response, "a small leak will sink a great ship")
+
+    @override_settings(
+        QUOTE_PROVIDERS=["transactions.tests.FailingProvider"],
+        QUOTE_FAILURE_THRESHOLD=2,
+        QUOTE_REFRESH_IN_BACKGROUND=True,
+    )
+    def test_circuit_opens_after_repeated_failures(self):
+        self.assertIsNone(quotes.refresh_quote())
+        self.assertFalse(quotes.circuit_is_open())
+        self.assertIsNone(quotes.refresh_quote())
+        self.assertTrue(quotes.circuit_is_open())
+        with mock.patch("transactions.quotes.threading.Thread") as thread:
+            self.assertFalse(quotes.schedule_refresh())
+        thread.assert_not_called()
+
+    @override_settings(QUOTE_PROVIDERS=["transactions.tests.FailingProvider"])
+    def test_failure_count_survives_concurrent_reset(self):
+        # A successful refresh elsewhere deleted the counter between add and incr
+        with mock.patch.object(quotes.cache, "incr", side_effect=ValueError("Key not found")):
+            self.assertIsNone(quotes.refresh_quote())
+        self.assertEqual(cache.get(quotes.FAILURE_COUNT_KEY), 1)
+
+
+@STUB_QUOTES
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        # Repeated dates and amounts exercise the id tiebreaker
+        for i in range(23):
+            Transaction.objects.create(
+                user=self.user,
+                title=f"Row {i}",
+                amount=10 + i % 4,
+                transaction_type="Expense",
+                category=category_for(self.user, "Food"),
+                date=f"2025-02-{1 + i % 5:02d}",
+            )
+        self.queryset = Transaction.objects.filter(user=self.user)
+
+    def walk(self, sort_by):
+        paginator = KeysetPaginator(self.queryset, sort_by=sort_by, page_size=5)
+        page = paginator.page()
+        pages = [page]
+        while page.has_next:
+            page = paginator.page(page.next_cursor)
+            pages.append(page)
+        return paginator, pages
+
+    def test_pages_match_offset_ordering(self):
+        expected = {
+            "date_desc": ("-date", "-id"),
+            "date_asc": ("date", "id"),
+            "amount_desc": ("-amount", "-id"),
+            "amount_asc": ("amount", "id"),
+        }
+        for sort_by, ordering in expected.items():
+            with self.subTest(sort_by=sort_by):
+                _, pages = self.walk(sort_by)
+                ids = [t.id for page in pages for t in page]
+                self.assertEqual(ids, list(self.queryset.order_by(*ordering).values_list("id", flat=True)))
+                self.assertEqual(len(pages), 5)
+
+    def test_prev_cursor_returns_previous_page(self):
+        paginator, pages = self.walk("amount_desc")
+        for previous, page in zip(pages, pages[1:]):
+            back = paginator.page(page.prev_cursor)
+            self.assertEqual([t.id for t in back], [t.id for t in previous])
+        self.assertFalse(pages[0].has_previous)
+        self.assertFalse(paginator.page(pages[1].prev_cursor).has_previous)
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        paginator = KeysetPaginator(self.queryset, page_size=5)
+        self.assertEqual(
+            [t.id for t in paginator.page("not-a-cursor")],
+            [t.id for t in paginator.page()],
+        )
+
+    def test_list_view_paginates_and_keeps_filters(self):
+        self.client.login(username="testuser", password="testpass123")
+        response = self.client.get(reverse("transaction_list"), {"sort_by": "amount_asc", "category": "Food"})
+        self.assertEqual(len(response.context["transactions"]), 23)
+        self.assertIsNone(response.context["next_url"])
+        with mock.patch("transactions.views.TRANSACTIONS_PER_PAGE", 10):
+            response = self.client.get(reverse("transaction_list"), {"sort_by": "amount_asc", "category": "Food"})
+        self.assertEqual(len(response.context["transactions"]), 10)
+        self.assertIn("sort_by=amount_asc", response.context["next_url"])
+        self.assertIn("category=Food", response.context["next_url"])
+
+
+@STUB_QUOTES
+class CategoryTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.other = User.objects.create_user(username="otheruser", password="testpass123")
+        self.food = category_for(self.user, "Food")
+        Transaction.objects.create(
+            user=self.user, title="Lunch", amount=12, transaction_type="Expense", category=self.food, date="2025-01-10"
+        )
+        Transaction.objects.create(
+            user=self.other,
+            title="Hidden",
+            amount=5,
+            transaction_type="Expense",
+            category=category_for(self.other, "Food"),
+            date="2025-01-10",
+        )
+        self.client.login(username="testuser", password="testpass123")
+
+    def test_resolve_matches_names_case_insensitively(self):
+        self.assertEqual(category_for(self.user, " food "), self.food)
+        self.assertNotEqual(category_for(self.other, "FOOD"), self.food)
+        self.assertEqual(Category.objects.filter(user=self.user).count(), 1)
+
+    def test_admin_changes_bump_the_owners_version(self):
+        User.objects.create_superuser(username="admin", password="adminpass123", email="admin@example.com")
+        self.client.login(username="admin", password="adminpass123")
+        version = versioning.get_version(self.user)[0]
+        response = self.client.post(
+            reverse("admin:transactions_category_change", args=[self.food.pk]), {"name": "Groceries", "user": self.user.pk}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(versioning.get_version(self.user)[0], version + 1)
+        empty = category_for(self.user, "Unused")
+        self.client.post(reverse("admin:transactions_category_delete", args=[empty.pk]), {"post": "yes"})
+        self.assertFalse(Category.objects.filter(pk=empty.pk).exists())
+        self.assertEqual(versioning.get_version(self.user)[0], version + 2)
+
+    def test_filter_uses_category_keys(self):
+        response = self.client.get(reverse("transaction_list"), {"category": "fOOd"})
+        self.assertEqual([t.title for t in response.context["transactions"]], ["Lunch"])
+        response = self.client.get(reverse("transaction_list"), {"category": "Foo"})
+        self.assertEqual(list(response.context["transactions"]), [])
+
+    def test_forms_reuse_existing_categories(self):
+        self.client.post(
+            reverse("add_transaction"),
+            {
+                "title": "Dinner",
+                "amount": "20.00",
+                "transaction_type": "Expense",
+                "category": "FOOD",
+                "date": "2025-01-11",
+                "payment_method": "card",
+            },
+        )
+        self.client.post(reverse("add_budget"), {"category": "food", "amount": "100", "start_date": "2025-01-01"})
+        self.assertEqual(Transaction.objects.get(title="Dinner").category, self.food)
+        self.assertEqual(Budget.objects.get(user=self.user).category, self.food)
+        self.assertEqual(Category.objects.filter(user=self.user).count(), 1)
+
+    def test_edit_form_shows_category_name(self):
+        transaction = Transaction.objects.get(title="Lunch")
+        response = self.client.get(reverse("edit_transaction", args=[transaction.id]))
+        self.assertEqual(response.context["form"]["category"].value(), "Food")
+
+    def test_used_category_cannot_be_deleted(self):
+        with self.assertRaises(RestrictedError):
+            self.food.delete()
+
+
+@STUB_QUOTES
+class SearchTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        other = User.objects.create_user(username="otheruser", password="testpass123")
+        for title, notes, category in [
+            ("Weekly groceries", None, "Food"),
+            ("Corner shop", "groceries top-up", "Food"),
+            ("Train ticket", None, "Commute"),
+        ]:
+            Transaction.objects.create(
+                user=self.user,
+                title=title,
+                notes=notes,
+                amount=10,
+                transaction_type="Expense",
+                category=category_for(self.user, category),
+                date="2025-01-10",
+            )
+        Transaction.objects.create(
+            user=other,
+            title="Other groceries",
+            amount=10,
+            transaction_type="Expense",
+            category=category_for(other, "Food"),
+            date="2025-01-10",
+        )
+
+    def titles(self, text):
+        return [t.title for t in search.search_transactions(self.user, text)]
+
+    def test_admin_search_matches_text_owner_and_category(self):
+        User.objects.create_superuser(username="admin", password="adminpass123", email="admin@example.com")
+        self.client.login(username="admin", password="adminpass123")
+
+        def admin_titles(term):
+            response = self.client.get(reverse("admin:transactions_transaction_changelist"), {"q": term})
+            return sorted(t.title for t in response.context["cl"].result_list)
+
+        self.assertEqual(admin_titles("grocer"), ["Corner shop", "Other groceries", "Weekly groceries"])
+        self.assertEqual(admin_titles("otheruser"), ["Other groceries"])
+        self.assertEqual(admin_titles("commute"), ["Train ticket"])
+
+    def test_title_matches_rank_above_notes(self):
+        self.assertEqual(self.titles("groceries"), ["Weekly groceries", "Corner shop"])
+
+    def test_partial_words_and_categories_match(self):
+        self.assertEqual(self.titles("groc"), ["Weekly groceries", "Corner shop"])
+        self.assertEqual(self.titles("commute"), ["Train ticket"])
+        self.assertEqual(self.titles("!!"), [])
+
+    def test_vector_is_kept_current_on_save(self):
+        transaction = Transaction.objects.get(title="Train ticket")
+        transaction.title = "Bus pass"
+        transaction.save()
+        self.assertEqual(self.titles("bus"), ["Bus pass"])
+        Transaction.objects.filter(pk=transaction.pk).update(notes="monthly travelcard")
+        self.assertEqual(self.titles("travelcard"), ["Bus pass"])
+
+    def test_search_view(self):
+        self.client.login(username="testuser", password="testpass123")
+        response = self.client.get(reverse("search_transactions"), {"q": "groceries"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([t.title for t in response.context["results"]], ["Weekly groceries", "Corner shop"])
+        self.assertNotContains(response, "Other groceries")
+
+
+class BudgetUtilizationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        other = User.objects.create_user(username="otheruser", password="testpass123")
+        food, rent = category_for(self.user, "Food"), category_for(self.user, "Rent")
+        for amount, transaction_type, category, date in [
+            (40, "Expense", food, "2025-01-05"),
+            (35, "Expense", food, "2025-01-31"),
+            (20, "Expense", food, "2025-02-01"),  # After the January budget ends
+            (500, "Income", food, "2025-01-10"),  # Income never counts
+            (900, "Expense", rent, "2025-01-01"),
+        ]:
+            Transaction.objects.create(
+                user=self.user, title="Row", amount=amount, transaction_type=transaction_type, category=category, date=date
+            )
+        Transaction.objects.create(
+            user=other, title="Other", amount=70, transaction_type="Expense", category=category_for(other, "Food"), date="2025-01-05"
+        )
+        self.january = Budget.objects.create(
+            user=self.user, category=food, amount=100, start_date="2025-01-01", end_date="2025-01-31"
+        )
+        self.ongoing = Budget.objects.create(user=self.user, category=food, amount=50, start_date="2025-01-15")
+        self.unused = Budget.objects.create(user=self.user, category=category_for(self.user, "Travel"), amount=80, start_date="2025-01-01")
+
+    def test_spending_is_annotated_in_one_query(self):
+        with self.assertNumQueries(1):
+            budgets = {
+                b.pk: (b.spent, b.remaining, b.percent_used)
+                for b in Budget.objects.filter(user=self.user).with_utilization(datetime.date(2025, 3, 1))
+            }
+        self.assertEqual(budgets[self.january.pk], (75, 25, Decimal("75.0")))
+        self.assertEqual(budgets[self.ongoing.pk], (55, -5, Decimal("110.0")))
+        self.assertEqual(budgets[self.unused.pk], (0, 80, 0))
+
+    def test_ongoing_budget_stops_at_today(self):
+        budget = Budget.objects.with_utilization(datetime.date(2025, 1, 31)).get(pk=self.ongoing.pk)
+        self.assertEqual(budget.spent, 35)
+
+    def test_budget_list_shows_utilization(self):
+        self.client.login(username="testuser", password="testpass123")
+        response = self.client.get(reverse("budget_list"))
+        self.assertContains(response, "$75.00")
+        self.assertContains(response, "75.0%")
+
+
+class RecurringTransactionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.rent = Transaction.objects.create(
+            user=self.user,
+            title="Rent",
+            amount=900,
+            transaction_type="Expense",
+            category=category_for(self.user, "Rent"),
+            date="2025-01-31",
+            recurring=True,
+        )
+        self.salary = Transaction.objects.create(
+            user=self.user,
+            title="Salary",
+            amount=3000,
+            transaction_type="Income",
+            category=category_for(self.user, "Salary"),
+            date="2025-01-15",
+            recurring=True,
+            payment_method="bank_transfer",
+        )
+        Transaction.objects.create(
+            user=self.user, title="One-off", amount=5, transaction_type="Expense", category=self.rent.category, date="2025-01-02"
+        )
+
+    def dates(self, template):
+        return [str(d) for d in template.occurrences.order_by("date").values_list("date", flat=True)]
+
+    def test_occurrences_up_to_horizon(self):
+        version, _ = versioning.get_version(self.user)
+        self.assertEqual(recurring.materialize(until=datetime.date(2025, 4, 30)), 6)
+        self.assertEqual(self.dates(self.rent), ["2025-02-28", "2025-03-31", "2025-04-30"])
+        self.assertEqual(self.dates(self.salary), ["2025-02-15", "2025-03-15", "2025-04-15"])
+        occurrence = self.salary.occurrences.first()
+        self.assertEqual(
+            (occurrence.amount, occurrence.category, occurrence.payment_method, occurrence.recurring),
+            (3000, self.salary.category, "bank_transfer", False),
+        )
+        self.assertEqual(rollups.verify([self.user.pk]), [])
+        self.assertEqual(versioning.get_version(self.user)[0], version + 1)
+
+    def test_reruns_are_idempotent_and_resume(self):
+        recurring.materialize(until=datetime.date(2025, 3, 1))
+        self.assertEqual(recurring.materialize(until=datetime.date(2025, 3, 1)), 0)
+        self.assertEqual(recurring.materialize(until=datetime.date(2025, 5, 31)), 6)
+        self.assertEqual(self.dates(self.rent), ["2025-02-28", "2025-03-31", "2025-04-30", "2025-05-31"])
+
+    def test_deleted_occurrence_is_not_recreated(self):
+        recurring.materialize(until=datetime.date(2025, 3, 31))
+        self.salary.occurrences.get(date="2025-03-15").delete()
+        self.assertEqual(recurring.materialize(until=datetime.date(2025, 4, 30)), 2)
+        self.assertEqual(self.dates(self.salary), ["2025-02-15", "2025-04-15"])
+        self.salary.refresh_from_db()
+        self.assertEqual(self.salary.materialized_through, datetime.date(2025, 4, 30))
+
+    def test_moved_occurrence_does_not_skip_months(self):
+        recurring.materialize(until=datetime.date(2025, 2, 28))
+        occurrence = self.salary.occurrences.get()
+        occurrence.date = datetime.date(2025, 4, 15)
+        occurrence.save()
+        # Its new date is taken, the months before it are not skipped
+        self.assertEqual(recurring.materialize(until=datetime.date(2025, 5, 31)), 5)
+        self.assertEqual(self.dates(self.salary), ["2025-03-15", "2025-04-15", "2025-05-15"])
+        self.assertEqual(self.dates(self.rent), ["2025-02-28", "2025-03-31", "2025-04-30", "2025-05-31"])
+
+    def test_chunks_cover_every_users_templates(self):
+        for i in range(3):
+            user = User.objects.create_user(username=f"user{i}")
+            Transaction.objects.create(
+                user=user,
+                title="Gym",
+                amount=30,
+                transaction_type="Expense",
+                category=category_for(user, "Health"),
+                date="2025-01-10",
+                recurring=True,
+            )
+        self.assertEqual(recurring.materialize(until=datetime.date(2025, 2, 28), chunk_size=2), 5)
+        self.assertEqual(Transaction.objects.filter(title="Gym", recurrence_parent__isnull=False).count(), 3)
+
+    def test_deleting_template_keeps_occurrences(self):
+        recurring.materialize(until=datetime.date(2025, 3, 31))
+        self.rent.delete()
+        self.assertEqual(Transaction.objects.filter(title="Rent").count(), 2)
+        self.assertEqual(rollups.verify([self.user.pk]), [])
+
+    def test_command(self):
+        out = StringIO()
+        call_command("materialize_recurring", "--until", "2025-02-28", stdout=out)
+        self.assertIn("Created 2 recurring transactions", out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("materialize_recurring", "--until", "soon")
+
+
+class QueryPlanTest(TestCase):
+    """EXPLAIN the dashboard and list queries against a seeded dataset."""
+
+    CATEGORY_NAMES = ["Food", "Rent", "Salary", "Travel"]
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(42)
+        users = User.objects.bulk_create(User(username=f"user{i}") for i in range(200))
+        start = datetime.date(2023, 1, 1)
+        categories = {
+            (category.user_id, category.name): category
+            for category in Category.objects.bulk_create(
+                Category(user=user, name=name) for user in users for name in cls.CATEGORY_NAMES
+            )
+        }
+        Transaction.objects.bulk_create(
+            Transaction(
+                user=user,
+                title="Seeded",
+                amount=Decimal(rng.randint(100, 100000)) / 100,
+                transaction_type=rng.choice(["Income", "Expense"]),
+                category=categories[user.pk, rng.choice(cls.CATEGORY_NAMES)],
+                date=start + datetime.timedelta(days=rng.randint(0, 730)),
+            )
+            for user in users
+            for _ in range(100)
+        )
+        Budget.objects.bulk_create(
+            Budget(user=user, category=categories[user.pk, "Food"], amount=100, start_date=start + datetime.timedelta(days=30 * i))
+            for user in users
+            for i in range(10)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE transactions_transaction")
+            cursor.execute("ANALYZE transactions_budget")
+            cursor.execute("ANALYZE transactions_category")
+        cls.user = users[0]
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        with connection.cursor() as cursor:
+            # Each partition has its own copy of an index on the partitioned table
+            cursor.execute(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(%s)",
+                [index_name],
+            )
+            names = [index_name] + [row[0] for row in cursor.fetchall()]
+        self.assertTrue(any(name in plan for name in names), msg=f"{index_name} not used:\n{plan}")
+
+    def test_dashboard_queries_use_type_date_index(self):
+        transactions = Transaction.objects.filter(user=self.user)
+        self.assertUsesIndex(
+            transactions.filter(transaction_type="Expense", date__gte=datetime.date(2024, 6, 1))
+            .values("date__month")
+            .annotate(total=Sum("amount")),
+            "txn_user_type_date_idx",
+        )
+        self.assertUsesIndex(
+            transactions.filter(transaction_type="Income").values("category").annotate(total=Sum("amount")),
+            "txn_user_type_date_idx",
+        )
+
+    def test_list_queries_use_sort_indexes(self):
+        transactions = Transaction.objects.filter(user=self.user)
+        self.assertUsesIndex(transactions.order_by("-date", "-id")[:51], "txn_user_date_idx")
+        self.assertUsesIndex(
+            transactions.filter(date__gte="2023-03-01", date__lte="2023-09-01").order_by("date", "id")[:51],
+            "txn_user_date_idx",
+        )
+        self.assertUsesIndex(transactions.order_by("-amount", "-id")[:51], "txn_user_amount_idx")
+
+    def test_budget_list_uses_start_date_index(self):
+        self.assertUsesIndex(
+            Budget.objects.filter(user=self.user).order_by("-start_date")[:5], "budget_user_start_idx"
+        )
+
+    def test_search_uses_gin_index(self):
+        Transaction.objects.create(
+            user=self.user,
+            title="Dentist",
+            amount=80,
+            transaction_type="Expense",
+            category=Category.objects.get(user=self.user, name="Food"),
+        )
+        with connection.cursor() as cursor:
+            # Prefix matches get a default 2% selectivity estimate, so a table
+            # this small is cheaper to scan; check the index can serve them
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        self.assertUsesIndex(Transaction.objects.filter(search_vector=search.prefix_query("dentist")), "txn_search_idx")
+
+    def test_budget_utilization_uses_range_index(self):
+        self.assertUsesIndex(Budget.objects.filter(user=self.user).with_utilization(), "txn_user_cat_date_idx")
+
+    def test_category_filter_uses_name_index(self):
+        self.assertUsesIndex(Category.objects.filter(user=self.user).named("food"), "category_unique_name_per_user")
+        transactions, _ = filter_transactions(Transaction.objects.filter(user=self.user), {"category": "food"})
+        self.assertUsesIndex(transactions, "category_unique_name_per_user")
+
+
+class PartitionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.category = category_for(self.user, "Food")
+
+    def add(self, date):
+        return Transaction.objects.create(
+            user=self.user, title="Lunch", amount=12, transaction_type="Expense", category=self.category, date=date
+        )
+
+    def partition_of(self, transaction):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT tableoid::regclass::text FROM transactions_transaction WHERE id = %s", [transaction.pk])
+            return cursor.fetchone()[0]
+
+    def test_ranges_and_names(self):
+        self.assertEqual(
+            partitions.partition_range(datetime.date(2024, 12, 15), "month"),
+            (datetime.date(2024, 12, 1), datetime.date(2025, 1, 1)),
+        )
+        self.assertEqual(
+            partitions.partition_range(datetime.date(2024, 12, 15), "year"),
+            (datetime.date(2024, 1, 1), datetime.date(2025, 1, 1)),
+        )
+        self.assertEqual(partitions.partition_name(datetime.date(2025, 1, 1), "month"), "transactions_transaction_m2025_01")
+        self.assertEqual(partitions.ahead(datetime.date(2025, 11, 3), "month", 2), datetime.date(2026, 1, 31))
+        with self.assertRaises(ValueError):
+            partitions.get_interval("week")
+
+    def test_migrated_table_has_current_and_future_partitions(self):
+        today = datetime.date.today()
+        with connection.cursor() as cursor:
+            self.assertTrue(partitions.is_partitioned(cursor))
+            names = [name for name, _, _ in partitions.existing_partitions(cursor)]
+        self.assertIn(partitions.partition_name(datetime.date(today.year, 1, 1), "year"), names)
+        self.assertIn(partitions.partition_name(datetime.date(today.year + 1, 1, 1), "year"), names)
+        self.assertEqual(partitions.ensure_future_partitions(), [])
+
+    def test_new_partition_takes_its_rows_from_the_default(self):
+        far = self.add(datetime.date(2090, 3, 1))
+        self.add(datetime.date(2092, 3, 1))
+        self.assertEqual(self.partition_of(far), "transactions_transaction_default")
+
+        created = partitions.ensure_partitions(datetime.date(2090, 2, 1), datetime.date(2090, 3, 31), "month")
+
+        self.assertEqual(created, ["transactions_transaction_m2090_02", "transactions_transaction_m2090_03"])
+        self.assertEqual(self.partition_of(far), "transactions_transaction_m2090_03")
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(Transaction.objects.get(pk=far.pk).date, datetime.date(2090, 3, 1))
+        # Whole years overlapping the new months are skipped
+        self.assertEqual(partitions.ensure_partitions(datetime.date(2090, 1, 1), datetime.date(2090, 12, 31), "year"), [])
+
+    def test_command_creates_partitions_since_a_date(self):
+        out = StringIO()
+        call_command("create_partitions", "--since", "1999-06-01", "--ahead", "0", stdout=out)
+        self.assertIn("Created transactions_transaction_y1999", out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("create_partitions", "--since", "soon")
+
+    def test_date_bounded_queries_scan_only_matching_partitions(self):
+        partitions.ensure_partitions(datetime.date(2090, 1, 1), datetime.date(2092, 12, 31), "year")
+        self.add(datetime.date(2091, 5, 1))
+        transactions = Transaction.objects.filter(user=self.user)
+
+        filtered, _ = filter_transactions(transactions, {"start_date": "2091-02-01", "end_date": "2091-06-30"})
+        plan = filtered.order_by("-date", "-id").explain()
+        self.assertIn("transactions_transaction_y2091", plan)
+        self.assertNotIn("transactions_transaction_y2090", plan)
+        self.assertNotIn("transactions_transaction_default", plan)
+
+        # Keyset pages carry a date bound, so later pages skip newer partitions
+        paginator = KeysetPaginator(transactions, sort_by="date_desc")
+        plan = paginator._seek(datetime.date(2091, 5, 1), 10**9).explain()
+        self.assertNotIn("transactions_transaction_y2092", plan)
+
+
+class QueryCapture:
+    """``execute_wrapper`` hook recording each statement and the rows it returned."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        cursor = context["cursor"]
+        self.queries.append((sql, cursor.rowcount if cursor.description else 0))
+        return result
+
+    @property
+    def rows(self):
+        return sum(rows for _, rows in self.queries)
+
+    def lines(self):
+        return [f"{sql}  -- {rows} rows" for sql, rows in self.queries]
+
+
+QUERY_BUDGET_SIZES = (1, 120)  # Transactions of the requesting user
+
+# URL name -> {data size: (max queries, max rows fetched)}, for a request by the owner
+QUERY_BUDGETS = {
+    # One keyset page (51 rows) however many transactions there are
+    "transaction_list": {1: (5, 4), 120: (5, 54)},
+    "add_transaction": {1: (2, 2), 120: (2, 2)},
+    # One UPDATE, rollup upsert and version bump however many rows are selected
+    "bulk_transactions": {1: (9, 4), 120: (9, 4)},
+    # One more query while the trigram index check is not yet cached
+    "search_transactions": {1: (5, 3), 120: (5, 8)},
+    "import_transactions": {1: (2, 2), 120: (2, 2)},
+    # Streams every row, in a single query
+    "export_transactions": {1: (3, 3), 120: (3, 122)},
+    # Ownership is checked by the lookup query itself
+    "edit_transaction": {1: (3, 3), 120: (3, 3)},
+    "delete_transaction": {1: (3, 3), 120: (3, 3)},
+    "budget_list": {1: (4, 7), 120: (4, 7)},
+    "add_budget": {1: (2, 2), 120: (2, 2)},
+    "export_budgets": {1: (3, 6), 120: (3, 6)},
+    "edit_budget": {1: (3, 3), 120: (3, 3)},
+    "delete_budget": {1: (3, 3), 120: (3, 3)},
+    "edit_profile": {1: (2, 2), 120: (2, 2)},
+    "download_report": {1: (5, 5), 120: (5, 5)},
+    "report_status": {1: (3, 3), 120: (3, 3)},
+    "report_file": {1: (3, 3), 120: (3, 3)},
+}
+
+QUERY_BUDGET_PARAMS = {"search_transactions": "q=coffee"}
+
+# URL name -> POST data builder, for views that only accept POST
+QUERY_BUDGET_POSTS = {
+    "bulk_transactions": lambda kwargs: {
+        "action": "change_category",
+        "ids": [kwargs["transaction_id"]],
+        "category": "Eating Out",
+    },
+}
+
+
+@STUB_QUOTES
+class QueryBudgetTest(TestCase):
+    """Every transactions URL stays within a fixed query and row budget.
+
+    Exceeding a budget fails with the captured SQL, diffed against the same
+    view at the previous data size so repeated (N+1) statements stand out.
+    Server-side cursors are disabled so streamed rows are counted too.
+    """
+
+    def setUp(self):
+        self.reports_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.reports_root, ignore_errors=True)
+        settings = override_settings(
+            DASHBOARD_CACHE_TTL=0, REPORT_JOBS_INLINE=True, REPORTS_ROOT=self.reports_root
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        cursors = mock.patch.dict(connection.settings_dict, DISABLE_SERVER_SIDE_CURSORS=True)
+        cursors.start()
+        self.addCleanup(cursors.stop)
+
+    def seed(self, size):
+        result = synthetic.seed(1, size, budgets=4, seed=size, prefix=f"budget{size}")
+        user = User.objects.get(pk=result.user_ids[0])
+        kwargs = {
+            "transaction_id": Transaction.objects.filter(user=user).earliest("id").pk,
+            "budget_id": Budget.objects.filter(user=user).earliest("id").pk,
+            "job_id": report_jobs.current_job(user).pk,
+        }
+        self.client.force_login(user)
+        self.client.get(reverse("budget_list"))  # Saves the new session
+        return kwargs
+
+    def capture(self, name, kwargs):
+        pattern = next(p for p in transaction_urls.urlpatterns if p.name == name)
+        url = reverse(name, kwargs={key: kwargs[key] for key in pattern.pattern.converters})
+        if name in QUERY_BUDGET_PARAMS:
+            url += f"?{QUERY_BUDGET_PARAMS[name]}"
+        capture = QueryCapture()
+        with connection.execute_wrapper(capture):
+            if name in QUERY_BUDGET_POSTS:
+                response = self.client.post(url, QUERY_BUDGET_POSTS[name](kwargs))
+            else:
+                response = self.client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertLess(response.status_code, 400, url)
+        return capture
+
+    def budget_failure(self, name, size, capture, previous):
+        max_queries, max_rows = QUERY_BUDGETS[name][size]
+        header = (
+            f"{name} with {size} transactions ran {len(capture.queries)} queries "
+            f"(budget {max_queries}) fetching {capture.rows} rows (budget {max_rows})"
+        )
+        lines = [header, *(f"{n}. {line}" for n, line in enumerate(capture.lines(), 1))]
+        if previous is not None:
+            previous_size, previous_capture = previous
+            lines += difflib.unified_diff(
+                previous_capture.lines(),
+                capture.lines(),
+                f"{name} @ {previous_size} transactions",
+                f"{name} @ {size} transactions",
+                lineterm="",
+            )
+        return "\n".join(lines)
+
+    def test_every_url_has_a_budget(self):
+        names = {pattern.name for pattern in transaction_urls.urlpatterns}
+        self.assertEqual(set(QUERY_BUDGETS), names)
+        for name, budgets in QUERY_BUDGETS.items():
+            self.assertEqual(set(budgets), set(QUERY_BUDGET_SIZES), name)
+
+    def test_failure_diffs_sql_against_smaller_size(self):
+        small, large = QueryCapture(), QueryCapture()
+        small.queries = [("SELECT page", 2)]
+        large.queries = [("SELECT page", 51), *[("SELECT owner WHERE id = %s", 1)] * 2]
+        message = self.budget_failure("transaction_list", 120, large, (1, small))
+        self.assertIn("ran 3 queries (budget 5) fetching 53 rows (budget 54)", message)
+        self.assertIn("--- transaction_list @ 1 transactions", message)
+        self.assertIn("-SELECT page  -- 2 rows\n+SELECT page  -- 51 rows", message)
+        self.assertEqual(message.count("+SELECT owner WHERE id = %s  -- 1 rows"), 2)
+
+    def test_views_stay_within_budget(self):
+        previous = {}
+        for size in QUERY_BUDGET_SIZES:
+            kwargs = self.seed(size)
+            # Writes go last, as they supersede the report job
+            for name in sorted(QUERY_BUDGETS, key=lambda name: name in QUERY_BUDGET_POSTS):
+                budgets = QUERY_BUDGETS[name]
+                with self.subTest(view=name, size=size):
+                    capture = self.capture(name, kwargs)
+                    max_queries, max_rows = budgets[size]
+                    if len(capture.queries) > max_queries or capture.rows > max_rows:
+                        self.fail(self.budget_failure(name, size, capture, previous.get(name)))
+                    previous[name] = (size, capture)
+
+
+class DashboardEngineTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        rows = [
+            ("Salary", "Income", "2024-12-15", 2000),
+            ("Salary", "Income", "2025-01-15", 2000),
+            ("Food", "Expense", "2024-12-20", 150),
+            ("Food", "Expense", "2025-01-05", 50),
+            ("Rent", "Expense", "2025-01-01", 900),
+            ("Rent", "Expense", "2023-01-01", 900),  # Outside the trend window
+        ]
+        for category, transaction_type, date, amount in rows:
+            Transaction.objects.create(
+                user=self.user,
+                title=category,
+                amount=amount,
+                transaction_type=transaction_type,
+                category=category_for(self.user, category),
+                date=date,
+            )
+        Budget.objects.create(user=self.user, category=category_for(self.user, "Food"), amount=300, start_date="2025-01-01")
+
+    def test_dashboard_runs_in_constant_queries(self):
+        # Category split, monthly trend, budget total, recent transactions, recent budgets
+        with self.assertNumQueries(5):
+            context = get_dashboard_context(self.user, today=datetime.date(2025, 2, 1))
+        self.assertEqual(context["total_income"], 4000)
+        self.assertEqual(context["total_expenses"], 2000)
+        self.assertEqual(context["net_balance"], 2000)
+        self.assertEqual(context["total_budgets"], 300)
+        self.assertEqual(
+            context["expenses_by_category"],
+            [{"category": "Rent", "total": 1800}, {"category": "Food", "total": 200}],
+        )
+        self.assertEqual(context["income_by_category"], [{"category": "Salary", "total": 4000}])
+        self.assertEqual(len(context["recent_transactions"]), 5)
+
+    def test_monthly_trends_are_keyed_by_year_and_month(self):
+        context = get_dashboard_context(self.user, today=datetime.date(2025, 2, 1))
+        self.assertEqual(
+            context["monthly_expenses"],
+            [{"year": 2024, "month": 12, "total": 150}, {"year": 2025, "month": 1, "total": 950}],
+        )
+        self.assertEqual(
+            context["monthly_income"],
+            [{"year": 2024, "month": 12, "total": 2000}, {"year": 2025, "month": 1, "total": 2000}],
+        )
+
+    def test_landing_page_renders_dashboard(self):
+        self.client.login(username="testuser", password="testpass123")
+        response = self.client.get(reverse("landing_page"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["total_income"], 4000)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class DashboardCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.today = datetime.date(2025, 3, 15)
+        Transaction.objects.create(
+            user=self.user,
+            title="Pay",
+            amount=1000,
+            transaction_type="Income",
+            category=category_for(self.user, "Salary"),
+            date="2025-03-01",
+        )
+
+    def test_repeat_views_only_read_the_version(self):
+        first = get_cached_dashboard_context(self.user, self.today)
+        with self.assertNumQueries(1):
+            second = get_cached_dashboard_context(self.user, self.today)
+        self.assertEqual(second["total_income"], first["total_income"])
+
+    def test_writes_invalidate_the_cached_dashboard(self):
+        self.assertEqual(get_cached_dashboard_context(self.user, self.today)["total_income"], 1000)
+        Transaction.objects.create(
+            user=self.user,
+            title="Bonus",
+            amount=250,
+            transaction_type="Income",
+            category=category_for(self.user, "Salary"),
+            date="2025-03-02",
+        )
+        self.assertEqual(get_cached_dashboard_context(self.user, self.today)["total_income"], 1250)
+        Budget.objects.create(user=self.user, category=category_for(self.user, "Food"), amount=80, start_date="2025-03-01")
+        self.assertEqual(get_cached_dashboard_context(self.user, self.today)["total_budgets"], 80)
+
+    def test_entries_are_per_user_and_per_day(self):
+        other = User.objects.create_user(username="otheruser", password="testpass123")
+        get_cached_dashboard_context(self.user, self.today)
+        self.assertEqual(get_cached_dashboard_context(other, self.today)["total_income"], 0)
+        with self.assertNumQueries(6):  # Version lookup plus a fresh computation
+            get_cached_dashboard_context(self.user, self.today + datetime.timedelta(days=1))
+
+
+ASYNC_URLCONF = types.ModuleType("async_urls")
+ASYNC_URLCONF.urlpatterns = root_urls.async_urlpatterns + root_urls.urlpatterns
+
+
+# Committed data, since the async views read it from other connections
+@STUB_QUOTES
+@override_settings(ROOT_URLCONF=ASYNC_URLCONF)
+class AsyncViewTest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(concurrency.shutdown)
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        for title, amount, transaction_type, category in [
+            ("Pay", 1000, "Income", "Salary"),
+            ("Lunch", 12, "Expense", "Food"),
+        ]:
+            Transaction.objects.create(
+                user=self.user,
+                title=title,
+                amount=amount,
+                transaction_type=transaction_type,
+                category=category_for(self.user, category),
+                date=datetime.date.today(),
+            )
+        Budget.objects.create(user=self.user, category=category_for(self.user, "Food"), amount=100)
+        self.async_client = AsyncClient()
+        self.async_client.force_login(self.user)
+
+    def test_async_dashboard_matches_sync_dashboard(self):
+        expected = get_dashboard_context(self.user)
+        context = async_to_sync(aget_dashboard_context)(self.user)
+        for key in ["total_income", "total_expenses", "total_budgets", "expenses_by_category", "monthly_income"]:
+            self.assertEqual(context[key], expected[key])
+        self.assertEqual(context["recent_budgets"][0].spent, 12)
+
+    async def test_async_pages_render(self):
+        response = await self.async_client.get(reverse("landing_page"))
+        self.assertContains(response, "1000")
+        with mock.patch("transactions.views.get_quote", return_value="Keep going"):
+            response = await self.async_client.get(reverse("transaction_list"), {"transaction_type": "Expense"})
+        self.assertContains(response, "Keep going")
+        self.assertContains(response, "Lunch")
+        self.assertNotContains(response, "Pay</")
+        response = await self.async_client.get(reverse("budget_list"))
+        self.assertContains(response, "Food")
+
+    async def test_async_pages_answer_conditional_requests(self):
+        response = await self.async_client.get(reverse("budget_list"))
+        cached = await self.async_client.get(reverse("budget_list"), headers={"if-none-match": response["ETag"]})
+        self.assertEqual(cached.status_code, 304)
+        self.assertIn("no-cache", cached["Cache-Control"])
+
+    async def test_login_required(self):
+        response = await AsyncClient().get(reverse("transaction_list"))
+        self.assertEqual(response.status_code, 302)
+
+
+@STUB_QUOTES
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.add_transaction("Pay", 1000)
+        self.client.login(username="testuser", password="testpass123")
+
+    def add_transaction(self, title, amount):
+        Transaction.objects.create(
+            user=self.user,
+            title=title,
+            amount=amount,
+            transaction_type="Income",
+            category=category_for(self.user, "Salary"),
+            date="2025-03-01",
+        )
+
+    def test_unchanged_pages_answer_304_without_running_the_view(self):
+        for name in ["transaction_list", "budget_list", "landing_page"]:
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("no-cache", response["Cache-Control"])
+            with mock.patch("transactions.views.render") as render:
+                cached = self.client.get(reverse(name), HTTP_IF_NONE_MATCH=response["ETag"])
+            self.assertEqual(cached.status_code, 304)
+            render.assert_not_called()
+            by_date = self.client.get(reverse(name), HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+            self.assertEqual(by_date.status_code, 304)
+
+    def test_writes_change_the_validators(self):
+        etag = self.client.get(reverse("transaction_list"))["ETag"]
+        self.add_transaction("Bonus", 250)
+        response = self.client.get(reverse("transaction_list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_profile_changes_change_the_validators(self):
+        response = self.client.get(reverse("transaction_list"))
+        version = versioning.get_version(self.user)[0]
+        self.client.post(reverse("edit_profile"), {"username": "testuser", "email": "new@example.com"})
+        self.assertEqual(versioning.get_version(self.user)[0], version + 1)
+        revalidated = self.client.get(reverse("transaction_list"), HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(revalidated.status_code, 200)
+        # Logging in only updates last_login, which the ETag covers itself
+        self.client.login(username="testuser", password="testpass123")
+        self.assertEqual(versioning.get_version(self.user)[0], version + 1)
+
+    def test_validators_are_per_user_and_login(self):
+        etag = self.client.get(reverse("transaction_list"))["ETag"]
+        other = Client()
+        User.objects.create_user(username="otheruser", password="testpass123")
+        other.login(username="otheruser", password="testpass123")
+        self.assertEqual(other.get(reverse("transaction_list"), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.client.logout()
+        self.client.login(username="testuser", password="testpass123")
+        self.assertEqual(self.client.get(reverse("transaction_list"), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_pending_messages_force_a_full_render(self):
+        etag = self.client.get(reverse("budget_list"))["ETag"]
+        request = RequestFactory().get(reverse("budget_list"), HTTP_IF_NONE_MATCH=etag)
+        request.user = User.objects.get(pk=self.user.pk)  # With the new last_login
+        SessionMiddleware(lambda r: None).process_request(request)
+        MessageMiddleware(lambda r: None).process_request(request)
+        self.assertEqual(views.budget_list(request).status_code, 304)
+        request._messages.add(messages.INFO, "Saved.")
+        del request._data_validators
+        self.assertEqual(views.budget_list(request).status_code, 200)
+
+
+class SessionRefreshTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.client.login(username="testuser", password="testpass123")
+        self.client.get(reverse("budget_list"))
+
+    def session_writes(self, now):
+        with mock.patch("transactions.middleware.time.time", return_value=now):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse("budget_list"))
+        self.assertEqual(response.status_code, 200)
+        return [q["sql"] for q in queries if q["sql"].startswith("UPDATE") and "django_session" in q["sql"]]
+
+    def test_session_is_saved_at_most_once_per_interval(self):
+        session = Session.objects.get(pk=self.client.session.session_key)
+        start = self.client.session["_refreshed_at"]
+        self.assertEqual(self.session_writes(start + 10), [])
+        self.assertEqual(self.session_writes(start + 299), [])
+        self.assertEqual(len(self.session_writes(start + 300)), 1)
+        self.assertGreater(Session.objects.get(pk=session.pk).expire_date, session.expire_date)
+        self.assertEqual(self.session_writes(start + 310), [])
+
+    def test_anonymous_requests_do_not_create_sessions(self):
+        self.client.logout()
+        self.client.get(reverse("login"))
+        self.assertFalse(Session.objects.exists())
+
+
+class DatabaseConfigTest(TestCase):
+    def test_local_connections_are_persistent_with_health_checks(self):
+        config = database_config({})
+        self.assertEqual(config["ENGINE"], "finance_tracker.db")
+        self.assertEqual(config["NAME"], "personal_finance_tracker")
+        self.assertEqual(config["CONN_MAX_AGE"], 600)
+        self.assertTrue(config["CONN_HEALTH_CHECKS"])
+
+    def test_database_url_and_heroku_ssl(self):
+        config = database_config(
+            {"DYNO": "web.1", "DATABASE_URL": "postgres://u:p@db.example.com:5433/app", "DB_CONN_MAX_AGE": "60"}
+        )
+        self.assertEqual((config["HOST"], config["PORT"], config["NAME"]), ("db.example.com", 5433, "app"))
+        self.assertEqual(config["OPTIONS"]["sslmode"], "require")
+        self.assertEqual(config["CONN_MAX_AGE"], 60)
+
+    def test_pool_is_sized_to_gunicorn_threads(self):
+        config = database_config({"DB_POOL": "true", "GUNICORN_THREADS": "4"})
+        self.assertEqual(config["OPTIONS"]["pool"]["min_size"], 4)
+        self.assertEqual(config["OPTIONS"]["pool"]["max_size"], 5)
+        self.assertEqual(config["CONN_MAX_AGE"], 0)
+        self.assertEqual(pool_size({"GUNICORN_THREADS": "4", "DB_POOL_MAX_SIZE": "2"}), (2, 2))
+
+    def test_connect_time_is_recorded(self):
+        before = connect_stats.snapshot()["count"]
+        extra = connection.copy()
+        extra.ensure_connection()
+        extra.close()
+        stats = connect_stats.snapshot()
+        self.assertEqual(stats["count"], before + 1)
+        self.assertGreater(stats["max_seconds"], 0)
+
+
+class MetricsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.staff = User.objects.create_user(username="staff", password="testpass123", is_staff=True)
+        metrics.registry.clear()
+
+    def test_views_are_recorded_and_exposed_to_staff(self):
+        self.client.login(username="testuser", password="testpass123")
+        self.client.get(reverse("budget_list"))
+        self.client.get("/no-such-page/")
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+
+        self.client.login(username="staff", password="testpass123")
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], metrics.CONTENT_TYPE)
+        body = response.content.decode()
+        self.assertIn('finance_tracker_request_duration_seconds_count{view="budget_list"} 1', body)
+        self.assertIn('finance_tracker_request_duration_seconds_count{view="unmatched"} 1', body)
+        self.assertIn('finance_tracker_response_size_bytes_bucket{view="budget_list",le="+Inf"} 1', body)
+        self.assertIn("finance_tracker_db_connections_opened_total", body)
+
+    def test_query_counts_are_recorded(self):
+        self.client.login(username="testuser", password="testpass123")
+        self.client.get(reverse("budget_list"))
+        metrics.registry.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("budget_list"))
+        counts, total = metrics.registry._views["budget_list"].snapshot(1)
+        self.assertEqual(sum(counts), 1)
+        self.assertEqual(total, len(queries))
+
+
+@STUB_QUOTES
+class SyntheticDataTest(TestCase):
+    END_DATE = datetime.date(2025, 6, 30)
+
+    def rows(self, user_ids):
+        return list(
+            Transaction.objects.filter(user_id__in=user_ids)
+            .order_by("id")
+            .values_list("title", "amount", "transaction_type", "category__name", "date", "notes", "payment_method")
+        )
+
+    def test_seed_is_deterministic(self):
+        first = synthetic.seed(3, 500, seed=7, prefix="first", end_date=self.END_DATE, chunk_size=100)
+        second = synthetic.seed(3, 500, seed=7, prefix="second", end_date=self.END_DATE)
+        other = synthetic.seed(3, 500, seed=8, prefix="other", end_date=self.END_DATE)
+        self.assertEqual(first.transactions, 500)
+        self.assertEqual(first.budgets, 12)
+        self.assertEqual(self.rows(first.user_ids), self.rows(second.user_ids))
+        self.assertNotEqual(self.rows(first.user_ids), self.rows(other.user_ids))
+        self.assertEqual(rollups.verify(first.user_ids), [])
+        self.assertEqual(versioning.get_version(User(pk=first.user_ids[0]))[0], 1)
+
+    def test_seed_command_refuses_existing_prefix(self):
+        out = StringIO()
+        call_command("seed_synthetic", "--users", "2", "--transactions", "50", "--prefix", "load", stdout=out)
+        self.assertIn("Created 2 users, 50 transactions", out.getvalue())
+        self.assertTrue(User.objects.filter(username="load-000001").exists())
+        with self.assertRaises(CommandError):
+            call_command("seed_synthetic", "--users", "2", "--prefix", "load", stdout=StringIO())
+
+    def test_benchmark_writes_and_compares_baseline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = f"{directory}/baseline.json"
+            args = ["benchmark_views", "--sizes", "20,40", "--requests", "2"]
+            call_command(*args, "--output", baseline, stdout=StringIO())
+            with open(baseline) as f:
+                results = json.load(f)["results"]
+            self.assertEqual(set(results), {"20", "40"})
+            self.assertEqual(results["20"]["view:budget_list"]["runs"], 2)
+            self.assertEqual(results["20"]["query:report_pdf"]["runs"], 1)
+            self.assertFalse(User.objects.filter(username__startswith="bench-").exists())
+
+            out = StringIO()
+            call_command(*args, "--compare", baseline, "--tolerance", "1000", stdout=out)
+            self.assertIn("No regressions", out.getvalue())
+            results["20"]["view:budget_list"]["queries"] = 0
+            with open(baseline, "w") as f:
+                json.dump({"results": results}, f)
+            with self.assertRaisesMessage(CommandError, "1 benchmarks regressed"):
+                call_command(*args, "--compare", baseline, "--tolerance", "1000", stdout=StringIO())
+
+
+class MonthlyRollupTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.transaction = Transaction.objects.create(
+            user=self.user,
+            title="Groceries",
+            amount=40,
+            transaction_type="Expense",
+            category=category_for(self.user, "Food"),
+            date="2025-01-10",
+        )
+
+    def buckets(self):
+        return {
+            (r.year, r.month, r.transaction_type, r.category.name): (r.total, r.count)
+            for r in MonthlyRollup.objects.filter(user=self.user)
+        }
+
+    def test_create_and_delete_maintain_buckets(self):
+        Transaction.objects.create(
+            user=self.user, title="More", amount=10, transaction_type="Expense", category=category_for(self.user, "Food"), date="2025-01-20"
+        )
+        self.assertEqual(self.buckets(), {(2025, 1, "Expense", "Food"): (50, 2)})
+        self.transaction.delete()
+        self.assertEqual(self.buckets(), {(2025, 1, "Expense", "Food"): (10, 1)})
+        Transaction.objects.filter(user=self.user).delete()
+        self.assertEqual(self.buckets(), {})
+
+    def test_edit_moves_between_months_and_categories(self):
+        transaction = Transaction.objects.get(pk=self.transaction.pk)
+        transaction.date = datetime.date(2025, 3, 1)
+        transaction.category = category_for(self.user, "Dining")
+        transaction.amount = Decimal("45.50")
+        transaction.save()
+        self.assertEqual(self.buckets(), {(2025, 3, "Expense", "Dining"): (Decimal("45.50"), 1)})
+        transaction.transaction_type = "Income"
+        transaction.save()
+        self.assertEqual(self.buckets(), {(2025, 3, "Income", "Dining"): (Decimal("45.50"), 1)})
+
+    def test_title_only_edit_skips_rollup_write(self):
+        transaction = Transaction.objects.get(pk=self.transaction.pk)
+        transaction.title = "Weekly shop"
+        # Savepoint, UPDATE, data version bump, release: no rollup upsert
+        with self.assertNumQueries(4):
+            transaction.save()
+
+    def test_rebuild_and_verify_command(self):
+        MonthlyRollup.objects.filter(user=self.user).update(total=999)
+        self.assertEqual(len(rollups.verify()), 1)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_rollups", "--verify", stdout=StringIO(), stderr=StringIO())
+        call_command("rebuild_rollups", "--user", "testuser", stdout=StringIO())
+        self.assertEqual(rollups.verify(), [])
+        self.assertEqual(self.buckets(), {(2025, 1, "Expense", "Food"): (40, 1)})
+
+    def test_deleting_user_removes_rollups(self):
+        self.user.delete()
+        self.assertFalse(MonthlyRollup.objects.exists())
+
+    def test_report_totals_come_from_rollups(self):
+        self.assertEqual(rollups.totals_for_user(self.user), (0, 40))
+
+
+class ReportGenerationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        food = category_for(self.user, "Food")
+        Transaction.objects.bulk_create(
+            Transaction(
+                user=self.user,
+                title=f"Row {i}",
+                amount=10,
+                transaction_type="Expense",
+                category=food,
+                date=datetime.date(2025, 1, 1) + datetime.timedelta(days=i),
+            )
+            for i in range(95)
+        )
+        rollups.rebuild([self.user.id])
+        Budget.objects.create(user=self.user, category=category_for(self.user, "Food"), amount=500, start_date="2025-01-01")
+
+    def test_report_streams_rows_in_page_sized_tables(self):
+        flowables = list(reports._report_flowables(self.user, datetime.date(2025, 6, 1)))
+        tables = [f for f in flowables if isinstance(f, reports.LongTable)]
+        # Summary, three transaction chunks (40 + 40 + 15) and one budget table
+        self.assertEqual([len(t._cellvalues) for t in tables], [5, 41, 41, 16, 2])
+        self.assertTrue(all(t.repeatRows == 1 for t in tables))
+
+    def test_report_query_count_does_not_grow_with_rows(self):
+        # Rollup totals, budget total, transaction rows, budget rows
+        with self.assertNumQueries(4):
+            reports.build_financial_report(self.user, BytesIO())
+
+    def test_flowable_stream_buffers_lazily(self):
+        produced = []
+
+        def source():
+            for i in range(10):
+                produced.append(i)
+                yield i
+
+        stream = reports.FlowableStream(source())
+        self.assertEqual(produced, [0, 1])
+        del stream[0]
+        self.assertEqual(stream[0], 1)
+        self.assertEqual(produced, [0, 1, 2])
+
+
+class ReportJobTest(TestCase):
+    def setUp(self):
+        self.reports_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.reports_root, ignore_errors=True)
+        settings = self.settings(REPORTS_ROOT=self.reports_root, REPORT_JOBS_INLINE=False)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.other_user = User.objects.create_user(username="otheruser", password="testpass123")
+        Transaction.objects.create(
+            user=self.user, title="Pay", amount=100, transaction_type="Income", category=category_for(self.user, "Salary"), date="2025-01-01"
+        )
+        self.client.login(username="testuser", password="testpass123")
+
+    def download(self):
+        return self.client.get(reverse("download_report"))
+
+    def test_report_is_queued_then_served_from_cache(self):
+        response = self.download()
+        job = ReportJob.objects.get(user=self.user)
+        self.assertRedirects(response, reverse("report_status", args=[job.id]))
+        self.assertEqual(job.status, ReportJob.PENDING)
+        self.assertEqual(self.client.get(reverse("report_status", args=[job.id]), {"format": "json"}).json()["status"], "pending")
+
+        job = report_jobs.render_job(report_jobs.claim_next_job())
+        self.assertEqual(job.status, ReportJob.DONE)
+        self.assertIsNone(report_jobs.claim_next_job())
+
+        with mock.patch("transactions.report_jobs.build_financial_report") as build:
+            response = self.download()
+        build.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"%PDF"))
+        with mock.patch("transactions.report_jobs.current_job") as current_job:
+            revalidated = self.client.get(reverse("download_report"), HTTP_IF_NONE_MATCH=response["ETag"])
+        current_job.assert_not_called()
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_data_change_invalidates_cached_report(self):
+        self.download()
+        old_job = report_jobs.render_job(report_jobs.claim_next_job())
+        Budget.objects.create(user=self.user, category=category_for(self.user, "Food"), amount=200, start_date="2025-01-01")
+        response = self.download()
+        new_job = ReportJob.objects.get(user=self.user, status=ReportJob.PENDING)
+        self.assertRedirects(response, reverse("report_status", args=[new_job.id]))
+        self.assertGreater(new_job.data_version, old_job.data_version)
+        report_jobs.render_job(report_jobs.claim_next_job())
+        # The superseded artifact and job are cleaned up
+        self.assertFalse(ReportJob.objects.filter(pk=old_job.pk).exists())
+        self.assertFalse(report_jobs.artifact_path(self.user.id, old_job.data_version).exists())
+
+    def test_jobs_are_private(self):
+        self.download()
+        job = report_jobs.render_job(report_jobs.claim_next_job())
+        self.client.login(username="otheruser", password="testpass123")
+        self.assertEqual(self.client.get(reverse("report_status", args=[job.id])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("report_file", args=[job.id])).status_code, 404)
+
+    def test_removed_file_is_not_found(self):
+        self.download()
+        job = report_jobs.render_job(report_jobs.claim_next_job())
+        # E.g. removed as superseded by another request's job
+        report_jobs.artifact_path(self.user.id, job.data_version).unlink()
+        self.assertEqual(self.client.get(reverse("report_file", args=[job.id])).status_code, 404)
+
+    def test_pending_redirect_carries_no_validators(self):
+        response = self.download()
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(response.has_header("ETag"))
+        self.assertFalse(response.has_header("Last-Modified"))
+        self.assertIn("no-store", response["Cache-Control"])
+
+        # Nothing to revalidate, so the finished report is served in full
+        report_jobs.render_job(report_jobs.claim_next_job())
+        response = self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        b"".join(response.streaming_content)
+        revalidated = self.client.get(reverse("download_report"), HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_inline_mode_and_worker_command(self):
+        with self.settings(REPORT_JOBS_INLINE=True):
+            self.assertEqual(self.download().status_code, 200)
+        Transaction.objects.create(
+            user=self.user, title="Rent", amount=50, transaction_type="Expense", category=category_for(self.user, "Rent"), date="2025-01-02"
+        )
+        report_jobs.current_job(self.user)
+        call_command("run_report_worker", "--once", stdout=StringIO())
+        self.assertEqual(ReportJob.objects.get(user=self.user).status, ReportJob.DONE)
+
+    def test_writes_bump_data_version(self):
+        version, _ = versioning.get_version(self.user)
+        transaction = Transaction.objects.get(user=self.user)
+        transaction.title = "Salary"
+        transaction.save()
+        transaction.delete()
+        self.assertEqual(versioning.get_version(self.user)[0], version + 2)
+        self.assertEqual(versioning.get_version(self.other_user), (0, None))
+
+
+class StreamingExportTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        other = User.objects.create_user(username="otheruser", password="testpass123")
+        for title, amount, transaction_type, category, date in [
+            ("Salary", 2000, "Income", "Salary", "2025-01-31"),
+            ("Lunch", 12, "Expense", "Food", "2025-01-10"),
+            ("Dinner", 30, "Expense", "Food", "2025-02-10"),
+        ]:
+            Transaction.objects.create(
+                user=self.user,
+                title=title,
+                amount=amount,
+                transaction_type=transaction_type,
+                category=category_for(self.user, category),
+                date=date,
+            )
+        Transaction.objects.create(
+            user=other, title="Hidden", amount=5, transaction_type="Expense", category=category_for(other, "Food"), date="2025-01-01"
+        )
+        Budget.objects.create(user=self.user, category=category_for(self.user, "Food"), amount=300, start_date="2025-01-01")
+        self.client.login(username="testuser", password="testpass123")
+
+    def export(self, **params):
+        response = self.client.get(reverse("export_transactions"), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_export_honors_filters_and_sort(self):
+        rows = list(csv.DictReader(StringIO(self.export(transaction_type="Expense", sort_by="amount_desc"))))
+        self.assertEqual([row["title"] for row in rows], ["Dinner", "Lunch"])
+        self.assertEqual(rows[0]["amount"], "30.00")
+
+    def test_jsonl_export(self):
+        lines = self.export(format="jsonl", start_date="2025-01-15").splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual([r["title"] for r in records], ["Dinner", "Salary"])
+        self.assertEqual(records[0]["date"], "2025-02-10")
+
+    def test_budget_export_and_bad_format(self):
+        response = self.client.get(reverse("export_budgets"))
+        self.assertIn("Food,300.00,2025-01-01", b"".join(response.streaming_content).decode())
+        self.assertEqual(self.client.get(reverse("export_transactions"), {"format": "xml"}).status_code, 400)
+
+
+
+class ApiTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+        self.other = User.objects.create_user(username="otheruser", password="testpass123")
+        for day in range(1, 6):
+            Transaction.objects.create(
+                user=self.user,
+                title=f"Lunch {day}",
+                amount=10 * day,
+                transaction_type="Expense",
+                category=category_for(self.user, "Food"),
+                date=f"2025-03-0{day}",
+            )
+        Transaction.objects.create(
+            user=self.user, title="Pay", amount=1000, transaction_type="Income", category=category_for(self.user, "Salary"), date="2025-03-01"
+        )
+        self.hidden = Transaction.objects.create(
+            user=self.other, title="Hidden", amount=5, transaction_type="Expense", category=category_for(self.other, "Food"), date="2025-03-01"
+        )
+        self.client.login(username="testuser", password="testpass123")
+
+    def test_requires_authentication(self):
+        self.client.logout()
+        self.assertEqual(self.client.get("/api/v1/transactions/").status_code, 403)
+
+    def test_cursor_pagination_walks_every_row_once(self):
+        url, titles = "/api/v1/transactions/?page_size=4", []
+        while url:
+            body = self.client.get(url).json()
+            titles += [row["title"] for row in body["results"]]
+            url = body["next"]
+        self.assertEqual(len(titles), 6)
+        self.assertEqual(titles[0], "Lunch 5")
+        self.assertNotIn("Hidden", titles)
+
+    def test_filters_and_sparse_fields(self):
+        self.client.get("/api/v1/transactions/")  # First request after login saves the session
+        with self.assertNumQueries(3):  # Session, user and one page query
+            body = self.client.get(
+                "/api/v1/transactions/",
+                {"category": "food", "sort_by": "amount_desc", "fields": "title,category"},
+            ).json()
+        self.assertEqual(body["results"][0], {"title": "Lunch 5", "category": "Food"})
+        self.assertEqual(len(body["results"]), 5)
+        self.assertEqual(self.client.get("/api/v1/transactions/", {"fields": "title,secret"}).status_code, 400)
+
+    def test_other_users_rows_are_not_found(self):
+        self.assertEqual(self.client.get(f"/api/v1/transactions/{self.hidden.pk}/").status_code, 404)
+        self.assertEqual(self.client.delete(f"/api/v1/transactions/{self.hidden.pk}/").status_code, 404)
+
+    def test_superuser_cannot_reach_other_users_rows(self):
+        User.objects.create_superuser(username="admin", password="adminpass123", email="admin@example.com")
+        self.client.login(username="admin", password="adminpass123")
+        url = f"/api/v1/transactions/{self.hidden.pk}/"
+        self.assertEqual(self.client.get(url).status_code, 404)
+        change = {"title": "Taken", "amount": "5.00", "transaction_type": "Expense", "category": "Admin", "date": "2025-03-01"}
+        self.assertEqual(self.client.put(url, change, content_type="application/json").status_code, 404)
+        self.assertEqual(self.client.delete(url).status_code, 404)
+        self.hidden.refresh_from_db()
+        self.assertEqual((self.hidden.title, self.hidden.category.user), ("Hidden", self.other))
+
+    def test_create_transaction_resolves_category(self):
+        response = self.client.post(
+            "/api/v1/transactions/",
+            {"title": "Bus", "amount": "2.50", "transaction_type": "Expense", "category": " FOOD ", "date": "2025-03-07"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["category"], "Food")
+        self.assertEqual(Category.objects.filter(user=self.user).count(), 2)
+        invalid = self.client.post(
+            "/api/v1/transactions/",
+            {"title": "Bus", "amount": "0", "transaction_type": "Expense", "category": "Food"},
+            content_type="application/json",
+        )
+        self.assertEqual(invalid.status_code, 400)
+
+    def test_budgets_include_utilization(self):
+        response = self.client.post(
+            "/api/v1/budgets/",
+            {"category": "Food", "amount": "200", "start_date": "2025-03-01", "end_date": "2025-03-31"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["spent"], "150.00")
+        body = self.client.get("/api/v1/budgets/", {"fields": "category,amount"}).json()
+        self.assertEqual(body["results"], [{"category": "Food", "amount": "200.00"}])
+
+
+SAMPLE_CSV = b"""\xef\xbb\xbfDate,Title,Amount,Category
+2025-03-01,Paycheck,2500.00,Salary
+2025-03-02,Groceries,-84.20,Food
+2025-03-03,Coffee,-4.5,
+not-a-date,Broken,10,Food
+2025-03-04,,12,Food
+2025-03-05,Refund,abc,Food
+"""
+
+SAMPLE_OFX = b"""OFXHEADER:100
+DATA:OFXSGML
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20250310120000[-5:EST]
+<TRNAMT>-42.10
+<NAME>Gas Station
+<MEMO>Fuel
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20250315
+<TRNAMT>1000.00
+<NAME>Employer
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+class TransactionImportTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="testpass123")
+
+    def test_csv_import_reports_bad_rows(self):
+        result = importer.import_file(self.user, BytesIO(SAMPLE_CSV), "csv", batch_size=2)
+        self.assertEqual(result.created, 3)
+        self.assertEqual([error.line for error in result.errors], [5, 6, 7])
+
+        groceries = Transaction.objects.get(user=self.user, title="Groceries")
+        self.assertEqual(groceries.transaction_type, "Expense")
+        self.assertEqual(groceries.amount, Decimal("84.20"))
+        self.assertEqual(Transaction.objects.get(title="Coffee").category.name, "Uncategorized")
+        self.assertEqual(rollups.verify([self.user.pk]), [])
+        self.assertEqual(versioning.get_version(self.user)[0], 1)
+
+    def test_ofx_import(self):
+        result = importer.import_file(self.user, BytesIO(SAMPLE_OFX), "ofx")
+        self.assertEqual((result.created, result.errors), (2, []))
+        gas = Transaction.objects.get(user=self.user, title="Gas Station")
+        self.assertEqual((gas.date, gas.amount, gas.notes), (datetime.date(2025, 3, 10), Decimal("42.10"), "Fuel"))
+        self.assertEqual(Transaction.objects.get(title="Employer").transaction_type, "Income")
+
+    def test_batches_use_bulk_inserts(self):
+        rows = "".join(f"2025-01-{day:02d},Row {day},-{day},Food\n" for day in range(1, 29))
+        data = ("date,title,amount,category\n" + rows).encode()
+        category_for(self.user, "Food")
+        # One category lookup; per batch: savepoint, insert, rollup upsert and
+        # release; plus one version bump
+        with self.assertNumQueries(1 + 4 * 3 + 1):
+            result = importer.import_file(self.user, BytesIO(data), "csv", batch_size=10)
+        self.assertEqual(result.created, 28)
+
+    def test_import_command(self):
+        with tempfile.NamedTemporaryFile(suffix=".ofx") as statement:
+            statement.write(SAMPLE_OFX)
+            statement.flush()
+            out = StringIO()
+            call_command("import_transactions", statement.name, "--user", "testuser", stdout=out)
+        self.assertIn("Imported 2 transactions", out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("import_transactions", statement.name, "--user", "nobody")
+
+    def test_undecodable_file_keeps_committed_batches_visible(self):
+        rows = "".join(f"2025-01-{day:02d},Row {day},-{day}\n" for day in range(1, 6))
+        data = ("date,title,amount\n" + rows).encode() + b"2025-01-06,Caf\xe9,-3\n"
+        with self.assertRaises(importer.ImportFileError) as raised:
+            importer.import_file(self.user, BytesIO(data), "csv", batch_size=2)
+        self.assertEqual(raised.exception.result.created, 4)
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 4)
+        self.assertEqual(versioning.get_version(self.user)[0], 1)
+
+        self.client.login(username="testuser", password="testpass123")
+        upload = SimpleUploadedFile("statement.csv", data, content_type="text/csv")
+        response = self.client.post(reverse("import_transactions"), {"file": upload})
+        self.assertContains(response, "The file is not UTF-8 text.")
+        with tempfile.NamedTemporaryFile(suffix=".csv") as statement:
+            statement.write(data)
+            statement.flush()
+            with self.assertRaisesMessage(CommandError, "not UTF-8"):
+                call_command("import_transactions", statement.name, "--user", "testuser", stdout=StringIO())
+
+    def test_upload_view(self):
+        self.client.login(username="testuser", password="testpass123")
+        upload = SimpleUploadedFile("statement.csv", SAMPLE_CSV, content_type="text/csv")
+        response = self.client.post(reverse("import_transactions"), {"file": upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Imported 3 transactions")
+        self.assertContains(response, "Invalid amount")
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 3)
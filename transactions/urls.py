@@ -7,6 +7,18 @@ urlpatterns = [
         "transactions/", views.transaction_list, name="transaction_list"
     ),  # Transaction list at /transactions/transactions/
     path("transactions/add/", views.add_transaction, name="add_transaction"),
+    path(
+        "transactions/bulk/", views.bulk_transactions, name="bulk_transactions"
+    ),  # Bulk actions on the transactions selected in the list
+    path(
+        "transactions/search/", views.search_transactions, name="search_transactions"
+    ),  # Ranked full-text search
+    path(
+        "transactions/import/", views.import_transactions, name="import_transactions"
+    ),  # Bulk import of CSV/OFX bank statements
+    path(
+        "transactions/export/", views.export_transactions, name="export_transactions"
+    ),  # Streaming CSV/JSON-lines export honoring the list filters
     path(
         "transactions/<int:transaction_id>/edit/",
         views.edit_transaction,
@@ -20,6 +32,7 @@ urlpatterns = [
     path("budgets/", views.budget_list, name="budget_list"),
     # Budget list at /budgets/
     path("budgets/add/", views.add_budget, name="add_budget"),
+    path("budgets/export/", views.export_budgets, name="export_budgets"),
     # Add budget at /budgets/add/
     path("budgets/<int:budget_id>/edit/", views.edit_budget, name="edit_budget"),
     # Edit budget at /budgets/<id>/edit/
@@ -29,4 +42,8 @@ urlpatterns = [
     path("edit_profile/", views.EditProfileView.as_view(), name="edit_profile"),
     # Add edit_profile route
     path("download_report/", views.download_report, name="download_report"),
+    path("reports/<int:job_id>/", views.report_status, name="report_status"),
+    path(
+        "reports/<int:job_id>/download/", views.report_file, name="report_file"
+    ),  # Cached PDF artifact for a finished report job
 ]
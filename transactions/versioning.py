@@ -0,0 +1,47 @@
+"""Per-user data versions.
+
+Every Transaction or Budget write, and every profile change, bumps the
+owner's DataVersion, giving derived artifacts a cheap fingerprint to key on.
+"""
+
+from django.db import connection
+from django.utils import timezone
+
+from .models import DataVersion
+
+
+def bump(user_ids):
+    """Increment the data version of each user in ``user_ids`` with one upsert."""
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return
+    table = connection.ops.quote_name(DataVersion._meta.db_table)
+    now = timezone.now()
+    placeholders = ", ".join(["(%s, 1, %s)"] * len(user_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (user_id, version, updated_at) VALUES {placeholders} "
+            f"ON CONFLICT (user_id) DO UPDATE SET "
+            f"version = {table}.version + 1, updated_at = EXCLUDED.updated_at",
+            [value for user_id in user_ids for value in (user_id, now)],
+        )
+
+
+def get_version(user):
+    """Return the user's current (version, updated_at); (0, None) before any write."""
+    row = (
+        DataVersion.objects.filter(user_id=user.pk)
+        .values_list("version", "updated_at")
+        .first()
+    )
+    return row or (0, None)
+
+
+async def aget_version(user):
+    """Async ``get_version``."""
+    row = await (
+        DataVersion.objects.filter(user_id=user.pk)
+        .values_list("version", "updated_at")
+        .afirst()
+    )
+    return row or (0, None)
@@ -1,60 +1,107 @@
-import datetime
 import logging
+from urllib.parse import urlencode
 
-import requests
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import User
-from django.db.models import Sum
-from django.http import HttpResponse, HttpResponseForbidden
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseForbidden,
+    JsonResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_POST
 from django.views.generic.edit import CreateView, UpdateView
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
 
+from . import bulk, importer, metrics, report_jobs, search
+from .conditional import user_data_condition
 from .forms import CustomUserEditForm  # Import the new form
-from .forms import BudgetForm, TransactionForm
-from .models import Budget, Transaction
+from .concurrency import gather_queries
+from .dashboard import aget_cached_dashboard_context, get_cached_dashboard_context
+from .exports import BUDGET_EXPORT_FIELDS, TRANSACTION_EXPORT_FIELDS, export_response
+from .filters import filter_transactions
+from .forms import (
+    BudgetForm,
+    TransactionBulkForm,
+    TransactionForm,
+    TransactionImportForm,
+)
+from .models import Budget, ReportJob, Transaction
+from .pagination import KeysetPaginator, ordering_for
+from .quotes import get_quote
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+TRANSACTIONS_PER_PAGE = 50
+MAX_IMPORT_ERRORS_SHOWN = 100
+SEARCH_RESULTS_LIMIT = 50
+BULK_DELETE_EXAMPLES = 10  # Selected rows listed on the bulk delete confirmation
 
-def user_owns_object(user, obj):
-    """Check if the user owns the object or is a superuser.
+
+def _page_url(request, cursor):
+    """Build the query string for a pagination link, keeping the current filters."""
+    if cursor is None:
+        return None
+    params = request.GET.copy()
+    params["cursor"] = cursor
+    return f"?{params.urlencode()}"
+
+
+def get_owned_object(request, queryset, object_id, action):
+    """Fetch an object the user may ``action``, checking ownership in the same query.
+
+    The lookup is scoped with ``for_user``, so owners (and superusers) get
+    their object from a single query. Only when it finds nothing does a
+    second query tell a missing object from someone else's.
 
     Args:
-        user: The Django User instance checking ownership.
-        obj: The object (Transaction or Budget) to check ownership for.
+        request: The HTTP request object.
+        queryset: Transactions or budgets to look the object up in.
+        object_id: The ID of the object.
+        action: The verb used in the permission error, e.g. "edit".
 
     Returns:
-        bool: True if the user is the owner or a superuser, False otherwise.
+        tuple: The object and None, or None and an HttpResponseForbidden.
+
+    Raises:
+        Http404: If no object has this ID.
     """
-    if obj is None:
-        logger.error("Object is None in user_owns_object")
-        return False
-    owner = getattr(obj, "user", None)
+    obj = queryset.for_user(request.user).filter(id=object_id).first()
+    if obj is not None:
+        return obj, None
+    owner = (
+        queryset.model.objects.filter(id=object_id)
+        .values_list("user__username", flat=True)
+        .first()
+    )
+    name = queryset.model._meta.verbose_name
     if owner is None:
-        logger.error(f"No user associated with object: {obj}")
-        return False
-    result = user.is_superuser or owner == user
-    logger.debug(
-        f"Checking ownership: User {
-            user.username}, Object user {
-            owner.username if owner else 'None'}, "
-        f"Object type {
-                type(obj).__name__}, Object ID {
-                    obj.id if obj.id else 'None'}, Result {result}"
+        raise Http404(f"No {name} matches the given query.")
+    logger.error(
+        "Permission denied: User %s tried to %s %s %d owned by %s",
+        request.user.username,
+        action,
+        name,
+        object_id,
+        owner,
+    )
+    return None, HttpResponseForbidden(
+        f"You do not have permission to {action} this {name}."
     )
-    return result
 
 
 @login_required
+@user_data_condition(daily=True)
 def landing_page(request):
     """Render the financial dashboard for the authenticated user.
 
@@ -71,116 +118,71 @@ def landing_page(request):
     )
 
     try:
-        # Retrieve transactions for the logged-in user
-        transactions = Transaction.objects.filter(user=request.user)
-
-        # Calculate financial summary
-        total_income = (
-            transactions.filter(transaction_type="Income").aggregate(Sum("amount"))[
-                "amount__sum"
-            ]
-            or 0
-        )
-        total_expenses = (
-            transactions.filter(transaction_type="Expense").aggregate(Sum("amount"))[
-                "amount__sum"
-            ]
-            or 0
-        )
-        net_balance = total_income - total_expenses
-        total_budgets = (
-            Budget.objects.filter(user=request.user).aggregate(Sum("amount"))[
-                "amount__sum"
-            ]
-            or 0
+        return render(
+            request,
+            "transactions/landing.html",
+            get_cached_dashboard_context(request.user),
         )
 
-        # Calculate monthly trends (last 6 months)
-        today = datetime.date.today()
-        six_months_ago = today - datetime.timedelta(days=180)
-        monthly_income = (
-            transactions.filter(transaction_type="Income", date__gte=six_months_ago)
-            .values("date__month")
-            .annotate(total=Sum("amount"))
-            .order_by("date__month")
-        )
+    except Exception as e:
+        logger.error(f"Error in landing_page: {str(e)}")
+        return _dashboard_error_response(request)
 
-        monthly_expenses = (
-            transactions.filter(transaction_type="Expense", date__gte=six_months_ago)
-            .values("date__month")
-            .annotate(total=Sum("amount"))
-            .order_by("date__month")
-        )
 
-        # Get income/expense by category (for pie charts)
-        income_by_category = (
-            transactions.filter(transaction_type="Income")
-            .values("category")
-            .annotate(total=Sum("amount"))
-            .order_by("-total")
-        )
-        expenses_by_category = (
-            transactions.filter(transaction_type="Expense")
-            .values("category")
-            .annotate(total=Sum("amount"))
-            .order_by("-total")
-        )
+def _dashboard_error_response(request):
+    response = render(
+        request,
+        "transactions/landing.html",
+        {
+            "error_message": "An error occurred while loading your dashboard.",
+            "total_income": 0,
+            "total_expenses": 0,
+            "net_balance": 0,
+            "total_budgets": 0,
+            "monthly_income": [],
+            "monthly_expenses": [],
+            "income_by_category": [],
+            "expenses_by_category": [],
+            "recent_transactions": [],
+            "recent_budgets": [],
+        },
+    )
+    # Never revalidate an error page against the data's ETag
+    patch_cache_control(response, no_store=True)
+    return response
 
-        # Get recent transactions and budgets (last 5)
-        recent_transactions = (
-            transactions.order_by("-date")[:5] if transactions.exists() else []
-        )
-        recent_budgets = (
-            Budget.objects.filter(user=request.user).order_by("-start_date")[:5]
-            if Budget.objects.filter(user=request.user).exists()
-            else []
-        )
 
-        return render(
-            request,
-            "transactions/landing.html",
-            {
-                "total_income": total_income,
-                "total_expenses": total_expenses,
-                "net_balance": net_balance,
-                "total_budgets": total_budgets,
-                "monthly_income": list(monthly_income),
-                "monthly_expenses": list(monthly_expenses),
-                "income_by_category": list(income_by_category),
-                "expenses_by_category": list(expenses_by_category),
-                "recent_transactions": recent_transactions,
-                "recent_budgets": recent_budgets,
-            },
-        )
+@login_required
+@user_data_condition(daily=True)
+async def landing_page_async(request):
+    """Async ``landing_page``, served when ``ASYNC_VIEWS`` is on.
+
+    The dashboard queries run concurrently on separate connections.
+
+    Args:
+        request: The HTTP request object.
 
+    Returns:
+        HttpResponse: Rendered HTML response with financial data or error message if an exception occurs.
+    """
+    user = await request.auser()
+    try:
+        context = await aget_cached_dashboard_context(user)
     except Exception as e:
-        logger.error(f"Error in landing_page: {str(e)}")
-        return render(
-            request,
-            "transactions/landing.html",
-            {
-                "error_message": "An error occurred while loading your dashboard.",
-                "total_income": 0,
-                "total_expenses": 0,
-                "net_balance": 0,
-                "total_budgets": 0,
-                "monthly_income": [],
-                "monthly_expenses": [],
-                "income_by_category": [],
-                "expenses_by_category": [],
-                "recent_transactions": [],
-                "recent_budgets": [],
-            },
-        )
+        logger.error(f"Error in landing_page_async: {str(e)}")
+        return await sync_to_async(_dashboard_error_response)(request)
+    return await sync_to_async(render)(request, "transactions/landing.html", context)
 
 
 @login_required
+@user_data_condition()
 def transaction_list(request):
     """Display a list of transactions for the authenticated
     user with filtering and sorting options.
 
     Supports filtering by transaction type, category,
-    date range, and sorting by date or amount.
+    date range, and sorting by date or amount. Results are paginated
+    with keyset cursors so deep pages cost the same as the first.
 
     Args:
         request: The HTTP request object.
@@ -189,81 +191,196 @@ def transaction_list(request):
         HttpResponse: Rendered HTML response with transaction list
         and filtering options, or redirect if unauthenticated.
     """
-    transactions = Transaction.objects.filter(user=request.user)
-
-    # Get filtering parameters from request
-    transaction_type = request.GET.get("transaction_type")
-    category = request.GET.get("category")
-    start_date = request.GET.get("start_date")
-    end_date = request.GET.get("end_date")
-    sort_by = request.GET.get("sort_by")
-
-    # Apply filters
-    if transaction_type in ["Income", "Expense"]:
-        transactions = transactions.filter(transaction_type=transaction_type)
-
-    if category:
-        transactions = transactions.filter(category__icontains=category)
-
-    if start_date:
-        transactions = transactions.filter(date__gte=start_date)
-
-    if end_date:
-        transactions = transactions.filter(date__lte=end_date)
-
-    # Apply sorting
-    if sort_by == "date_desc":
-        transactions = transactions.order_by("-date")
-    elif sort_by == "date_asc":
-        transactions = transactions.order_by("date")
-    elif sort_by == "amount_desc":
-        transactions = transactions.order_by("-amount")
-    elif sort_by == "amount_asc":
-        transactions = transactions.order_by("amount")
-
-    # Fetch a motivational quote with fallback, bypassing SSL locally for
-    # testing
-    quote = "Failed to load quote. Check your internet connection."
-    try:
-        # Try Quotable API first (motivational) with SSL bypass for local
-        # testing
-        response = requests.get(
-            "https://api.quotable.io/random?tags=motivational", timeout=5, verify=False
-        )  # Temporary local bypass
-        logger.debug(
-            f"Quotable API response status: {
-                response.status_code}, JSON: {
-                response.json()}"
-        )
-        if response.status_code == 200:
-            quote_data = response.json()
-            quote = f'"{quote_data["content"]}" — {quote_data["author"]}'
-        else:
-            # Fallback to Kanye API if Quotable fails
-            response = requests.get("https://api.kanye.rest/", timeout=5)
-            logger.debug(
-                f"Kanye API response status: {
-                    response.status_code}, JSON: {
-                    response.json()}"
-            )
-            if response.status_code == 200:
-                quote_data = response.json()
-                quote = f'"{quote_data["quote"]}" — Kanye West'
-    except requests.RequestException as e:
-        logger.error(f"Failed to fetch quote: {e}")
+    # Apply filters from the request
+    transactions, filters = filter_transactions(
+        Transaction.objects.filter(user=request.user).select_related("category"),
+        request.GET,
+    )
+
+    # Keyset pagination ordered by the selected sort, with id as tiebreaker
+    page = KeysetPaginator(
+        transactions, sort_by=filters["sort_by"], page_size=TRANSACTIONS_PER_PAGE
+    ).page(request.GET.get("cursor"))
+
+    # Served from the shared cache; refreshed in the background
+    quote = get_quote()
 
     return render(
         request,
         "transactions/transaction_list.html",
-        {
-            "transactions": transactions,
-            "transaction_type": transaction_type,
-            "category": category,
-            "start_date": start_date,
-            "end_date": end_date,
-            "sort_by": sort_by,
-            "quote": quote,
-        },
+        _transaction_list_context(request, page, filters, quote),
+    )
+
+
+def _transaction_list_context(request, page, filters, quote):
+    return {
+        "transactions": page.object_list,
+        "bulk_form": TransactionBulkForm(),
+        "page": page,
+        "next_url": _page_url(request, page.next_cursor),
+        "prev_url": _page_url(request, page.prev_cursor),
+        "export_query": urlencode({k: v for k, v in filters.items() if v}),
+        **filters,
+        "quote": quote,
+    }
+
+
+@login_required
+@user_data_condition()
+async def transaction_list_async(request):
+    """Async ``transaction_list``, served when ``ASYNC_VIEWS`` is on.
+
+    The page query and the quote lookup run concurrently.
+
+    Args:
+        request: The HTTP request object.
+
+    Returns:
+        HttpResponse: Rendered HTML response with transaction list
+        and filtering options, or redirect if unauthenticated.
+    """
+    user = await request.auser()
+    transactions, filters = filter_transactions(
+        Transaction.objects.filter(user=user).select_related("category"),
+        request.GET,
+    )
+    paginator = KeysetPaginator(
+        transactions, sort_by=filters["sort_by"], page_size=TRANSACTIONS_PER_PAGE
+    )
+    page, quote = await gather_queries(
+        (paginator.page, request.GET.get("cursor")), (get_quote,)
+    )
+    return await sync_to_async(render)(
+        request,
+        "transactions/transaction_list.html",
+        _transaction_list_context(request, page, filters, quote),
+    )
+
+
+@login_required
+@require_POST
+def bulk_transactions(request):
+    """Apply one action to the transactions selected on the transaction list.
+
+    Each action is a single UPDATE or DELETE over the user's own selected
+    rows (see ``bulk``), whatever the number of rows.
+
+    Args:
+        request: The HTTP request object. ``query`` holds the list's query
+            string, so the user returns to the same filters and page.
+
+    Returns:
+        HttpResponse: A confirmation page before deleting, otherwise a
+        redirect back to the transaction list with a message.
+    """
+    form = TransactionBulkForm(request.POST)
+    query = request.POST.get("query", "")
+    if form.is_valid():
+        action = form.cleaned_data["action"]
+        ids = form.cleaned_data["ids"]
+        if action == "delete" and not form.cleaned_data["confirmed"]:
+            selected = Transaction.objects.filter(user=request.user, id__in=ids)
+            count = selected.count()
+            examples = list(selected.order_by("-date", "-id")[:BULK_DELETE_EXAMPLES])
+            return render(
+                request,
+                "transactions/bulk_delete_confirm.html",
+                {
+                    "ids": ids,
+                    "query": query,
+                    "count": count,
+                    "examples": examples,
+                    "more": count - len(examples),
+                },
+            )
+        if action == "change_category":
+            changed = bulk.change_category(
+                request.user, ids, form.cleaned_data["category"]
+            )
+        elif action == "change_payment_method":
+            changed = bulk.change_payment_method(
+                request.user, ids, form.cleaned_data["payment_method"]
+            )
+        elif action == "toggle_recurring":
+            changed = bulk.toggle_recurring(request.user, ids)
+        else:
+            changed = bulk.delete(request.user, ids)
+        logger.info(
+            "User %s applied %s to %d transactions",
+            request.user.username,
+            action,
+            changed,
+        )
+        verb = "Deleted" if action == "delete" else "Updated"
+        messages.success(request, f"{verb} {changed} transactions.")
+    else:
+        for errors in form.errors.values():
+            messages.error(request, " ".join(errors))
+    return redirect(reverse("transaction_list") + (f"?{query}" if query else ""))
+
+
+@login_required
+def search_transactions(request):
+    """Full-text search over the user's transaction titles, notes and categories.
+
+    Args:
+        request: The HTTP request object. ``?q=`` holds the search terms.
+
+    Returns:
+        HttpResponse: Rendered HTML response with the best matches first.
+    """
+    query = request.GET.get("q", "").strip()
+    results = []
+    if query:
+        results = list(
+            search.search_transactions(request.user, query)[:SEARCH_RESULTS_LIMIT]
+        )
+    return render(
+        request,
+        "transactions/search_results.html",
+        {"query": query, "results": results, "limit": SEARCH_RESULTS_LIMIT},
+    )
+
+
+@login_required
+def export_transactions(request):
+    """Stream the user's transactions as CSV or JSON lines.
+
+    Honors the same filters and sort options as ``transaction_list``. Rows
+    are read with a chunked iterator and written as they arrive, so the
+    download starts immediately and memory stays flat for any size.
+
+    Args:
+        request: The HTTP request object. ``?format=csv`` (default) or ``jsonl``.
+
+    Returns:
+        StreamingHttpResponse with the export, or 400 for an unknown format.
+    """
+    transactions, filters = filter_transactions(
+        Transaction.objects.filter(user=request.user), request.GET
+    )
+    transactions = transactions.order_by(*ordering_for(filters["sort_by"]))
+    return export_response(
+        transactions,
+        TRANSACTION_EXPORT_FIELDS,
+        "transactions",
+        request.GET.get("format"),
+    )
+
+
+@login_required
+def export_budgets(request):
+    """Stream the user's budgets as CSV or JSON lines.
+
+    Args:
+        request: The HTTP request object. ``?format=csv`` (default) or ``jsonl``.
+
+    Returns:
+        StreamingHttpResponse with the export, or 400 for an unknown format.
+    """
+    budgets = Budget.objects.filter(user=request.user).order_by("-start_date", "-id")
+    return export_response(
+        budgets, BUDGET_EXPORT_FIELDS, "budgets", request.GET.get("format")
     )
 
 
@@ -284,7 +401,7 @@ def add_transaction(request):
     )
     if request.method == "POST":
         logger.debug("Form submitted with data: %s", request.POST)
-        form = TransactionForm(request.POST)
+        form = TransactionForm(request.POST, user=request.user)
         if form.is_valid():
             logger.debug("Form is valid")
             transaction = form.save(commit=False)
@@ -303,10 +420,56 @@ def add_transaction(request):
             print(form.errors)  # Debug: Check terminal for errors
     else:
         logger.debug("Rendering empty form for user: %s", request.user.username)
-        form = TransactionForm()
+        form = TransactionForm(user=request.user)
     return render(request, "transactions/add_transaction.html", {"form": form})
 
 
+@login_required
+def import_transactions(request):
+    """Import transactions in bulk from an uploaded bank statement.
+
+    Accepts CSV or OFX/QFX files. Rows are validated with the same rules as
+    TransactionForm and written in batches; invalid rows are reported back
+    with their line numbers.
+
+    Args:
+        request: The HTTP request object.
+
+    Returns:
+        HttpResponse: Upload form, or the import summary after a POST.
+    """
+    result = None
+    if request.method == "POST":
+        form = TransactionImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data["file"]
+            file_format = form.cleaned_data["file_format"] or importer.detect_format(
+                upload.name
+            )
+            try:
+                result = importer.import_file(request.user, upload, file_format)
+            except importer.ImportFileError as e:
+                result = e.result
+                form.add_error("file", f"{e} Rows before the error were imported.")
+            logger.info(
+                "User %s imported %d transactions (%d errors)",
+                request.user.username,
+                result.created,
+                len(result.errors),
+            )
+    else:
+        form = TransactionImportForm()
+    return render(
+        request,
+        "transactions/import_transactions.html",
+        {
+            "form": form,
+            "result": result,
+            "errors": result.errors[:MAX_IMPORT_ERRORS_SHOWN] if result else [],
+        },
+    )
+
+
 @login_required
 def edit_transaction(request, transaction_id):
     """Handle the editing of an existing transaction for the authenticated user.
@@ -322,28 +485,19 @@ def edit_transaction(request, transaction_id):
         HttpResponse: Rendered form page or redirect to transaction list on success,
         or HttpResponseForbidden if permission denied.
     """
-    transaction = get_object_or_404(Transaction, id=transaction_id)
-    logger.debug(
-        f"Attempting to edit transaction {transaction_id} by user {
-            request.user.username}"
+    transaction, forbidden = get_owned_object(
+        request, Transaction.objects.select_related("category"), transaction_id, "edit"
     )
-    if not user_owns_object(request.user, transaction):
-        logger.error(
-            "Permission denied: User %s tried to edit transaction %d owned by %s",
-            request.user.username,
-            transaction_id,
-            transaction.user.username if transaction.user else "None",
-        )
-        return HttpResponseForbidden(
-            "You do not have permission to edit this transaction."
-        )
+    if forbidden:
+        return forbidden
     if request.method == "POST":
-        form = TransactionForm(request.POST, instance=transaction)
+        form = TransactionForm(request.POST, user=request.user, instance=transaction)
         if form.is_valid():
             form.save()
             logger.debug(
-                f"Transaction {transaction_id} updated by user {
-                    request.user.username}"
+                "Transaction %d updated by user %s",
+                transaction_id,
+                request.user.username,
             )
             return redirect("transaction_list")
         else:
@@ -355,7 +509,7 @@ def edit_transaction(request, transaction_id):
             )
             print(form.errors)  # Debug: Check terminal for errors
     else:
-        form = TransactionForm(instance=transaction)
+        form = TransactionForm(user=request.user, instance=transaction)
     return render(request, "transactions/edit_transaction.html", {"form": form})
 
 
@@ -373,26 +527,18 @@ def delete_transaction(request, transaction_id):
         HttpResponse: Rendered confirmation page or redirect to transaction list on success,
         or HttpResponseForbidden if permission denied.
     """
-    transaction = get_object_or_404(Transaction, id=transaction_id)
-    logger.debug(
-        f"Attempting to delete transaction {transaction_id} by user {
-            request.user.username}"
+    transaction, forbidden = get_owned_object(
+        request,
+        Transaction.objects.select_related("category"),
+        transaction_id,
+        "delete",
     )
-    if not user_owns_object(request.user, transaction):
-        logger.error(
-            "Permission denied: User %s tried to delete transaction %d owned by %s",
-            request.user.username,
-            transaction_id,
-            transaction.user.username if transaction.user else "None",
-        )
-        return HttpResponseForbidden(
-            "You do not have permission to delete this transaction."
-        )
+    if forbidden:
+        return forbidden
     if request.method == "POST":
         transaction.delete()
         logger.debug(
-            f"Transaction {transaction_id} deleted by user {
-                request.user.username}"
+            "Transaction %d deleted by user %s", transaction_id, request.user.username
         )
         return redirect("transaction_list")
     return render(
@@ -401,19 +547,50 @@ def delete_transaction(request, transaction_id):
 
 
 @login_required
+@user_data_condition()
 def budget_list(request):
     """Display a list of budgets for the authenticated user.
 
+    Each budget shows its spending so far, computed for every budget in the
+    same query that lists them.
+
     Args:
         request: The HTTP request object.
 
     Returns:
         HttpResponse: Rendered HTML response with budget list.
     """
-    budgets = Budget.objects.filter(user=request.user)
+    budgets = (
+        Budget.objects.filter(user=request.user)
+        .select_related("category")
+        .with_utilization()
+    )
     return render(request, "transactions/budget_list.html", {"budgets": budgets})
 
 
+@login_required
+@user_data_condition()
+async def budget_list_async(request):
+    """Async ``budget_list``, served when ``ASYNC_VIEWS`` is on.
+
+    Args:
+        request: The HTTP request object.
+
+    Returns:
+        HttpResponse: Rendered HTML response with budget list.
+    """
+    user = await request.auser()
+    budgets = [
+        budget
+        async for budget in Budget.objects.filter(user=user)
+        .select_related("category")
+        .with_utilization()
+    ]
+    return await sync_to_async(render)(
+        request, "transactions/budget_list.html", {"budgets": budgets}
+    )
+
+
 @login_required
 def add_budget(request):
     """Handle the addition of a new budget for the authenticated user.
@@ -429,7 +606,7 @@ def add_budget(request):
     logger.debug("Processing add_budget request for user: %s", request.user.username)
     if request.method == "POST":
         logger.debug("Form submitted with data: %s", request.POST)
-        form = BudgetForm(request.POST)
+        form = BudgetForm(request.POST, user=request.user)
         if form.is_valid():
             logger.debug("Form is valid")
             budget = form.save(commit=False)
@@ -448,7 +625,7 @@ def add_budget(request):
             print(form.errors)  # Debug: Check terminal for errors
     else:
         logger.debug("Rendering empty form for user: %s", request.user.username)
-        form = BudgetForm()
+        form = BudgetForm(user=request.user)
     return render(request, "transactions/add_budget.html", {"form": form})
 
 
@@ -467,26 +644,17 @@ def edit_budget(request, budget_id):
         HttpResponse: Rendered form page or redirect to budget list on success,
         or HttpResponseForbidden if permission denied.
     """
-    budget = get_object_or_404(Budget, id=budget_id)
-    logger.debug(
-        f"Attempting to edit budget {budget_id} by user {
-            request.user.username}"
+    budget, forbidden = get_owned_object(
+        request, Budget.objects.select_related("category"), budget_id, "edit"
     )
-    if not user_owns_object(request.user, budget):
-        logger.error(
-            "Permission denied: User %s tried to edit budget %d owned by %s",
-            request.user.username,
-            budget_id,
-            budget.user.username if budget.user else "None",
-        )
-        return HttpResponseForbidden("You do not have permission to edit this budget.")
+    if forbidden:
+        return forbidden
     if request.method == "POST":
-        form = BudgetForm(request.POST, instance=budget)
+        form = BudgetForm(request.POST, user=request.user, instance=budget)
         if form.is_valid():
             form.save()
             logger.debug(
-                f"Budget {budget_id} updated by user {
-                    request.user.username}"
+                "Budget %d updated by user %s", budget_id, request.user.username
             )
             return redirect("budget_list")
         else:
@@ -498,7 +666,7 @@ def edit_budget(request, budget_id):
             )
             print(form.errors)  # Debug: Check terminal for errors
     else:
-        form = BudgetForm(instance=budget)
+        form = BudgetForm(user=request.user, instance=budget)
     return render(request, "transactions/edit_budget.html", {"form": form})
 
 
@@ -516,27 +684,14 @@ def delete_budget(request, budget_id):
         HttpResponse: Rendered confirmation page or redirect to budget list on success,
         or HttpResponseForbidden if permission denied.
     """
-    budget = get_object_or_404(Budget, id=budget_id)
-    logger.debug(
-        f"Attempting to delete budget {budget_id} by user {
-            request.user.username}"
+    budget, forbidden = get_owned_object(
+        request, Budget.objects.select_related("category"), budget_id, "delete"
     )
-    if not user_owns_object(request.user, budget):
-        logger.error(
-            "Permission denied: User %s tried to delete budget %d owned by %s",
-            request.user.username,
-            budget_id,
-            budget.user.username if budget.user else "None",
-        )
-        return HttpResponseForbidden(
-            "You do not have permission to delete this budget."
-        )
+    if forbidden:
+        return forbidden
     if request.method == "POST":
         budget.delete()
-        logger.debug(
-            f"Budget {budget_id} deleted by user {
-                request.user.username}"
-        )
+        logger.debug("Budget %d deleted by user %s", budget_id, request.user.username)
         return redirect("budget_list")
     return render(request, "transactions/delete_budget.html", {"budget": budget})
 
@@ -604,149 +759,94 @@ def login_redirect_if_authenticated(view_func):
 
 
 @login_required
+@user_data_condition()
 def download_report(request):
-    """Generate and download a PDF report of the user's financial data.
+    """Download a PDF report of the user's financial data.
+
+    Reports are rendered by the report worker and cached on disk per data
+    version. If a report for the user's current data exists it is sent
+    immediately; otherwise a job is queued and the user is redirected to
+    its status page.
 
-    Includes financial summary, transactions, and budgets for the
-    authenticated user.
     Args:
         request: The HTTP request object.
 
     Returns:
-        HttpResponse: PDF response with financial report attached.
+        FileResponse with the cached PDF, or a redirect to the job status page.
     """
-    # Get user data
-    user = request.user
-    transactions = Transaction.objects.filter(user=user).order_by("-date")
-    budgets = Budget.objects.filter(user=user).order_by("-start_date")
-
-    # Calculate financial summary
-    total_income = (
-        sum(t.amount for t in transactions.filter(transaction_type="Income")) or 0
-    )
-    total_expenses = (
-        sum(t.amount for t in transactions.filter(transaction_type="Expense")) or 0
-    )
-    net_balance = total_income - total_expenses
-    total_budgets = sum(b.amount for b in budgets) or 0
-
-    # Create PDF response
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = (
-        f'attachment; filename="financial_report_{datetime.date.today()}.pdf"')
-
-    # Create PDF document
-    doc = SimpleDocTemplate(response, pagesize=letter)
-    elements = []
-
-    # Styles
-    styles = getSampleStyleSheet()
-    title = Paragraph(
-        f"Personal Finance Report - {datetime.date.today()}", styles["Title"]
+    job = report_jobs.current_job(request.user)
+    if job.status == ReportJob.DONE:
+        return _report_file_response(job)
+    return redirect("report_status", job_id=job.id)
+
+
+def _report_file_response(job):
+    try:
+        report = open(job.file_path, "rb")
+    except FileNotFoundError:
+        # Removed as superseded after the job was read
+        raise Http404("Report file is no longer available.")
+    return FileResponse(
+        report,
+        as_attachment=True,
+        filename=f"financial_report_{job.finished_at.date()}.pdf",
+        content_type="application/pdf",
     )
-    elements.append(title)
-    elements.append(Paragraph("<br/><br/>", styles["Normal"]))
-
-    # Financial Summary Table
-    summary_data = [
-        ["Metric", "Amount"],
-        ["Total Income", f"${total_income:.2f}"],
-        ["Total Expenses", f"${total_expenses:.2f}"],
-        ["Net Balance", f"${net_balance:.2f}"],
-        ["Total Budgets", f"${total_budgets:.2f}"],
-    ]
-    summary_table = Table(summary_data, colWidths=[200, 100])
-    summary_table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, 0), 12),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                ("TEXTCOLOR", (0, 1), (-1, -1), colors.black),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
-                ("FONTSIZE", (0, 1), (-1, -1), 10),
-                ("GRID", (0, 0), (-1, -1), 1, colors.black),
-            ]
+
+
+@login_required
+def report_status(request, job_id):
+    """Show the progress of a report job, or report it as JSON.
+
+    Args:
+        request: The HTTP request object. ``?format=json`` returns JSON.
+        job_id: The ID of the user's report job.
+
+    Returns:
+        HttpResponse: Status page that refreshes until the report is ready.
+    """
+    job = get_object_or_404(ReportJob, id=job_id, user=request.user)
+    download_url = None
+    if job.status == ReportJob.DONE:
+        download_url = reverse("report_file", args=[job.id])
+    if request.GET.get("format") == "json":
+        return JsonResponse(
+            {
+                "id": job.id,
+                "status": job.status,
+                "download_url": download_url,
+                "error": job.error or None,
+            }
         )
+    return render(
+        request,
+        "transactions/report_status.html",
+        {"job": job, "download_url": download_url},
     )
-    elements.append(summary_table)
-    elements.append(Paragraph("<br/><br/>", styles["Normal"]))
-
-    # Transactions Table
-    if transactions.exists():
-        trans_data = [["Date", "Title", "Amount", "Type", "Category"]]
-        for t in transactions:
-            trans_data.append(
-                [
-                    t.date.strftime("%Y-%m-%d"),
-                    t.title,
-                    f"${t.amount:.2f}",
-                    t.transaction_type,
-                    t.category,
-                ]
-            )
-        trans_table = Table(trans_data, colWidths=[80, 100, 60, 60, 80])
-        trans_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, 0), 12),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                    ("TEXTCOLOR", (0, 1), (-1, -1), colors.black),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
-                    ("FONTSIZE", (0, 1), (-1, -1), 10),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ]
-            )
-        )
-        elements.append(Paragraph("Transactions", styles["Heading2"]))
-        elements.append(trans_table)
-
-    # Budgets Table
-    if budgets.exists():
-        budget_data = [["Category", "Amount", "Start Date", "End Date"]]
-        for b in budgets:
-            budget_data.append(
-                [
-                    b.category,
-                    f"${b.amount:.2f}",
-                    b.start_date.strftime("%Y-%m-%d"),
-                    b.end_date.strftime("%Y-%m-%d") if b.end_date else "Ongoing",
-                ]
-            )
-        budget_table = Table(budget_data, colWidths=[100, 60, 80, 80])
-        budget_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, 0), 12),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                    ("TEXTCOLOR", (0, 1), (-1, -1), colors.black),
-                    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                    ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
-                    ("FONTSIZE", (0, 1), (-1, -1), 10),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.black),
-                ]
-            )
-        )
-        elements.append(Paragraph("<br/><br/>", styles["Normal"]))
-        elements.append(Paragraph("Budgets", styles["Heading2"]))
-        elements.append(budget_table)
 
-    # Build PDF
-    doc.build(elements)
-    return response
+
+@login_required
+def report_file(request, job_id):
+    """Serve a finished report artifact owned by the user.
+
+    Args:
+        request: The HTTP request object.
+        job_id: The ID of the user's report job.
+
+    Returns:
+        FileResponse: The cached PDF, or 404 if it is not ready.
+    """
+    job = get_object_or_404(
+        ReportJob, id=job_id, user=request.user, status=ReportJob.DONE
+    )
+    return _report_file_response(job)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def metrics_view(request):
+    """Request metrics of this process in the Prometheus text format.
+
+    Staff only; scrapers can authenticate with HTTP basic auth.
+    """
+    return HttpResponse(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)